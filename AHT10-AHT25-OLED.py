@@ -14,6 +14,17 @@ import ahtx0 # AHT10 https://github.com/targetblank/micropython_ahtx0
 import aht # AHT25 https://github.com/etno712/aht
 import MQ    # custom: connect wifi and MQTT
 import ntptime  # to set Pico RTC from NTP time server
+import flashlog # local copy of every record on flash
+import mqqueue  # store-and-forward MQTT publish queue
+import netmgr   # wifi/MQTT reconnect with backoff
+import mqbatch  # several records per MQTT payload
+import deadband # publish only on change, plus heartbeat
+import timesync # periodic NTP resync, drift estimate, slewing
+import sensorguard # per-sensor retry, I2C bus recovery, degraded mode
+import i2chealth   # per-device I2C call counts, errors, latency histogram
+import spantrace   # hot-path span timings in a ring buffer, dumped on request
+import adaptwin    # per-sensor window length that adapts to the signal
+import network
 
 def blinkSignal(n,t):    # blink LED n times with delay 'time'
     for i in range(n):
@@ -22,7 +33,26 @@ def blinkSignal(n,t):    # blink LED n times with delay 'time'
         led.off()
         time.sleep(t)
 
+def idle(t):    # wait t seconds, servicing the network link first
+    global tNetUp
+    t0 = utime.ticks_ms()
+    if net.poll():
+        if tNetUp is None:  # network came up in the background
+            tNetUp = utime.ticks_diff(utime.ticks_ms(), tBoot)
+            print("# boot: network up at %d ms" % tNetUp)
+        led.off()
+        ts.poll()  # NTP resync when due
+    else:
+        led.on()   # LED on while the network is down
+    if traceSpans and spantrace.poll():  # 't' on the serial port
+        tr.dump()
+    dt = int(t * 1000) - utime.ticks_diff(utime.ticks_ms(), t0)
+    if dt > 0:
+        utime.sleep_ms(dt)
+
 def getMsg(T, Ta):    # create message string Temperature and direction
+    if T != T:   # nan: sensor degraded
+        return "--"
     if (T > Ta): # going up or down?
         dir = "+"
     else:
@@ -31,78 +61,194 @@ def getMsg(T, Ta):    # create message string Temperature and direction
     return(msg)
 
 # ============================================
+# Staged start: sensors and display first, then sampling begins at once.
+# wifi, MQTT and NTP come up later from idle(), and records made before
+# that wait in the publish queue (and for their NTP time fix).
+tBoot = utime.ticks_ms()  # boot timing is measured from here
+tFirstSample = None
+tNetUp = None
 print("Starting AHT10-AHT25 program...")
 
-i2c1 = I2C(1, sda=Pin(18), scl=Pin(19),  freq=400_000)
-sensor1 = ahtx0.AHT10(i2c1) # AHT10 sensor
+# each sensor on its own bus; a bus that fails is recovered and rebuilt
+# from these, and only that sensor's readings go missing meanwhile
+h1 = i2chealth.DevHealth("T1@i2c1")  # each bus transaction timed, counted
+h2 = i2chealth.DevHealth("T2@soft20")
+h3 = i2chealth.DevHealth("T3@soft14")
+hOled = i2chealth.DevHealth("OLED@i2c0")
+healths = (h1, h2, h3, hOled)
+
+def bus1():
+    return I2C(1, sda=Pin(18), scl=Pin(19),  freq=400_000)
+g1 = sensorguard.SensorGuard("T1", bus1, ahtx0.AHT10, scl=19, sda=18,
+                             health=h1) # AHT10
+
+def bus2():
+    return SoftI2C(scl=Pin(21,Pin.PULL_UP), sda=Pin(20,Pin.PULL_UP),
+                   freq=400_000)
+g2 = sensorguard.SensorGuard("T2", bus2, lambda b: aht.AHT2x(b, crc=True),
+                             scl=21, sda=20, health=h2) # AHT25 sensor
+
+def bus3():
+    return SoftI2C(sda=Pin(14), scl=Pin(15),  freq=400_000)
+g3 = sensorguard.SensorGuard("T3", bus3, ahtx0.AHT10, scl=15, sda=14,
+                             health=h3)
+guards = (g1, g2, g3)
+
+traceSpans = False  # True: time reads, display(), show(), publish; 't' dumps
+traceSlowMs = 0     # > 0: also dump the trace after a window this long
+SP_AHT10, SP_AHT2X, SP_DISP, SP_SHOW, SP_PUB = 0, 1, 2, 3, 4  # traced spans
+tr = spantrace.Tracer(("AHT10", "AHT2x", "display", "show", "publish"),
+                      depth=256, enabled=traceSpans)
 
-i2c2 = SoftI2C(scl=Pin(21,Pin.PULL_UP), sda=Pin(20,Pin.PULL_UP), freq=400_000)
-sensor2 = aht.AHT2x(i2c2, crc=True) # AHT25 sensor
+@tr.trace(SP_AHT10)
+def readAHT10(s):  # (T, RH) from one AHT10
+    return (s.temperature, s.relative_humidity)
 
-i2c3 = SoftI2C(sda=Pin(14), scl=Pin(15),  freq=400_000)
-sensor3 = ahtx0.AHT10(i2c3) # another AHT10 sensor
+@tr.trace(SP_AHT2X)
+def readAHT2x(s):  # (T, RH) from the AHT25
+    h = s.humidity
+    return (s.temperature, h)
+
+NAN = float("nan")  # average of a window with no good readings
 
 
 
 led = Pin('LED', Pin.OUT)  # Pico W onboard LED for signals
-blinkSignal(3,0.1) # start up indicator
+led.on()  # start up indicator, stays on until the network is up
 
 write = ssd1306big  # set up OLED display
+# line1()..line3() look display() up at call time, so this times them all
+ssd1306big.display = tr.wrap(ssd1306big.display, SP_DISP)
 write.clear()      # update OLED display
 write.line1("AHT10-25")
 write.show() # refresh OLED display
 print("Opened OLED display")
 
+def oledShow():  # write.show(), timed and counted
+    with tr.span(SP_SHOW):
+        hOled.run(write.show)
+
 # ===================================================
 topic_pub =  'T3'            # MQTT topic to publish under
+topic_batch = 'T3b'          # topic for batched payloads
+topic_health = 'T3h'         # I2C health summaries
+healthEvery = 240  # records between health summaries (about an hour)
+batchMode = None  # None: one CSV string per window, or "bin" / "json"
+adaptive = False  # True: the window adapts, readings per sensor n1..n3 in records
+nCols = ("n1", "n2", "n3") if adaptive else ()
+# batches go out after 10 records or when the oldest is 5 minutes old
+mb = mqbatch.Batcher(("T1", "T2", "T3", "RH1", "RH2", "RH3") + nCols,
+                     scales=(500,)*3 + (100,)*3 + (1,)*len(nCols),
+                     offsets=(20,)*3 + (0,)*3 + (0,)*len(nCols),
+                     mode=batchMode, maxCount=10, maxMs=300_000)
+useDeadband = False  # True: print/publish only records that changed
+# thresholds for T1,T2,T3 (degC) and RH1,RH2,RH3 (%), heartbeat 10 minutes
+db = deadband.Deadband((0.05,)*3 + (0.2,)*3, heartbeatMs=600_000)
 
 with open('secrets.json') as fp:  # network credentials
     secrets = ujson.loads(fp.read())
 print("Read credentials...")
 mq=MQ.MQTTobject() # wifi + MQTT
-mq.initWLAN(secrets)  # start up wifi link
 
-write.line2("wifi")
-write.show() # refresh OLED display
+# records wait here while the broker is unreachable, then drain in batches
+mqq = mqqueue.PubQueue(maxLen=120, spill="mqspill.txt", batch=8)
 
-try:  # make MQTT connection
-   client = mq.mqtt_connect(secrets)
-except OSError as e:
-   blinkSignal(8,0.1) # error indicator
-   reconnect()
+# wifi start and MQTT (re)connects happen from idle(), with backoff
+wlan = network.WLAN(network.STA_IF)
 
-write.line3("mqtt on")
-write.show() # refresh OLED display
+def wifiStart():  # returns at once; NetMgr polls isconnected() meanwhile
+    wlan.active(True)
+    wlan.connect(secrets['ssid'], secrets['password'])
+
+net = netmgr.NetMgr(wlan.isconnected, wifiStart,
+                    lambda: mq.mqtt_connect(secrets))
 
 #Vsys = ADC(29) # connected through 3:1 divider to Vbus
 #VbusConversion = 3.1 * (3.3 / (65535)) # convert to volts in
 # -----------------------------------------------------
 
-t = ntptime.time() # epoch.  local time PST is UTC-8
-print(t) # DEBUG
-tm = time.gmtime(t)
-RTC().datetime((tm[0], tm[1], tm[2], tm[6] + 1, tm[3], tm[4], tm[5], 0))
+def setRtc(t):  # RTC follows the first NTP sync (epoch, UTC)
+    print("# rtc set %d" % t)  # a comment line: stays out of the CSV data
+    tm = time.gmtime(t)
+    RTC().datetime((tm[0], tm[1], tm[2], tm[6] + 1, tm[3], tm[4], tm[5], 0))
+
+# record times come from ts.now(): hourly NTP resync, corrections slewed
+ts = timesync.TimeSync(ntptime.time, intervalMs=3600_000,
+                       netUp=wlan.isconnected, setRtc=setRtc)
+early = []     # records held until the first sync fixes their time
+maxEarly = 20  # after this many, send them with provisional times
 
 readInterval = 0.25  # seconds between each reading
 avgCount = 60       # how many readings to average
 blankAfter = avgCount / 3  # after this many cycles, blank OLED display
+# adaptive: windows of 8 readings (~6 s) to 240 (~3 min), all sensors
+# together: a step on any of them starts a short window for all
+aw = adaptwin.AdaptWin(3, minN=8, maxN=240, res=0.01, linked=True)
+
+def addAdapt(ch, r):  # one guarded reading, None if it failed
+    if r is None:
+        aw.add(ch, NAN)
+    else:
+        aw.add(ch, r[0], r[1])
 
 tStart = time.time()  # seconds since epoch
 f = 0.05  # lowpass filter fraction
 
-dAvg1 = 0
-dAvg2 = 0
-dAvg3 = 0
-initReads = 3
-for i in range(initReads):
-    dAvg1 += sensor1.temperature
-    dAvg2 += sensor2.temperature
-    dAvg3 += sensor3.temperature
-dAvg1 /= initReads
-dAvg2 /= initReads
-dAvg3 /= initReads
+dAvg1 = dAvg2 = dAvg3 = NAN  # lowpass filters start from the first window
+
+def lowpass(avg, x):  # hold the average through missing (nan) windows
+    if x != x:
+        return avg
+    if avg != avg:
+        return x
+    return avg * (1.0-f) + (f*x)
+
+loopFails = 0     # main loop OSErrors in a row (not from the sensors)
+maxLoopFails = 5  # reset() only after this many
+
+# keep every record on flash too, in case serial or MQTT are not there
+flog = flashlog.FlashLog("aht", bufSize=4096, maxSize=128*1024, maxFiles=8)
+reportEvery = 60  # print flash logger stats every N records
+
+def emit(epoch, v):  # print, log and queue one record
+    outs = ("%d, %0.3f,%0.3f,%0.3f, %0.2f,%0.2f,%0.2f" % ((epoch,) + v[:6]))
+    if adaptive:  # each sensor's readings in the window, 0 = missing
+        outs += ", %d,%d,%d" % v[6:]
+    changed = (not useDeadband) or db.check(v)
+    if changed:
+        print(outs)
+    flog.add(outs + "\n")  # flash copy keeps every record
+    if (flog.records % reportEvery) == 0:
+        flog.report()
+        print("# net %s, %d reconnects, last down %d ms, queued %d"
+              % (net.health(), net.reconnects, net.recoverMs, len(mqq)))
+        print("# ntp %d syncs, %d fails, drift %.2f ppm, last error %d ms"
+              % (ts.syncs, ts.fails, ts.ppm, ts.lastErr))
+        for g in guards:
+            print(g.status())
+        if useDeadband:
+            print("# deadband %d passed, %d suppressed, %d heartbeats"
+                  % (db.passed, db.suppressed, db.heartbeats))
+    if (flog.records % healthEvery) == 0:
+        i2chealth.report(healths, lambda s: mqq.put(topic_health, s))
+    # MQTT publish prone to [Errno 104] ECONNRESET
+    if batchMode is None:
+        if changed:
+            mqq.put(topic_pub, outs)
+    else:
+        p = None
+        if changed:
+            p = mb.add(epoch, v)
+        if (p is None) and mb.due():
+            p = mb.flush()
+        if p is not None:
+            mqq.put(topic_batch, p)
 
-print("epoch,T1,T2,T3, RH1,RH2,RH3, Vbus") # CSV column headers
+if adaptive:
+    print("epoch,T1,T2,T3, RH1,RH2,RH3, n1,n2,n3") # CSV column headers
+else:
+    print("epoch,T1,T2,T3, RH1,RH2,RH3, Vbus") # CSV column headers
+tWin = utime.ticks_ms()  # end of the previous window
 
 
 while True:
@@ -113,52 +259,82 @@ while True:
         Hsum2 = 0
         Tsum3 = 0
         Hsum3 = 0
+        n1 = n2 = n3 = 0  # good readings from each sensor
         Vbus = 0  # reading of input supply voltage
-        for i in range(avgCount):
-            Tsum1 += sensor1.temperature
-            Hsum1 += sensor1.relative_humidity
-            Hsum2 += sensor2.humidity
-            Tsum2 += sensor2.temperature
-            Hsum3 += sensor3.relative_humidity
-            Tsum3 += sensor3.temperature
+        for i in range(aw.maxN if adaptive else avgCount):
+            r = g1.read(readAHT10)
+            if r is not None:
+                Tsum1 += r[0]
+                Hsum1 += r[1]
+                n1 += 1
+            if adaptive:
+                addAdapt(0, r)
+            r = g2.read(readAHT2x)
+            if r is not None:
+                Tsum2 += r[0]
+                Hsum2 += r[1]
+                n2 += 1
+            if adaptive:
+                addAdapt(1, r)
+            r = g3.read(readAHT10)
+            if r is not None:
+                Tsum3 += r[0]
+                Hsum3 += r[1]
+                n3 += 1
+            if adaptive:
+                addAdapt(2, r)
             # Vbus += Vsys.read_u16() * VbusConversion # volts from ext. power
-            utime.sleep(readInterval)
+            if tFirstSample is None:  # show the very first reading at once
+                tFirstSample = utime.ticks_diff(utime.ticks_ms(), tBoot)
+                print("# boot: first sample at %d ms" % tFirstSample)
+                write.clear()
+                write.line1(getMsg(Tsum1, Tsum1))
+                write.line2(getMsg(Tsum2, Tsum2))
+                write.line3(getMsg(Tsum3, Tsum3))
+                oledShow()
+            idle(readInterval)
             if (i == blankAfter):
                 write.clear() # blank OLED
-                write.show()  # refresh status
-
-            
-        degC1 = Tsum1 / avgCount
-        RH1 = Hsum1 / avgCount
-        degC2 = Tsum2 / avgCount
-        RH2 = Hsum2 / avgCount
-        degC3 = Tsum3 / avgCount
-        RH3 = Hsum3 / avgCount
+                if not net.ok():
+                    write.line1(net.health())
+                oledShow()  # refresh status
+            if adaptive and aw.ready:  # the window closed (step or full)
+                break
+
+        if adaptive:  # sensors with n = 0 had no good reading: nan
+            degC1, degC2, degC3 = aw.mean[0], aw.mean[1], aw.mean[2]
+            RH1, RH2, RH3 = aw.mean2[0], aw.mean2[1], aw.mean2[2]
+            nw = (aw.used[0], aw.used[1], aw.used[2])
+            aw.clear()
+        else:
+            degC1 = Tsum1 / n1 if n1 else NAN
+            RH1 = Hsum1 / n1 if n1 else NAN
+            degC2 = Tsum2 / n2 if n2 else NAN
+            RH2 = Hsum2 / n2 if n2 else NAN
+            degC3 = Tsum3 / n3 if n3 else NAN
+            RH3 = Hsum3 / n3 if n3 else NAN
         #Vbus /= avgCount
         
-        dAvg1 = dAvg1 * (1.0-f) + (f*degC1)
-        dAvg2 = dAvg2 * (1.0-f) + (f*degC2)
-        dAvg3 = dAvg3 * (1.0-f) + (f*degC3)
+        dAvg1 = lowpass(dAvg1, degC1)
+        dAvg2 = lowpass(dAvg2, degC2)
+        dAvg3 = lowpass(dAvg3, degC3)
                    
-        epoch=utime.time() # UNIX epoch, in local time zone
-        outs = ("%d, %0.3f,%0.3f,%0.3f, %0.2f,%0.2f,%0.2f" %
-              (epoch,degC1,degC2,degC3,RH1,RH2,RH3))
-        print(outs)
-        # MQTT publish prone to [Errno 104] ECONNRESET
-        try:
-            client.publish(topic_pub, outs)
-        except Exception as e:
-            print(e)           
-            try:  # try to reconnect MQTT
-                client = mq.mqtt_connect(secrets)
-            except OSError as e:
-                print("Could not reconnect")
-                write.clear()      # update OLED display
-                write.line1("MQTT ERR")
-                write.show() # refresh OLED display
-                blinkSignal(8,0.1) # error indicator
-                pass
-            pass  # oh well, will try next time
+        epoch = ts.now() # UNIX epoch, provisional until first NTP sync
+        v = (degC1,degC2,degC3,RH1,RH2,RH3)
+        if adaptive:
+            v += nw
+        if ts.synced or (len(early) >= maxEarly):
+            for e, ve in early:  # records from before the first sync
+                emit(ts.fixup(e) if ts.synced else e, ve)
+            early = []
+            emit(epoch, v)
+        else:
+            early.append((epoch, v))
+        if net.ok():
+            with tr.span(SP_PUB):
+                sent = mqq.drain(net.client)
+            if sent < 0:
+                net.lost()  # record stays queued, reconnect in idle()
         
         tNow = time.time()
 
@@ -169,13 +345,26 @@ while True:
         write.line2(msg)
         msg = getMsg(degC3, dAvg3)
         write.line3(msg)
-        write.show() # refresh OLED display
-    except OSError as e:
+        oledShow() # refresh OLED display
+        dtWin = utime.ticks_diff(utime.ticks_ms(), tWin)
+        if traceSlowMs and traceSpans and dtWin > traceSlowMs:
+            print("# slow window: %d ms" % dtWin)
+            tr.dump()
+        tWin = utime.ticks_ms()
+        loopFails = 0
+    except OSError as e:  # sensor errors are handled by the guards
+        loopFails += 1
         print("Encountered OSError in main loop")
         print(e)
         write.clear()      # update OLED display
         write.line1("ERROR")
         write.line2(e)
-        write.show() # refresh OLED display
+        oledShow() # refresh OLED display
+        try:
+            flog.flush()  # don't lose the RAM buffer
+            mqq.persist() # or the unpublished records
+        except OSError:
+            pass
         time.sleep(5)
-        reset()
+        if loopFails >= maxLoopFails:
+            reset()
@@ -8,38 +8,56 @@ import time
 import utime
 from machine import Pin, I2C, ADC
 import ahtx0 # https://github.com/targetblank/micropython_ahtx0
+import adaptwin # window length that adapts to the signal
 
 i2c1 = I2C(1, sda=Pin(18), scl=Pin(19),  freq=400_000)
 
 sensor1 = ahtx0.AHT10(i2c1)
 readInterval = 0.5  # seconds between each reading
 avgCount = 10       # how many readings to average
+adaptive = False    # True: window grows when steady, shrinks on a step
+aw = adaptwin.AdaptWin(1, minN=4, maxN=80, res=0.01)  # 2 s .. 40 s windows
 
 write = ssd1306big  # set up OLED display
 
 tStart = time.time()  # seconds since epoch
 f = 0.01  # lowpass filter fraction
 dAvg = sensor1.temperature
-print("epoch,degC,dAvg,RH1") # CSV column headers
+if adaptive:
+    print("epoch,degC,dAvg,RH1,n") # n = readings in this window
+else:
+    print("epoch,degC,dAvg,RH1") # CSV column headers
 
 
 while True:
-    Tsum1 = 0
-    Hsum1 = 0
-    for i in range(avgCount):
-        Tsum1 += sensor1.temperature
-        Hsum1 += sensor1.relative_humidity
-        utime.sleep(readInterval)
+    if adaptive:
+        while not aw.ready:
+            aw.add(0, sensor1.temperature, sensor1.relative_humidity)
+            utime.sleep(readInterval)
+        degC = aw.mean[0]
+        RH1 = aw.mean2[0]
+        nAvg = aw.used[0]
+        aw.clear()
+    else:
+        Tsum1 = 0
+        Hsum1 = 0
+        for i in range(avgCount):
+            Tsum1 += sensor1.temperature
+            Hsum1 += sensor1.relative_humidity
+            utime.sleep(readInterval)
         
-    degC = Tsum1 / avgCount
-    RH1 = Hsum1 / avgCount
+        degC = Tsum1 / avgCount
+        RH1 = Hsum1 / avgCount
     
     dAvg = dAvg * (1.0-f) + (f*degC)
     msg1 = "%.3f C" % (degC)
     msg2 = "%.3f C" % (dAvg)
         
     epoch=utime.time() # UNIX epoch, in local time zone
-    print("%d, %0.3f, %0.4f, %0.2f" % (epoch,degC,dAvg,RH1))
+    if adaptive:
+        print("%d, %0.3f, %0.4f, %0.2f, %d" % (epoch,degC,dAvg,RH1,nAvg))
+    else:
+        print("%d, %0.3f, %0.4f, %0.2f" % (epoch,degC,dAvg,RH1))
     
     write.clear()
     write.line1(msg1)
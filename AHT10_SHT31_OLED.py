@@ -4,10 +4,17 @@
 # 08-Feb-2023 J.Beale
 
 from machine import Pin, ADC, PWM, I2C, SoftI2C, reset
-from time import sleep, sleep_ms, time, ticks_ms
+from time import sleep, sleep_ms, time, ticks_ms, ticks_diff
 #import time
 import sh1106  # OLED  driver: github.com/robert-hh/SH1106
 import ahtx0   # AHT10 driver: github.com/targetblank/micropython_ahtx0
+import binrec  # compact binary record output
+import heatcycle  # SHT31 heater on/off cycle, per-phase stats
+import loopprof  # per-section time / heap allocation profiler
+import corering  # ring buffer handing sensor windows from core 1 to core 0
+import i2chealth  # per-device I2C call counts, errors, latency histogram
+import spantrace  # hot-path span timings in a ring buffer, dumped on request
+import _thread
 import sys
 
 swVersion = "RH Readout 0.5"
@@ -33,9 +40,17 @@ i2c4= SoftI2C(scl=Pin(9,Pin.PULL_UP), sda=Pin(8,Pin.PULL_UP), freq=400_000)
 #        print(hex(d))       
 #sys.exit()        
 
-sensor1 = ahtx0.AHT10(i2c0) # AHT10 sensor #1
-sensor2 = ahtx0.AHT10(i2c2) # AHT10 sensor #2
-sensor3 = ahtx0.AHT10(i2c3) # AHT10 sensor #3
+# each sensor's I2C transactions are timed and counted (not the
+# conversion waits in its driver); the display's show() calls as a whole
+h1 = i2chealth.DevHealth("T1@i2c0")
+h2 = i2chealth.DevHealth("T2@soft19")
+h3 = i2chealth.DevHealth("T3@soft13")
+h4 = i2chealth.DevHealth("SHT31@soft9")
+hDisp = i2chealth.DevHealth("OLED@i2c1")
+
+sensor1 = ahtx0.AHT10(h1.bus(i2c0)) # AHT10 sensor #1
+sensor2 = ahtx0.AHT10(h2.bus(i2c2)) # AHT10 sensor #2
+sensor3 = ahtx0.AHT10(h3.bus(i2c3)) # AHT10 sensor #3
 # sensor4 = sht3x.SHT3X(i2c4) # SHT31 sensor #4
 
 # command words for SHT3x sensor
@@ -88,12 +103,35 @@ class Object(object):
     pass
 
 sense4 = Object()
-sense4.i2c = i2c4  # an i2c object (HW or SW)
+sense4.i2c = h4.bus(i2c4)  # an i2c object (HW or SW), timed
 sense4.addr = 0x44 # i2C address of device on bus
 TRH_reset(sense4)
 
-SHT31_Heat = False  # if the internal heater is turned on
-TRH_SetHeat(sense4, SHT31_Heat)  # update the heater value
+dualCore = False  # True: sensors read on core 1, display/serial on core 0
+heatReq = False   # dualCore: heater command for core 1 to send
+
+traceSpans = False  # True: time sensor reads, TRH_get and show(); 't' dumps
+traceSlowMs = 0     # > 0: also dump the trace after a window this long
+SP_AHT, SP_TRH, SP_SHOW = 0, 1, 2  # traced spans
+spanNames = ("AHT10", "TRH_get", "show")
+tr = spantrace.Tracer(spanNames, depth=256, enabled=traceSpans)
+trAcq = tr  # sensor spans; core 1 gets its own ring (no lock needed)
+if dualCore:
+    trAcq = spantrace.Tracer(spanNames, depth=256, enabled=traceSpans,
+                             tag="core1")
+TRH_get = trAcq.wrap(TRH_get, SP_TRH)
+
+def dumpTrace():
+    tr.dump()
+    if trAcq is not tr:
+        trAcq.dump()
+
+def setHeat4(heat):  # heater command for sensor4, sent only on change
+    global heatReq
+    if dualCore:
+        heatReq = heat   # sensor4's bus belongs to core 1
+    else:
+        TRH_SetHeat(sense4, heat)
 
 # sys.exit()
 
@@ -113,63 +151,163 @@ avgCount = 10  # how many readings to average together
 #readInterval = 0.07  # 0.163 seconds between each reading (2 ch)
 
 CycleLength = 40 # how many cycles before switching heater on/off
+HeatOnCycles = CycleLength   # windows with SHT31 heater on
+HeatOffCycles = CycleLength  # windows with SHT31 heater off
+SettleCycles = 5  # windows after each switch left out of phase stats
+
+# heater starts off; the initial off command is sent here
+heater = heatcycle.HeatCycle(setHeat4, onCount=HeatOnCycles,
+            offCount=HeatOffCycles, settleCount=SettleCycles, nCh=8)
 
-tCycles = 0  # loop counter
 tStart = ticks_ms()
 
-print("sec, T1, T2, T3, T4, RH1, RH2, RH3, RH4, T")  # CSV column headers
+binaryOut = False  # True: binrec records on serial instead of CSV lines
+chNames = ("T1", "T2", "T3", "T4", "RH1", "RH2", "RH3", "RH4")
+# temperature stored as (T-20)*500, RH as RH*100 in int16
+rec = binrec.BinRec(chNames, scales=(500,)*4 + (100,)*4,
+                    offsets=(20,)*4 + (0,)*4, tScale=1000)
+
+healths = (h1, h2, h3, h4, hDisp)
+healthEvery = 100  # print the health summaries every N windows
+
+@trAcq.trace(SP_AHT)
+def readAHT10(s):  # (T, RH) from one AHT10
+    return (s.temperature, s.relative_humidity)
+
+def readWindow():  # average avgCount readings of every sensor
+    Tsum1 = 0
+    Hsum1 = 0
+    Tsum2 = 0
+    Hsum2 = 0
+    Tsum3 = 0
+    Hsum3 = 0
+    Tsum4 = 0
+    Hsum4 = 0
+    for i in range(avgCount):
+        r = readAHT10(sensor1)
+        Tsum1 += r[0]
+        Hsum1 += r[1]
+        r = readAHT10(sensor2)
+        Tsum2 += r[0]
+        Hsum2 += r[1]
+        r = readAHT10(sensor3)
+        Tsum3 += r[0]
+        Hsum3 += r[1]
+        trhData = TRH_get(sense4)
+        if trhData[0] == -999:
+            h4.crcFail()
+        Tsum4 += trhData[0]
+        Hsum4 += trhData[1]
+    return (Tsum1 / avgCount, Tsum2 / avgCount, Tsum3 / avgCount,
+            Tsum4 / avgCount, Hsum1 / avgCount, Hsum2 / avgCount,
+            Hsum3 / avgCount, Hsum4 / avgCount)
+
+ring = corering.CoreRing(len(chNames), depth=8)
+vals = [0.0] * len(chNames)  # core 0 copy of the newest window
+running = True
+acqErrors = 0     # OSErrors seen by the core 1 sensor loop
+
+def core1():  # acquisition loop on the second core
+    global acqErrors
+    heatSent = None
+    while running:
+        try:
+            if heatReq != heatSent:
+                TRH_SetHeat(sense4, heatReq)
+                heatSent = heatReq
+            v = readWindow()
+            ring.put(ticks_ms() - tStart, v)
+        except OSError:
+            acqErrors += 1
+            sleep_ms(100)
+
+profileLoop = False  # True: time + allocation per loop section
+profEvery = 50       # print the profile table every N windows
+P_READ, P_AVG, P_FMT, P_DISP = 0, 1, 2, 3   # profiled sections
+prof = loopprof.LoopProf(("read", "average", "format", "display"),
+                         depth=profEvery, enabled=profileLoop)
+
+# T = heater on, S = settling after a heater switch (not in phase stats)
+if binaryOut:  # flags: bit0 = heater on, bit1 = settling
+    rec.writeHeader()
+else:
+    print("sec, T1, T2, T3, T4, RH1, RH2, RH3, RH4, T, S")  # CSV column headers
+
+if dualCore:
+    _thread.start_new_thread(core1, ())
+errShown = 0
+nWin = 0  # windows shown so far
+tWin = ticks_ms()  # end of the previous window
 
 while True:
     try:
-        Tsum1 = 0
-        Hsum1 = 0
-        Tsum2 = 0
-        Hsum2 = 0
-        Tsum3 = 0
-        Hsum3 = 0
-        Tsum4 = 0
-        Hsum4 = 0
-        for i in range(avgCount):
-            Tsum1 += sensor1.temperature
-            Hsum1 += sensor1.relative_humidity
-            Tsum2 += sensor2.temperature
-            Hsum2 += sensor2.relative_humidity
-            Tsum3 += sensor3.temperature
-            Hsum3 += sensor3.relative_humidity
-            trhData = TRH_get(sense4)
-            Tsum4 += trhData[0]
-            Hsum4 += trhData[1]
-
-            
-        degC = Tsum1 / avgCount
-        RH = Hsum1 / avgCount
-        degC2 = Tsum2 / avgCount
-        RH2 = Hsum2 / avgCount
-        degC3 = Tsum3 / avgCount
-        RH3 = Hsum3 / avgCount
-        degC4 = Tsum4 / avgCount
-        RH4 = Hsum4 / avgCount
-        et = (ticks_ms() - tStart)/1000.0 # units of seconds
-        print("%.1f, %.3f, %.3f, %.3f, %.3f, %.3f, %.3f, %.3f, %.3f, %d"
-              % (et, degC, degC2, degC3, degC4, RH, RH2, RH3, RH4, SHT31_Heat))
+        prof.start(P_READ)
+        if dualCore:  # wait for core 1 to finish a window
+            t = ring.get(vals)
+            if t is None:
+                prof.stop(P_READ)
+                sleep_ms(10)
+                continue
+            degC, degC2, degC3, degC4, RH, RH2, RH3, RH4 = vals
+            if acqErrors != errShown:
+                print("# core1 OSError count %d" % acqErrors)
+                errShown = acqErrors
+        else:
+            t = None
+            degC, degC2, degC3, degC4, RH, RH2, RH3, RH4 = readWindow()
+        prof.stop(P_READ)
+
+        prof.start(P_AVG)
+        if t is None:
+            t = ticks_ms() - tStart
+        et = t/1000.0 # units of seconds
+        settling = not heater.add((degC, degC2, degC3, degC4, RH, RH2, RH3, RH4))
+        prof.stop(P_AVG)
+        prof.start(P_FMT)
+        if binaryOut:
+            rec.write(t,
+                      (degC, degC2, degC3, degC4, RH, RH2, RH3, RH4),
+                      heater.heat | (settling << 1))
+        else:
+            print("%.1f, %.3f, %.3f, %.3f, %.3f, %.3f, %.3f, %.3f, %.3f, %d, %d"
+                  % (et, degC, degC2, degC3, degC4, RH, RH2, RH3, RH4,
+                     heater.heat, settling))
         msg1 = ("1 %4.2fC %4.2f%%" % (degC, RH))
         msg2 = ("2 %4.2fC %4.2f%%" % (degC2, RH2))
         msg3 = ("3 %4.2fC %4.2f%%" % (degC3, RH3))
         msg4 = ("4 %4.2fC %4.2f%%" % (degC4, RH4))
         msgT = ("%.1f s" % (et))
+        prof.stop(P_FMT)
+        prof.start(P_DISP)
         display.fill(0)
         display.text(msg1,1,10, color=1)
         display.text(msg2,1,20, color=1)
         display.text(msg3,1,30, color=1)
         display.text(msg4,1,40, color=1)
         display.text(msgT,1,50, color=1)
-        display.show()
-        
-        tCycles += 1
-        if (tCycles >= CycleLength):
-            tCycles = 0
-            SHT31_Heat = not (SHT31_Heat)
-        TRH_SetHeat(sense4, SHT31_Heat)  # update the heater value
+        with tr.span(SP_SHOW):
+            hDisp.run(display.show)
+        prof.stop(P_DISP)
+
+        heater.step()  # switches heater (one I2C write) at end of phase
+        nWin += 1
+        if (nWin % healthEvery) == 0:
+            i2chealth.report(healths)
+        prof.endLoop()
+        if profileLoop and (prof.loops % profEvery) == 0:
+            prof.summary(swVersion)
+        if traceSpans:
+            dtWin = ticks_diff(ticks_ms(), tWin)
+            if traceSlowMs and dtWin > traceSlowMs:
+                print("# slow window: %d ms" % dtWin)
+                dumpTrace()
+            elif spantrace.poll():  # 't' on the serial port
+                dumpTrace()
+        tWin = ticks_ms()
+
+    except KeyboardInterrupt:
+        running = False  # let the core 1 loop end too
+        raise
 
     except OSError as e:
         print("Encountered OSError in main loop")
@@ -8,6 +8,9 @@ from time import sleep, sleep_ms, time, ticks_ms
 #import time
 import sh1106  # OLED  driver: github.com/robert-hh/SH1106
 import ahtx0   # AHT10 driver: github.com/targetblank/micropython_ahtx0
+import binrec  # compact binary record output
+import adcsvc  # background ADC: die temperature, Vsys
+import i2ctune # SoftI2C clock picked by test, cached in i2ctune.json
 import sys
 
 swVersion = "RH Readout 0.5"
@@ -18,14 +21,26 @@ i2c1 = I2C(1, sda=Pin(14,Pin.PULL_UP), scl=Pin(15,Pin.PULL_UP), freq=400_000)
 # I2C connection to AHT10 sensor1 (addr = 0x38)
 i2c0 = I2C(0, sda=Pin(16,Pin.PULL_UP), scl=Pin(17,Pin.PULL_UP), freq=400_000)
 
+autoTune = False  # True: pick SoftI2C clocks by test (first boot takes a few
+                  # seconds per bus), hand-picked values below if none is clean
+
+def softBus(scl, sda):  # function(freq) -> SoftI2C on these pins
+    return lambda f: SoftI2C(scl=Pin(scl,Pin.PULL_UP), sda=Pin(sda,Pin.PULL_UP),
+                             freq=f)
+
+def tunedBus(name, makeBus, check, freq, n=20):
+    if autoTune:  # first boot: a few seconds of test reads per bus
+        freq = i2ctune.busFreq(name, makeBus, check, n=n, fallback=freq)
+    return makeBus(freq)
+
 # I2C connection to AHT10 sensor2 (addr = 0x3c)
-i2c2 = SoftI2C(scl=Pin(19,Pin.PULL_UP), sda=Pin(18,Pin.PULL_UP), freq=400_000)
+i2c2 = tunedBus("soft19", softBus(19, 18), i2ctune.checkAHT, 400_000, n=10)
 
 # I2C connection to AHT10 sensor3 (addr = 0x3c)
-i2c3 = SoftI2C(scl=Pin(13,Pin.PULL_UP), sda=Pin(12,Pin.PULL_UP), freq=400_000)
+i2c3 = tunedBus("soft13", softBus(13, 12), i2ctune.checkAHT, 400_000, n=10)
 
 # I2C connection to SHT31 sensor4 (addr = 0x44)
-i2c4= SoftI2C(scl=Pin(9,Pin.PULL_UP), sda=Pin(8,Pin.PULL_UP), freq=1_000_000)
+i2c4 = tunedBus("soft9", softBus(9, 8), i2ctune.checkSHT3x, 1_000_000)
 
 #devices = i2c4.scan()
 #if devices:
@@ -115,7 +130,20 @@ CycleLength = 400 # how many cycles before switching heater on/off
 tCycles = 0  # loop counter
 tStart = ticks_ms()
 
-print("sec, T1, T2, T3, T4, RH1, RH2, RH3, RH4")  # CSV column headers
+binaryOut = False  # True: binrec records on serial instead of CSV lines
+chNames = ("T1", "T2", "T3", "T4", "RH1", "RH2", "RH3", "RH4", "Tdie", "Vsys")
+# temperature stored as (T-20)*500, RH as RH*100, Vsys as mV in int16
+rec = binrec.BinRec(chNames, scales=(500,)*4 + (100,)*4 + (500, 1000),
+                    offsets=(20,)*4 + (0,)*4 + (20, 0), tScale=1000)
+
+# RP2040 die temperature and Vsys, read round-robin from a timer
+adc = adcsvc.ADCService((adcsvc.TDIE, adcsvc.VSYS), rate=200)
+adc.start()
+
+if binaryOut:
+    rec.writeHeader()
+else:
+    print("sec, T1, T2, T3, T4, RH1, RH2, RH3, RH4, Tdie, Vsys")  # CSV column headers
 
 while True:
     try:
@@ -148,8 +176,13 @@ while True:
         degC4 = Tsum4 / avgCount
         RH4 = Hsum4 / avgCount
         et = (ticks_ms() - tStart)/1000.0 # units of seconds
-        print("%.1f, %.3f, %.3f, %.3f, %.3f, %.3f, %.3f, %.3f, %.3f"
-              % (et, degC, degC2, degC3, degC4, RH, RH2, RH3, RH4))
+        Tdie, Vsys = adc.values()  # latest filtered values, no waiting
+        if binaryOut:
+            rec.write(ticks_ms() - tStart,
+                      (degC, degC2, degC3, degC4, RH, RH2, RH3, RH4, Tdie, Vsys))
+        else:
+            print("%.1f, %.3f, %.3f, %.3f, %.3f, %.3f, %.3f, %.3f, %.3f, %.2f, %.3f"
+                  % (et, degC, degC2, degC3, degC4, RH, RH2, RH3, RH4, Tdie, Vsys))
         msg1 = ("1 %4.2fC %4.2f%%" % (degC, RH))
         msg2 = ("2 %4.2fC %4.2f%%" % (degC2, RH2))
         msg3 = ("3 %4.2fC %4.2f%%" % (degC3, RH3))
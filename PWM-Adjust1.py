@@ -7,6 +7,8 @@
 from machine import Pin, ADC, PWM, I2C
 from time import sleep, time
 import sh1106  # OLED driver from github.com/robert-hh/SH1106y
+import oversample  # burst ADC averaging
+import buttons  # debounced pushbutton events from pin IRQs
 
 swVersion = "PWM Control 1.1"
 
@@ -18,9 +20,10 @@ Vref = 3.2335   # measured value of V3.3 (ADC Vref)
 Rratio = 3.0    # Pico 3:1 onboard Vsys divider
 vScale = Rratio * Vref / ADCmax
 vOffset = +0.027  # where does this come from?
+vsysOs = oversample.Oversampler(vsysCh, 64)
 
-def getVsys():  # read vSys in volts
-    return (vsysCh.read_u16() * vScale + vOffset)
+def getVsys():  # read vSys in volts, mean of a 64 reading burst
+    return (vsysOs.read() * vScale + vOffset)
 
 i2c1 = I2C(1, sda=Pin(14,Pin.PULL_UP), scl=Pin(15,Pin.PULL_UP),  freq=400_000)
 #devices = i2c1.scan()
@@ -42,9 +45,10 @@ display.fill_rect(0,0, 127, 63, 0)
 display.text(swVersion,1,1, color=1)
 display.show()
 
-# create an input pin on pin #2, with a pull up resistor
-p1 = Pin(22, Pin.IN, Pin.PULL_UP) # GPIO22 = Pico Pin 29
-p2 = Pin(21, Pin.IN, Pin.PULL_UP) # GPIO21 = Pico Pin 27
+# pushbuttons to ground to INC/DEC the PWM frequency
+# hold to repeat; press both together to reset to the minimum frequency
+btn = buttons.Buttons((Pin(22),   # GPIO22 = Pico Pin 29, up
+                       Pin(21)))  # GPIO21 = Pico Pin 27, down
 
 
 TEC=PWM(Pin(12))   # PWM to TEC controller
@@ -52,7 +56,8 @@ pwmFreq = 1000
 TEC.freq(pwmFreq)
 
 pot=ADC(28)        # creating potentiometer object
-nAvg = 10          # average this many ADC readings
+nAvg = 256         # average this many ADC readings, back to back
+potOs = oversample.Oversampler(pot, nAvg)
 loops = 0          # loop counter
 vsysVoltage  = getVsys()
 vAvg = vsysVoltage
@@ -63,11 +68,7 @@ tStart = time()    # uPython epoch from Jan.2000
 
 try:
     while True:
-        potValue = 0
-        for i in range(nAvg):
-            potValue += pot.read_u16()           #reading analog pin
-            sleep(0.01)
-        potValue = int(potValue/ nAvg)
+        potValue = int(potOs.read())  # reading analog pin, burst mean
         pct = 100.0 * potValue/65535
         outs=("%0.1f %%" % pct)              # PWM setting in # from 0..100
                 
@@ -100,14 +101,19 @@ try:
         display.fill_rect(0,52, 127, 42, 0)
         display.text(tString,1,52, color=1)
         
-        if (p1.value() == 0):  # up/down control for PWM frequency
-            pwmFreq *= 1.05
-        if (p2.value() == 0):
-            pwmFreq /= 1.05
+        btn.wait(250)  # idle until a button event, or 0.25 s
+        ev = btn.get()
+        while ev is not None:  # up/down control for PWM frequency
+            b, kind = ev
+            other = btn.down[1 - b]  # the other button is held too
+            if kind == buttons.PRESS and other:
+                pwmFreq = 1000    # both buttons: back to the minimum
+            elif (kind == buttons.PRESS or kind == buttons.REPEAT) and not other:
+                pwmFreq = pwmFreq * 1.05 if b == 0 else pwmFreq / 1.05
+            ev = btn.get()
         if (pwmFreq < 1000):  # limit minimum PWM frequency
             pwmFreq = 1000
         TEC.freq(int(pwmFreq))
-        sleep(0.25)
         
 except KeyboardInterrupt:
     TEC.duty_u16(0)
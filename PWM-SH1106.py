@@ -5,9 +5,13 @@
 # 4-Dec-2022 J.Beale
 
 from machine import Pin, ADC, PWM, I2C
-from time import sleep, time
+from time import time
 import sh1106  # OLED driver from github.com/robert-hh/SH1106
 import vsys    # read Vsys voltage
+import oversample  # burst ADC averaging
+import buttons  # debounced pushbutton events from pin IRQs
+import pid     # PID with anti-windup and slew limit
+import tecpid  # fixed-rate TEC control from a Timer
 
 swVersion = "PWM Control 1.2"
 
@@ -30,17 +34,33 @@ display.text(swVersion,1,1, color=1)
 display.show()
 
 # pushbuttons to ground to INC/DEC the PWM frequency
-p1 = Pin(22, Pin.IN, Pin.PULL_UP) # GPIO22 = Pico Pin 29
-p2 = Pin(21, Pin.IN, Pin.PULL_UP) # GPIO21 = Pico Pin 27
+# hold to repeat; press both together to reset to the minimum frequency
+btn = buttons.Buttons((Pin(22),   # GPIO22 = Pico Pin 29, up
+                       Pin(21)))  # GPIO21 = Pico Pin 27, down
 
-vs = vsys.Vsys(vref=3.210, voff=0.02) # to read Pico Vsys voltage
+vs = vsys.Vsys(vref=3.210, voff=0.02, nAvg=64) # to read Pico Vsys voltage
     
 TEC=PWM(Pin(12))   # PWM to TEC controller
 pwmFreq = 1000
 TEC.freq(pwmFreq)
 
+# closed loop: the pot sets a temperature setpoint, a PID sets the TEC duty
+# from an AHT10 on the display bus (addr 0x38); a timer paces the steps,
+# which run in this loop (ctl.poll()) so they never overlap a display write
+closedLoop = False
+spMin, spMax = 5.0, 35.0  # setpoint range of the pot, degC
+if closedLoop:
+    import ahtx0   # AHT10 driver: github.com/targetblank/micropython_ahtx0
+    sensor = ahtx0.AHT10(i2c1)
+    # tune with tecsim.py; reverse: more duty = colder
+    ctl = tecpid.TecController(pid.PID(0.3, 0.01, 0.0, slew=0.05, reverse=True),
+                               TEC, lambda: sensor.temperature,
+                               setpoint=spMax, rate=2)
+    ctl.start()
+
 pot=ADC(28)        # creating potentiometer object
-nAvg = 10          # average this many ADC readings
+nAvg = 256         # average this many ADC readings, back to back
+potOs = oversample.Oversampler(pot, nAvg)
 loops = 0          # loop counter
 
 vAvg = vs.read()   # read Vsys voltage
@@ -51,11 +71,7 @@ tStart = time()    # uPython epoch from Jan.2000
 
 try:
     while True:
-        potValue = 0
-        for i in range(nAvg):
-            potValue += pot.read_u16()           #reading analog pin
-            sleep(0.01)
-        potValue = int(potValue/ nAvg)
+        potValue = int(potOs.read())  # reading analog pin, burst mean
         pct = 100.0 * potValue/65535
         outs=("%0.1f %%" % pct)              # PWM setting in # from 0..100
                 
@@ -69,9 +85,15 @@ try:
         loops += 1
         tElapsed = time() - tStart
         tString = ("%s s %.3f V" % (tElapsed,vsysVoltage))  # elapsed time, V
+        if closedLoop:
+            ctl.setpoint = spMin + (spMax - spMin) * potValue / 65535
+            outs = ("%.2f>%.2fC" % (ctl.setpoint, ctl.meas or 0.0))
         if (loops % 10) == 0:
             print("%s, %s" % (outs, tString))
-        TEC.duty_u16(potValue)
+            if closedLoop and (loops % 100) == 0:
+                ctl.log()  # control loop timing and error
+        if not closedLoop:
+            TEC.duty_u16(potValue)
 
         display.fill_rect(0,10,128,63, 0)
         display.text(outs,1,20, color=1)
@@ -86,16 +108,30 @@ try:
         display.show()
 
 
-        if (p1.value() == 0):  # up/down control for PWM frequency
-            pwmFreq *= 1.05
-        if (p2.value() == 0):
-            pwmFreq /= 1.05
+        if closedLoop:  # 0.25 s in slices, running control steps as due
+            for k in range(25):
+                ctl.poll()
+                if btn.wait(10):
+                    break
+            ctl.poll()
+        else:
+            btn.wait(250)  # idle until a button event, or 0.25 s
+        ev = btn.get()
+        while ev is not None:  # up/down control for PWM frequency
+            b, kind = ev
+            other = btn.down[1 - b]  # the other button is held too
+            if kind == buttons.PRESS and other:
+                pwmFreq = 1000    # both buttons: back to the minimum
+            elif (kind == buttons.PRESS or kind == buttons.REPEAT) and not other:
+                pwmFreq = pwmFreq * 1.05 if b == 0 else pwmFreq / 1.05
+            ev = btn.get()
         if (pwmFreq < 1000):  # limit minimum PWM frequency
             pwmFreq = 1000
         TEC.freq(int(pwmFreq))
-        sleep(0.25)
         
 except KeyboardInterrupt:
+    if closedLoop:
+        ctl.stop()
     TEC.duty_u16(0)
     print("Program has halted, PWM set to 0")
     
@@ -0,0 +1,186 @@
+"""
+# adaptwin.py : variance-adaptive averaging window length, per channel
+# Each channel averages its readings over a window whose length adapts:
+#  - sample noise is tracked from successive differences (EWMA of
+#    (x - previous)^2 / 2), never below the sensor resolution 'res'
+#  - a reading further than k * noise from the level of the last few
+#    readings (a fast EWMA, which follows a slow drift) is a step: the
+#    window closes at once, without it, and the next window starts from
+#    that reading at the minimum length. Steps are looked for once WARM
+#    differences (plain average) have set the noise level
+#  - a window that fills up is checked: variance no more than growVar *
+#    noise^2 means the signal was flat, so the next one is twice as long
+#    (up to maxN); more than that (a drift) halves it (down to minN)
+# A second value (e.g. RH from the same sensor) can ride along on the
+# window the first one (T) decides. nan readings (sensor missing) are
+# skipped; after maxN of them in a row the channel reports nan and starts
+# its noise estimate over.
+# linked=True gives all channels one window: a step on any channel or any
+# full window closes them all, and the next one only grows if every
+# channel was flat. A channel without readings in it reports nan.
+# Otherwise 'ready' is set when any channel finishes a window; mean /
+# mean2 hold each channel's newest finished window and used its length,
+# 0 for a channel with nothing new since clear(), whose mean is carried.
+# Sums are kept relative to each window's first reading, so float32
+# arrays keep the precision a 0.01 degC variance needs.
+# 19-Oct-2026
+
+# Usage Example:
+import adaptwin
+aw = adaptwin.AdaptWin(2, minN=4, maxN=64, res=0.01, linked=True)
+while True:
+    aw.add(0, sensor1.temperature, sensor1.relative_humidity)
+    aw.add(1, sensor2.temperature, sensor2.relative_humidity)
+    if aw.ready:   # the shared window closed
+        print("%.3f, %.3f, %d, %d" % (aw.mean[0], aw.mean[1],
+                                      aw.used[0], aw.used[1]))
+        aw.clear()
+    sleep(0.25)
+"""
+
+from array import array
+
+NAN = float("nan")
+WARM = 8  # successive differences seen before steps are looked for
+FAST = 0.25  # EWMA weight of a reading in the level steps are tested on
+
+class AdaptWin:
+    def __init__(self, nCh, minN=4, maxN=64, k=4.0, growVar=2.0, res=0.01,
+                 alpha=1/16, linked=False):
+        self.nCh = nCh
+        self.linked = linked        # one window for all channels
+        self.minN = minN
+        self.maxN = maxN
+        # step threshold, in noise variances: x - level has the noise of x
+        # plus that of the EWMA level, FAST / (2 - FAST) of it
+        self.k2 = k * k * (1 + FAST / (2 - FAST))
+        self.growVar = growVar      # flat window: variance < growVar*noise^2
+        self.res2 = res * res       # noise variance floor
+        self.alpha = alpha          # noise EWMA weight of a new difference
+        self.target = array("H", [minN] * nCh)  # length of the open window
+        self.cnt = array("H", [0] * nCh)        # readings in it so far
+        self.x0 = array("f", [0.0] * nCh)       # its first reading
+        self.sd = array("f", [0.0] * nCh)       # sum of x - x0
+        self.sdd = array("f", [0.0] * nCh)      # sum of (x - x0)^2
+        self.sy = array("f", [0.0] * nCh)       # sum of the second value
+        self.prev = array("f", [NAN] * nCh)     # last reading
+        self.level = array("f", [NAN] * nCh)    # fast EWMA of readings
+        self.noise2 = array("f", [self.res2] * nCh)
+        self.nDiff = array("B", [0] * nCh)      # noise updates, up to WARM
+        self.miss = array("H", [0] * nCh)       # nan readings in a row
+        self.mean = array("f", [NAN] * nCh)     # newest finished windows
+        self.mean2 = array("f", [NAN] * nCh)
+        self.used = array("H", [0] * nCh)       # their lengths, 0 = none
+        self.ready = False
+        self.steps = 0              # steps detected, all channels
+
+    def _start(self, ch, x, y):
+        self.cnt[ch] = 1
+        self.x0[ch] = x
+        self.sd[ch] = 0.0
+        self.sdd[ch] = 0.0
+        self.sy[ch] = y
+
+    def _finish(self, ch):
+        c = self.cnt[ch]
+        if c:
+            self.mean[ch] = self.x0[ch] + self.sd[ch] / c
+            self.mean2[ch] = self.sy[ch] / c
+        elif self.linked:           # no readings in the shared window
+            self.mean[ch] = NAN
+            self.mean2[ch] = NAN
+        self.used[ch] = c
+        self.cnt[ch] = 0
+        self.ready = True
+
+    def _close(self, ch, t):  # finish ch's window (all, if linked)
+        if self.linked:
+            for i in range(self.nCh):
+                self._finish(i)
+                self.target[i] = t
+        else:
+            self._finish(ch)
+            self.target[ch] = t
+
+    def add(self, ch, x, y=0.0):  # one reading; True if a window finished
+        if x != x:
+            m = self.miss[ch] + 1
+            self.miss[ch] = m
+            if m == self.maxN:      # gone for a whole long window
+                self.prev[ch] = NAN # the next reading starts afresh:
+                self.level[ch] = NAN    # no difference or step across
+                self.nDiff[ch] = 0      # the gap, noise learnt again
+                self.noise2[ch] = self.res2
+                if self.linked:     # its shared windows report nan
+                    return False
+                self.mean[ch] = NAN
+                self.mean2[ch] = NAN
+                self.used[ch] = 0
+                self.cnt[ch] = 0
+                self.target[ch] = self.minN
+                self.ready = True
+                return True
+            return False
+        self.miss[ch] = 0
+        lv = self.level[ch]
+        e = x - lv                  # distance from the recent level
+        if self.nDiff[ch] >= WARM and e * e > self.k2 * self.noise2[ch]:
+            self.steps += 1
+            self._close(ch, self.minN)
+            self._start(ch, x, y)
+            self.prev[ch] = x
+            self.level[ch] = x
+            return True
+        self.level[ch] = x if lv != lv else lv + FAST * e
+        c = self.cnt[ch]
+        if c == 0:
+            self._start(ch, x, y)
+            self.prev[ch] = x
+            return self._full(ch)
+        d = x - self.x0[ch]
+        p = self.prev[ch]
+        if p == p:
+            q = x - p
+            nd = self.nDiff[ch]
+            a = self.alpha
+            if nd < WARM:
+                a = 1.0 / (nd + 1)  # plain average while warming up
+                self.nDiff[ch] = nd + 1
+            n2 = self.noise2[ch]
+            n2 += a * (q * q / 2 - n2)
+            self.noise2[ch] = n2 if n2 > self.res2 else self.res2
+        self.prev[ch] = x
+        self.cnt[ch] = c + 1
+        self.sd[ch] += d
+        self.sdd[ch] += d * d
+        self.sy[ch] += y
+        return self._full(ch)
+
+    def _flat(self, ch):  # window variance within growVar * noise^2
+        c = self.cnt[ch]
+        if c < 2:
+            return True
+        m = self.sd[ch] / c
+        return self.sdd[ch] / c - m * m <= self.growVar * self.noise2[ch]
+
+    def _full(self, ch):  # close a full window and pick the next length
+        if self.cnt[ch] < self.target[ch]:
+            return False
+        if self.linked:
+            flat = True
+            for i in range(self.nCh):
+                flat = flat and self._flat(i)
+        else:
+            flat = self._flat(ch)
+        t = self.target[ch]
+        if flat:
+            t = min(self.maxN, t * 2)
+        else:
+            t = max(self.minN, t // 2)
+        self._close(ch, t)
+        return True
+
+    def clear(self):  # after the caller has used the finished windows
+        for ch in range(self.nCh):
+            self.used[ch] = 0
+        self.ready = False
@@ -0,0 +1,77 @@
+"""
+# adcsvc.py : round-robin ADC service for pot, Vsys and die temperature
+# A machine.Timer reads one channel per tick, cycling through the
+# configured channels at a fixed aggregate rate, and keeps a fixed-point
+# lowpass filtered value per channel (integer math only in the callback).
+# value() returns the latest filtered reading with that channel's
+# precomputed scale/offset applied; it never waits for the ADC.
+# 19-Oct-2026
+
+# Usage Example:
+import adcsvc
+svc = adcsvc.ADCService((adcsvc.POT, adcsvc.VSYS, adcsvc.TDIE), rate=1000)
+svc.start()
+while True:
+    print(svc.value("Tdie"), svc.value("Vsys"))
+"""
+
+from machine import ADC, Pin, Timer
+
+# (name, ADC input, scale, offset): value = read_u16 * scale + offset
+POT = ("pot", 28, 100.0 / 65535, 0.0)                 # percent
+VSYS = ("Vsys", 3, 3.0 * 3.3 / 65535, 0.0)            # volts, Pico only
+TDIE = ("Tdie", 4, -3.3 / 65535 / 0.001721,           # RP2040 die temp, C
+        27 + 0.706 / 0.001721)
+
+FRAC = 8    # fixed point fraction bits of the filter state
+
+class ADCService:
+    def __init__(self, channels, rate=1000, shift=4):
+        self.names = [c[0] for c in channels]
+        self.n = len(channels)
+        self.adcs = []
+        for c in channels:
+            if c[1] == 3:
+                Pin(29, Pin.IN)    # no pullup/down for pin 29 reading Vsys
+            self.adcs.append(ADC(c[1]))
+        self.scales = [c[2] / (1 << FRAC) for c in channels]
+        self.offsets = [c[3] for c in channels]
+        self.rate = rate          # total reads per second, all channels
+        self.shift = shift        # filter: state += (x - state) >> shift
+        self.acc = [0] * self.n   # filter state, counts << FRAC
+        self.primed = [False] * self.n
+        self.ch = 0               # next channel to read
+        self.reads = 0
+        self.timer = None
+
+    def _tick(self, t=None):  # one read, called from the timer
+        i = self.ch
+        x = self.adcs[i].read_u16() << FRAC
+        if self.primed[i]:
+            self.acc[i] += (x - self.acc[i]) >> self.shift
+        else:
+            self.acc[i] = x
+            self.primed[i] = True
+        self.ch = i + 1 if i + 1 < self.n else 0
+        self.reads += 1
+
+    def poll(self):  # read one channel by hand instead of using the timer
+        self._tick()
+
+    def start(self):
+        if self.timer is None:
+            self.timer = Timer(freq=self.rate, mode=Timer.PERIODIC,
+                               callback=self._tick)
+
+    def stop(self):
+        if self.timer is not None:
+            self.timer.deinit()
+            self.timer = None
+
+    def value(self, name):  # latest filtered value in channel units
+        i = self.names.index(name)
+        return self.acc[i] * self.scales[i] + self.offsets[i]
+
+    def values(self):  # all channels, in configured order
+        return [self.acc[i] * self.scales[i] + self.offsets[i]
+                for i in range(self.n)]
@@ -0,0 +1,161 @@
+"""
+# binrec.py : compact binary record format for sensor logs and serial output
+# Instead of one formatted CSV line per window (60-80 bytes), write a header
+# describing the channels once, then fixed-size struct-packed records:
+#   sync(0xA5) flags(u8) time(u32) value[nCh](i16)  = 6 + 2*nCh bytes
+# Each value is stored as round((x - offset) * scale); values that do not fit
+# (including -999 CRC error markers) are stored as MISSING and flag bit 7 set.
+# The same module has the host-side decoder, which needs numpy.
+# 19-Oct-2026
+
+# Usage Example (Pico):
+import binrec
+br = binrec.BinRec(("T1", "RH1"), scales=(500, 100), offsets=(20, 0),
+                   tScale=1000)
+br.writeHeader()
+while True:
+    ...
+    br.write(ticks_ms() - tStart, (degC, RH))
+
+# Usage Example (host):
+#   python binrec.py capture.bin          (prints CSV)
+import binrec
+hdr, t, vals, flags = binrec.load("capture.bin")  # numpy arrays
+"""
+
+import struct
+import sys
+
+MAGIC = b"PBR"      # Pico Binary Records
+VERSION = 1
+SYNC = 0xA5         # first byte of every record, never valid ASCII text
+MISSING = -32768    # stored value when reading is absent or out of range
+
+FLAG_MISSING = 0x80  # set when any value in the record is MISSING
+
+HDR_FMT = "<3sBBBHf"  # magic, version, nCh, reserved, recSize, tScale
+CH_FMT = "<ffB"       # scale, offset, name length (name bytes follow)
+
+def recFormat(nCh):   # struct format of one record
+    return "<BBI%dh" % nCh
+
+
+class BinRec:
+    def __init__(self, names, scales, offsets=None, tScale=1, out=None):
+        self.names = names          # channel names, as in the CSV header
+        self.nCh = len(names)
+        self.scales = scales        # stored int = (x - offset) * scale
+        if offsets is None:
+            offsets = (0,) * self.nCh
+        self.offsets = offsets
+        self.tScale = tScale        # time units per second (1000 = ms)
+        if out is None:             # binary stream, USB serial by default
+            out = getattr(sys.stdout, "buffer", sys.stdout)
+        self.out = out
+        self.fmt = recFormat(self.nCh)
+        self.size = struct.calcsize(self.fmt)
+        self.buf = bytearray(self.size)   # reused for every record
+        self.ivals = [0] * self.nCh
+        self.count = 0              # records written
+
+    def header(self):  # bytes describing this stream, send once at start
+        h = struct.pack(HDR_FMT, MAGIC, VERSION, self.nCh, 0, self.size,
+                        self.tScale)
+        for i in range(self.nCh):
+            name = self.names[i].encode()
+            h += struct.pack(CH_FMT, self.scales[i], self.offsets[i],
+                             len(name)) + name
+        return h
+
+    def writeHeader(self):
+        self.out.write(self.header())
+
+    def pack(self, t, values, flags=0):  # fill and return the record buffer
+        iv = self.ivals
+        for i in range(self.nCh):
+            x = (values[i] - self.offsets[i]) * self.scales[i]
+            if (x != x) or (x <= MISSING) or (x > 32767):  # NaN or no fit
+                iv[i] = MISSING
+                flags |= FLAG_MISSING
+            else:
+                iv[i] = int(round(x))
+        struct.pack_into(self.fmt, self.buf, 0, SYNC, flags,
+                         int(t) & 0xFFFFFFFF, *iv)
+        return self.buf
+
+    def write(self, t, values, flags=0):
+        self.out.write(self.pack(t, values, flags))
+        self.count += 1
+
+
+# ---------------------------------------------------------------------
+# host side decoder
+
+def parseHeader(data, pos=0):  # returns (header dict, position after it)
+    start = data.find(MAGIC, pos)
+    if start < 0:
+        raise ValueError("no binrec header found")
+    magic, ver, nCh, _, size, tScale = struct.unpack_from(HDR_FMT, data, start)
+    if ver != VERSION:
+        raise ValueError("unsupported binrec version %d" % ver)
+    p = start + struct.calcsize(HDR_FMT)
+    names, scales, offsets = [], [], []
+    for i in range(nCh):
+        scale, offset, n = struct.unpack_from(CH_FMT, data, p)
+        p += struct.calcsize(CH_FMT)
+        names.append(bytes(data[p:p+n]).decode())
+        p += n
+        scales.append(scale)
+        offsets.append(offset)
+    hdr = {"version": ver, "nCh": nCh, "recSize": size, "tScale": tScale,
+           "names": names, "scales": scales, "offsets": offsets}
+    return hdr, p
+
+def decode(data):  # bytes -> (header, t [s], values [nRec,nCh], flags)
+    import numpy as np
+    hdr, p = parseHeader(data)
+    nCh, size = hdr["nCh"], hdr["recSize"]
+    dtype = np.dtype([("sync", "u1"), ("flags", "u1"), ("t", "<u4"),
+                      ("v", "<i2", (nCh,))])
+    n = (len(data) - p) // size
+    recs = np.frombuffer(data, dtype=dtype, count=n, offset=p)
+    if not (recs["sync"] == SYNC).all():
+        recs = _resync(data, p, dtype, size)   # text was mixed in
+    v = recs["v"]
+    if v.ndim == 1:
+        v = v.reshape(-1, nCh)
+    vals = v.astype(np.float64)
+    vals[v == MISSING] = np.nan
+    vals = vals / np.asarray(hdr["scales"]) + np.asarray(hdr["offsets"])
+    t = recs["t"].astype(np.float64) / hdr["tScale"]
+    return hdr, t, vals, recs["flags"].copy()
+
+def _resync(data, p, dtype, size):  # slow path: skip bytes between records
+    import numpy as np
+    keep = []
+    end = len(data) - size
+    while p <= end:
+        if data[p] == SYNC:
+            keep.append(p)
+            p += size
+        else:
+            nxt = data.find(bytes((SYNC,)), p)
+            if nxt < 0:
+                break
+            p = nxt
+    buf = b"".join(bytes(data[k:k+size]) for k in keep)
+    return np.frombuffer(buf, dtype=dtype)
+
+def load(fname):
+    with open(fname, "rb") as fp:
+        return decode(fp.read())
+
+def main(argv):
+    hdr, t, vals, flags = load(argv[1])
+    print("t, " + ", ".join(hdr["names"]) + ", flags")
+    for i in range(len(t)):
+        print("%.3f, %s, %d" % (t[i], ", ".join("%.3f" % x for x in vals[i]),
+                                flags[i]))
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,136 @@
+"""
+# buttons.py : IRQ-driven, debounced pushbuttons with an event queue
+# Each button (to ground, with pullup) gets a pin IRQ on both edges. An
+# edge starts a one-shot Timer (edges while it runs are ignored) that
+# reads the pin 'debounceMs' later and acts on the state it settled in,
+# so a bounce or a release right after a press can't leave the button
+# seen as held. A press puts a PRESS event in the queue; while the button
+# is held a Timer adds REPEAT events (first after 'repeatMs[0]', then
+# every 'repeatMs[1]'); releasing
+# after more than 'longMs' adds LONG, otherwise RELEASE. A hold that already
+# sent REPEATs always ends in RELEASE, so hold-to-ramp is never mistaken for
+# a long press (repeatMs=None: no repeats, holds give LONG).
+# The queue is a small ring (bytearray) written only by the IRQ side and
+# read only by the main loop, so it needs no lock. wait() sleeps in
+# machine.idle() until an event arrives, so an idle loop takes no CPU.
+# 19-Oct-2026
+
+# Usage Example:
+import buttons
+btn = buttons.Buttons((Pin(22), Pin(21)))   # button ids 0, 1
+while True:
+    btn.wait(250)          # returns at once on an event
+    ev = btn.get()
+    while ev is not None:
+        b, kind = ev
+        if kind in (buttons.PRESS, buttons.REPEAT):
+            ...
+        ev = btn.get()
+"""
+
+from machine import Pin, Timer, idle
+from time import ticks_ms, ticks_diff
+
+PRESS = 1
+REPEAT = 2
+RELEASE = 3
+LONG = 4
+
+class Buttons:
+    def __init__(self, pins, debounceMs=20, repeatMs=(400, 100),
+                 longMs=1000, size=16):
+        self.pins = pins
+        self.debounceMs = debounceMs
+        self.repeatMs = repeatMs    # hold: first repeat, then period
+        self.longMs = longMs        # release after this = LONG event
+        self.size = size
+        self.q = bytearray(size)    # events: (button << 3) | kind
+        self.head = 0               # next write, IRQ side only
+        self.tail = 0               # next read, main loop only
+        self.lost = 0               # events dropped, queue full
+        n = len(pins)
+        self.tDown = [0] * n        # when the button went down
+        self.down = [False] * n
+        self.rep = [False] * n      # REPEAT sent during this press
+        self.timers = [Timer() for _ in range(n)]  # repeats
+        self.settling = [False] * n # debounce timer running
+        self.dTimers = [Timer() for _ in range(n)]
+        self._settleCb = [self._makeSettle(i) for i in range(n)]
+        self._repeatCb = [self._makeRepeat(i) for i in range(n)]
+        self._firstCb = [self._makeFirst(i) for i in range(n)]
+        for i, p in enumerate(pins):
+            p.init(Pin.IN, Pin.PULL_UP)
+            p.irq(handler=self._makeEdge(i),
+                  trigger=Pin.IRQ_FALLING | Pin.IRQ_RISING)
+
+    def _put(self, b, kind):
+        h = (self.head + 1) % self.size
+        if h == self.tail:
+            self.lost += 1
+            return
+        self.q[self.head] = (b << 3) | kind
+        self.head = h
+
+    def _makeEdge(self, i):
+        def edge(pin):
+            if self.settling[i]:
+                return              # the running timer reads it later
+            self.settling[i] = True
+            self.dTimers[i].init(mode=Timer.ONE_SHOT, period=self.debounceMs,
+                                 callback=self._settleCb[i])
+        return edge
+
+    def _makeSettle(self, i):  # debounceMs after an edge: act on the pin
+        pin = self.pins[i]
+        def settle(t):
+            self.settling[i] = False
+            now = ticks_ms()
+            isDown = pin.value() == 0
+            if isDown == self.down[i]:
+                return              # bounce ended in the same state
+            self.down[i] = isDown
+            if isDown:
+                self.tDown[i] = now
+                self.rep[i] = False
+                self._put(i, PRESS)
+                if self.repeatMs:
+                    self.timers[i].init(mode=Timer.ONE_SHOT,
+                                        period=self.repeatMs[0],
+                                        callback=self._firstCb[i])
+            else:
+                self.timers[i].deinit()
+                held = ticks_diff(now, self.tDown[i])
+                self._put(i, LONG if held >= self.longMs and not self.rep[i]
+                          else RELEASE)
+        return settle
+
+    def _makeFirst(self, i):  # first repeat, then switch to periodic
+        def first(t):
+            if self.down[i]:
+                self.rep[i] = True
+                self._put(i, REPEAT)
+                self.timers[i].init(mode=Timer.PERIODIC,
+                                    period=self.repeatMs[1],
+                                    callback=self._repeatCb[i])
+        return first
+
+    def _makeRepeat(self, i):
+        def repeat(t):
+            if self.down[i]:
+                self._put(i, REPEAT)
+            else:
+                self.timers[i].deinit()
+        return repeat
+
+    def get(self):  # next (button, kind) or None
+        if self.tail == self.head:
+            return None
+        e = self.q[self.tail]
+        self.tail = (self.tail + 1) % self.size
+        return (e >> 3, e & 7)
+
+    def wait(self, ms):  # idle until an event or 'ms' have passed
+        t0 = ticks_ms()
+        while self.tail == self.head and ticks_diff(ticks_ms(), t0) < ms:
+            idle()
+        return self.tail != self.head
@@ -0,0 +1,126 @@
+"""
+# corering.py : lock-protected ring buffer to pass sensor windows between cores
+# The producer (sensor loop on core 1, started with _thread) put()s one
+# record per averaging window: timestamp, nCh float values, flag byte. The
+# consumer (display / serial / network on core 0) get()s them into its own
+# buffer. All storage is preallocated, so neither side allocates while
+# holding the lock. When the ring is full the oldest record is overwritten
+# and counted in 'dropped': the sensor side never waits for the display.
+# Plain _thread + array, so it runs the same under CPython; run this file
+# on the host to stress the handoff with two ordinary threads.
+# 19-Oct-2026
+
+# Usage Example:
+import _thread, corering
+ring = corering.CoreRing(nCh=8, depth=8)
+def core1():
+    while True:
+        ring.put(ticks_ms(), readWindow())
+_thread.start_new_thread(core1, ())
+vals = [0.0] * 8
+while True:
+    t = ring.get(vals)     # None if nothing new
+    if t is not None:
+        show(t, vals)
+"""
+
+import _thread
+from array import array
+
+class CoreRing:
+    def __init__(self, nCh, depth=8):
+        self.nCh = nCh
+        self.depth = depth
+        self.vals = array("f", [0.0] * (nCh * depth))  # depth rows of nCh
+        self.ts = array("l", [0] * depth)   # timestamp per record, ms
+        self.flags = bytearray(depth)
+        self.lock = _thread.allocate_lock()
+        self.head = 0       # next slot to write
+        self.count = 0      # records waiting
+        self.puts = 0
+        self.dropped = 0    # overwritten before they were read
+        self.lastFlags = 0  # flags of the record from the last get()
+
+    def put(self, t, values, flags=0):  # producer side, never blocks long
+        n = self.nCh
+        self.lock.acquire()
+        h = self.head
+        k = h * n
+        for i in range(n):
+            self.vals[k + i] = values[i]
+        self.ts[h] = t
+        self.flags[h] = flags
+        self.head = (h + 1) % self.depth
+        if self.count == self.depth:
+            self.dropped += 1   # oldest record lost
+        else:
+            self.count += 1
+        self.puts += 1
+        self.lock.release()
+
+    def get(self, out):  # copy oldest record into 'out', return its time
+        n = self.nCh
+        self.lock.acquire()
+        if self.count == 0:
+            self.lock.release()
+            return None
+        s = (self.head - self.count) % self.depth
+        k = s * n
+        for i in range(n):
+            out[i] = self.vals[k + i]
+        t = self.ts[s]
+        self.lastFlags = self.flags[s]
+        self.count -= 1
+        self.lock.release()
+        return t
+
+    def pending(self):  # records waiting to be read
+        return self.count
+
+def selftest(records=200000, nCh=8, depth=8):
+    # producer writes record i as (t=i, every value=i, flags=i&255); any
+    # torn or reordered record shows up as mixed values or a step back in t
+    import sys, time
+    if hasattr(sys, "setswitchinterval"):
+        sys.setswitchinterval(1e-5)  # interleave the threads finely
+    ring = CoreRing(nCh, depth)
+    done = _thread.allocate_lock()
+    done.acquire()
+
+    def producer():
+        row = [0.0] * nCh
+        for i in range(records):
+            for c in range(nCh):
+                row[c] = i
+            ring.put(i, row, i & 255)
+            if i % 4 == 0:
+                time.sleep(0)   # let the consumer in, like a second core
+        done.release()
+
+    out = [0.0] * nCh
+    got = torn = 0
+    last = -1
+    t0 = time.time()
+    _thread.start_new_thread(producer, ())
+    while True:
+        finished = done.acquire(0)
+        t = ring.get(out)
+        while t is not None:
+            got += 1
+            if (t <= last or ring.lastFlags != (t & 255)
+                    or any(x != t for x in out)):
+                torn += 1
+            last = t
+            t = ring.get(out)
+        if finished:
+            break
+    dt = time.time() - t0
+    print("# corering %d records, %d read, %d dropped, %d bad, %.0f rec/s"
+          % (records, got, ring.dropped, torn, records / dt))
+    return torn == 0 and got + ring.dropped == records
+
+if __name__ == "__main__":
+    import sys
+    ok = selftest()
+    ok = selftest(records=50000, depth=2) and ok  # mostly overwrites
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,53 @@
+"""
+# deadband.py : change-driven publishing with a heartbeat
+# A record is passed on only if some channel has moved by more than its
+# threshold since the last record that was passed on, or if 'heartbeatMs'
+# has gone by without one. Suppressed records are counted.
+# 19-Oct-2026
+
+# Usage Example:
+import deadband
+db = deadband.Deadband((0.05, 0.05, 0.2, 0.2), heartbeatMs=600_000)
+while True:
+    ...
+    if db.check((degC1, degC2, RH1, RH2)):
+        client.publish(topic_pub, outs)
+"""
+
+from time import ticks_ms, ticks_diff
+
+class Deadband:
+    def __init__(self, thresholds, heartbeatMs=600_000):
+        self.thresholds = thresholds    # per channel, same units as values
+        self.nCh = len(thresholds)
+        self.heartbeatMs = heartbeatMs  # max time between passed records
+        self.last = [0.0] * self.nCh    # last values passed on
+        self.tLast = ticks_ms()
+        self.primed = False             # first record always passes
+        self.passed = 0
+        self.suppressed = 0
+        self.heartbeats = 0             # passed only because of heartbeat
+
+    def check(self, values):  # True if this record should be published
+        now = ticks_ms()
+        send = not self.primed
+        if not send:
+            for i in range(self.nCh):
+                x = values[i]
+                l = self.last[i]
+                if ((x != x) != (l != l)  # a channel went missing or returned
+                        or abs(x - l) > self.thresholds[i]):
+                    send = True
+                    break
+        if not send and ticks_diff(now, self.tLast) >= self.heartbeatMs:
+            send = True
+            self.heartbeats += 1
+        if not send:
+            self.suppressed += 1
+            return False
+        for i in range(self.nCh):
+            self.last[i] = values[i]
+        self.tLast = now
+        self.primed = True
+        self.passed += 1
+        return True
@@ -0,0 +1,135 @@
+"""
+# flashlog.py : buffered, rotating data logger on the Pico's flash filesystem
+# Records collect in a RAM buffer and go to flash in one block per flush.
+# Each flush opens the file, appends and closes it, so littlefs commits the
+# block completely or not at all; a reset() loses at most the RAM buffer,
+# never the file. Files rotate at 'maxSize' and only 'maxFiles' are kept.
+# 19-Oct-2026
+
+# Usage Example:
+import flashlog
+log = flashlog.FlashLog("rh", bufSize=4096, maxSize=128*1024, maxFiles=8)
+while True:
+    ...
+    log.add("%d, %0.3f, %0.2f\\n" % (epoch, degC, RH))
+    ...
+log.flush()   # before reset() or a planned power-off
+log.report()  # write throughput and flush cost per record
+"""
+
+import os
+from time import ticks_us, ticks_diff
+
+class FlashLog:
+    def __init__(self, prefix="log", bufSize=4096, maxSize=128*1024,
+                 maxFiles=8, recSize=0, directory="/"):
+        self.prefix = prefix        # file names are prefix0000.log etc.
+        self.dir = directory
+        self.bufSize = bufSize      # RAM bytes held before writing to flash
+        self.maxSize = maxSize      # rotate to a new file above this size
+        self.maxFiles = maxFiles    # oldest files beyond this are deleted
+        self.recSize = recSize      # fixed record size, 0 = text lines
+        self.buf = bytearray(bufSize)
+        self.mv = memoryview(self.buf)
+        self.n = 0                  # bytes waiting in buf
+        self.records = 0            # records added
+        self.pending = 0            # records waiting in buf
+        self.flushes = 0
+        self.bytesWritten = 0
+        self.flushUs = 0            # total time spent writing to flash
+        self.dropped = 0            # records too large for the buffer
+        self.seqs = self._scan()
+        if self.seqs:
+            self.seq = self.seqs[-1]
+            self.size = self._fsize(self.seq)
+            if not self._tailOk(self.seq, self.size):
+                self._rotate()      # never append after a partial record
+        else:
+            self.seq = 0
+            self.seqs = [0]
+            self.size = 0
+
+    def fname(self, seq):
+        return "%s/%s%04d.log" % (self.dir.rstrip("/"), self.prefix, seq)
+
+    def _scan(self):  # sequence numbers of existing log files, oldest first
+        seqs = []
+        n = len(self.prefix)
+        for f in os.listdir(self.dir):
+            if f.startswith(self.prefix) and f.endswith(".log"):
+                try:
+                    seqs.append(int(f[n:-4]))
+                except ValueError:
+                    pass
+        seqs.sort()
+        return seqs
+
+    def _fsize(self, seq):
+        try:
+            return os.stat(self.fname(seq))[6]
+        except OSError:
+            return 0
+
+    def _tailOk(self, seq, size):  # does the file end on a record boundary?
+        if size == 0:
+            return True
+        if self.recSize:
+            return (size % self.recSize) == 0
+        with open(self.fname(seq), "rb") as fp:
+            fp.seek(size - 1)
+            return fp.read(1) == b"\n"
+
+    def _rotate(self):
+        self.seq += 1
+        self.seqs.append(self.seq)
+        self.size = 0
+        while len(self.seqs) > self.maxFiles:
+            try:
+                os.remove(self.fname(self.seqs.pop(0)))
+            except OSError:
+                pass
+
+    def add(self, rec):  # queue one record (str or bytes) for writing
+        if isinstance(rec, str):
+            rec = rec.encode()
+        k = len(rec)
+        if k > self.bufSize:
+            self.dropped += 1
+            return
+        if self.n + k > self.bufSize:
+            self.flush()
+        self.buf[self.n:self.n + k] = rec
+        self.n += k
+        self.records += 1
+        self.pending += 1
+
+    def flush(self):  # write the RAM buffer to flash as one block
+        if self.n == 0:
+            return
+        if self.size + self.n > self.maxSize and self.size > 0:
+            self._rotate()
+        t0 = ticks_us()
+        with open(self.fname(self.seq), "ab") as fp:
+            fp.write(self.mv[:self.n])
+        self.flushUs += ticks_diff(ticks_us(), t0)
+        self.size += self.n
+        self.bytesWritten += self.n
+        self.flushes += 1
+        self.n = 0
+        self.pending = 0
+
+    def stats(self):  # (KB/s while writing, us per record, us per flush)
+        kbs = 0.0
+        if self.flushUs > 0:
+            kbs = self.bytesWritten * 1000.0 / 1024 / self.flushUs
+        written = self.records - self.pending
+        usRec = self.flushUs / written if written else 0.0
+        usFlush = self.flushUs / self.flushes if self.flushes else 0.0
+        return kbs, usRec, usFlush
+
+    def report(self):
+        kbs, usRec, usFlush = self.stats()
+        print("# flashlog %s: %d recs, %d flushes, %d bytes, %.1f KB/s, "
+              "%.0f us/rec, %.0f us/flush, %d in RAM"
+              % (self.fname(self.seq), self.records, self.flushes,
+                 self.bytesWritten, kbs, usRec, usFlush, self.pending))
@@ -0,0 +1,105 @@
+"""
+# heatcycle.py : on/off cycle control for the SHT3x internal heater
+# The heater command goes out on the I2C bus only when the state changes.
+# Windows in the first 'settleCount' of each phase are marked as settling
+# and left out of the statistics, which are kept separately per phase.
+# 19-Oct-2026
+
+# Usage Example:
+import heatcycle
+
+def setHeat(on):   # whatever writes the heater command to the sensor
+    TRH_SetHeat(sense4, on)
+
+hc = heatcycle.HeatCycle(setHeat, onCount=40, offCount=40, settleCount=5, nCh=2)
+while True:
+    T, RH = TRH_get(sense4)            # one averaging window
+    kept = hc.add((T, RH))             # False while settling
+    print("%.3f, %.3f, %d, %d" % (T, RH, hc.heat, not kept))
+    hc.step()                          # end of window, may switch heater
+"""
+
+class Stats:   # running mean / std.dev / min / max (Welford) per channel
+    def __init__(self, nCh):
+        self.nCh = nCh
+        self.reset()
+
+    def reset(self):
+        self.n = 0
+        self.mean = [0.0] * self.nCh
+        self.m2 = [0.0] * self.nCh
+        self.min = [0.0] * self.nCh
+        self.max = [0.0] * self.nCh
+
+    def add(self, values):
+        self.n += 1
+        n = self.n
+        for i in range(self.nCh):
+            x = values[i]
+            d = x - self.mean[i]
+            self.mean[i] += d / n
+            self.m2[i] += d * (x - self.mean[i])
+            if (n == 1) or (x < self.min[i]):
+                self.min[i] = x
+            if (n == 1) or (x > self.max[i]):
+                self.max[i] = x
+
+    def std(self, i):  # sample standard deviation of channel i
+        if self.n < 2:
+            return 0.0
+        return (self.m2[i] / (self.n - 1)) ** 0.5
+
+
+class HeatCycle:
+    def __init__(self, setHeat, onCount=40, offCount=40, settleCount=0,
+                 nCh=1, heat=False):
+        self.setHeat = setHeat      # function(bool) sending heater command
+        self.onCount = onCount      # windows with heater on
+        self.offCount = offCount    # windows with heater off
+        self.settleCount = settleCount  # windows discarded after a switch
+        self.nCh = nCh              # values per window passed to add()
+        self.heat = heat            # current heater state
+        self.count = 0              # windows completed in this phase
+        self.phases = 0             # completed phases
+        self.writes = 0             # heater commands sent
+        self.discarded = 0          # windows dropped while settling
+        self.phase = Stats(nCh)     # current phase only
+        self.total = (Stats(nCh), Stats(nCh))  # all off / all on phases
+        self._send()                # put the sensor in a known state
+
+    def _send(self):
+        self.setHeat(self.heat)
+        self.writes += 1
+
+    @property
+    def settling(self):  # True if this window is inside the settle period
+        return self.count < self.settleCount
+
+    def add(self, values):  # record one window, return True if kept
+        if self.settling:
+            self.discarded += 1
+            return False
+        self.phase.add(values)
+        self.total[int(self.heat)].add(values)
+        return True
+
+    def step(self):  # call once at the end of every window
+        self.count += 1
+        limit = self.onCount if self.heat else self.offCount
+        if self.count < limit:
+            return False
+        self.report()
+        self.phases += 1
+        self.count = 0
+        self.phase.reset()
+        self.heat = not self.heat
+        self._send()     # only I2C write in the whole cycle
+        return True
+
+    def summary(self, s):  # format one Stats object as a comment line
+        fields = ["%.3f/%.3f" % (s.mean[i], s.std(i)) for i in range(self.nCh)]
+        return "n=%d %s" % (s.n, " ".join(fields))
+
+    def report(self):  # print stats for the phase that is ending
+        print("# phase %d heat=%d %s"
+              % (self.phases, self.heat, self.summary(self.phase)))
@@ -0,0 +1,129 @@
+"""
+# i2chealth.py : per-device I2C health: transactions, errors, CRC, latency
+# One DevHealth per sensor or display. run(fn, args...) makes the driver
+# call, times it with ticks_us and counts it; an OSError is counted as a
+# NACK (EIO / ENODEV, no answer from the address) or other bus error and
+# re-raised. crcFail() counts a read that arrived but failed its checksum.
+# bus(i2c) wraps the bus instead: each writeto / readfrom / readfrom_into /
+# writevto the driver makes is timed and counted on its own, so the
+# conversion sleeps inside a driver call stay out of the latencies.
+# Latencies go into a fixed-bucket histogram (preallocated array, no
+# allocation per call); edges= sets other bucket edges for a device.
+# summary() gives one line for serial or MQTT.
+# 19-Oct-2026
+
+# Usage Example:
+import i2chealth
+h1 = i2chealth.DevHealth("T1@i2c1")
+T = h1.run(lambda s: s.temperature, sensor1)
+if T < -100:
+    h1.crcFail()
+sensor2 = ahtx0.AHT10(h2.bus(i2c0))   # or time each bus transaction
+print(h1.summary())
+# i2c T1@i2c1 n=1200 nack=0 err=0 crc=0 p50<2ms p99<5ms max=3912us
+"""
+
+from array import array
+from time import ticks_us, ticks_diff
+
+# upper bucket edges in us; the last bucket is everything slower
+EDGES = (100, 200, 500, 1000, 2000, 5000, 10000, 20000, 50000, 100000)
+NACK_ERRNO = (5, 19)  # EIO, ENODEV: address not acknowledged
+
+class TimedBus:  # an I2C / SoftI2C whose transactions go through run()
+    def __init__(self, i2c, health):
+        self.i2c = i2c
+        self.h = health
+
+    def writeto(self, addr, buf, stop=True):
+        return self.h.run(self.i2c.writeto, addr, buf, stop)
+
+    def writevto(self, addr, vector, stop=True):
+        return self.h.run(self.i2c.writevto, addr, vector, stop)
+
+    def readfrom(self, addr, nbytes, stop=True):
+        return self.h.run(self.i2c.readfrom, addr, nbytes, stop)
+
+    def readfrom_into(self, addr, buf, stop=True):
+        return self.h.run(self.i2c.readfrom_into, addr, buf, stop)
+
+    def __getattr__(self, name):  # scan, *_mem ...: passed through, untimed
+        return getattr(self.i2c, name)
+
+class DevHealth:
+    def __init__(self, name, enabled=True, edges=EDGES):
+        self.name = name
+        self.enabled = enabled
+        self.edges = edges  # upper bucket edges, us
+        self.hist = array("l", [0] * (len(edges) + 1))
+        self.n = 0          # calls
+        self.nacks = 0
+        self.errors = 0     # other OSErrors
+        self.crc = 0        # checksum failures
+        self.maxUs = 0
+
+    def _add(self, us):
+        i = 0
+        for e in self.edges:
+            if us < e:
+                break
+            i += 1
+        self.hist[i] += 1
+        if us > self.maxUs:
+            self.maxUs = us
+
+    def run(self, fn, *args):  # call fn(*args), timed and counted
+        if not self.enabled:
+            return fn(*args)
+        t0 = ticks_us()
+        try:
+            r = fn(*args)
+        except OSError as e:
+            self.n += 1
+            if e.args and e.args[0] in NACK_ERRNO:
+                self.nacks += 1
+            else:
+                self.errors += 1
+            self._add(ticks_diff(ticks_us(), t0))
+            raise
+        self.n += 1
+        self._add(ticks_diff(ticks_us(), t0))
+        return r
+
+    def bus(self, i2c):  # i2c wrapped so each transaction is counted
+        return TimedBus(i2c, self)
+
+    def crcFail(self):
+        self.crc += 1
+
+    def percentile(self, p):  # upper bucket edge holding the p-th percentile
+        k = self.n * p / 100.0
+        c = 0
+        for i in range(len(self.edges)):
+            c += self.hist[i]
+            if c >= k:
+                return self.edges[i]
+        return None         # in the open-ended top bucket
+
+    def reset(self):
+        for i in range(len(self.hist)):
+            self.hist[i] = 0
+        self.n = self.nacks = self.errors = self.crc = self.maxUs = 0
+
+    def summary(self):
+        def edge(us):
+            if us is None:
+                return ">%dms" % (self.edges[-1] // 1000)
+            return ("<%dms" % (us // 1000)) if us >= 1000 else ("<%dus" % us)
+        return ("# i2c %s n=%d nack=%d err=%d crc=%d p50%s p99%s max=%dus"
+                " hist=%s" % (self.name, self.n, self.nacks, self.errors,
+                              self.crc, edge(self.percentile(50)),
+                              edge(self.percentile(99)), self.maxUs,
+                              "/".join(str(x) for x in self.hist)))
+
+def report(devs, publish=None):  # print every summary, optionally publish
+    for d in devs:
+        s = d.summary()
+        print(s)
+        if publish is not None:
+            publish(s[2:])  # without the '# ' comment marker
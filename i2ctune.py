@@ -0,0 +1,110 @@
+"""
+# i2ctune.py : pick each SoftI2C bus clock by test, cache it on flash
+# For one bus: build it at each frequency in FREQS, lowest first, and do a
+# burst of checked reads (SHT3x: both CRCs; AHT: status bits, ranges and
+# on AHT2x the CRC). Climbing stops at the first frequency with any error;
+# the bus gets the fastest clean frequency less 'margin' steps. Results go
+# in a small json file keyed by bus name, so later boots skip the test;
+# delete the file (or pass retune=True) after changing the wiring. If not
+# even the lowest frequency reads clean (sensor missing or unplugged),
+# the bus runs at 'fallback' (default: the lowest frequency) this boot and
+# nothing is cached, so the next boot tests again.
+# 19-Oct-2026
+
+# Usage Example:
+import i2ctune
+from machine import Pin, SoftI2C
+def mkBus(f):
+    return SoftI2C(scl=Pin(9, Pin.PULL_UP), sda=Pin(8, Pin.PULL_UP), freq=f)
+f = i2ctune.busFreq("soft9", mkBus, i2ctune.checkSHT3x, fallback=400_000)
+i2c4 = mkBus(f)
+"""
+
+import json
+from time import sleep_ms
+
+FREQS = (100_000, 200_000, 400_000, 600_000, 800_000, 1_000_000,
+         1_200_000, 1_600_000)
+CACHE = "i2ctune.json"
+
+def crc8(buf, n):  # Sensirion / Aosong CRC-8, poly 0x31, init 0xFF
+    crc = 0xff
+    for i in range(n):
+        crc ^= buf[i]
+        for _ in range(8):
+            if crc & 0x80:
+                crc = ((crc << 1) ^ 0x31) & 0xff
+            else:
+                crc = (crc << 1) & 0xff
+    return crc
+
+def checkSHT3x(i2c, addr=0x44):  # one-shot measurement, both CRCs good
+    i2c.writeto(addr, b'\x24\x00')
+    sleep_ms(16)
+    buf = i2c.readfrom(addr, 6)
+    return crc8(buf, 2) == buf[2] and crc8(buf[3:], 2) == buf[5]
+
+def checkAHT(i2c, addr=0x38, crc=False):  # AHT10, or AHT2x with crc=True
+    if not (i2c.readfrom(addr, 1)[0] & 0x08):  # not calibrated yet
+        i2c.writeto(addr, b'\xe1\x08\x00')
+        sleep_ms(10)
+    i2c.writeto(addr, b'\xac\x33\x00')      # start a measurement
+    sleep_ms(80)
+    buf = i2c.readfrom(addr, 7 if crc else 6)
+    if buf[0] & 0x80 or not (buf[0] & 0x08):  # still busy / uncalibrated
+        return False
+    rh = (buf[1] << 12) | (buf[2] << 4) | (buf[3] >> 4)
+    t = ((buf[3] & 0x0f) << 16) | (buf[4] << 8) | buf[5]
+    if rh in (0, 0xfffff) or t in (0, 0xfffff):  # bus stuck low / high
+        return False
+    return (not crc) or crc8(buf, 6) == buf[6]
+
+def errors(i2c, check, n):  # failed checked reads out of n
+    bad = 0
+    for i in range(n):
+        try:
+            if not check(i2c):
+                bad += 1
+        except OSError:
+            bad += 1
+    return bad
+
+def tune(makeBus, check, freqs=FREQS, n=20, margin=1):
+    good = -1
+    for k, f in enumerate(freqs):
+        bad = errors(makeBus(f), check, n)
+        print("# i2ctune %d Hz: %d/%d bad" % (f, bad, n))
+        if bad:
+            break
+        good = k
+    if good < 0:
+        return None         # no clean frequency: nothing to cache
+    return freqs[max(0, good - margin)]
+
+def loadCache(cache=CACHE):
+    try:
+        with open(cache) as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        return {}
+
+def busFreq(name, makeBus, check, freqs=FREQS, n=20, margin=1, cache=CACHE,
+            retune=False, fallback=None):  # cached or tuned bus frequency
+    c = loadCache(cache)
+    if (not retune) and (name in c):
+        return c[name]
+    print("# i2ctune bus %s" % name)
+    f = tune(makeBus, check, freqs, n, margin)
+    if f is None:
+        f = freqs[0] if fallback is None else fallback
+        print("# i2ctune bus %s: no clean frequency, %d Hz, not cached"
+              % (name, f))
+        return f
+    c[name] = f
+    try:
+        with open(cache, "w") as fp:
+            json.dump(c, fp)
+    except OSError:
+        pass
+    print("# i2ctune bus %s: %d Hz" % (name, f))
+    return f
@@ -0,0 +1,61 @@
+"""
+# importbench.py : import time and heap cost of modules, run on the Pico
+# For each module name, in the order given (dependencies first, so each
+# import only costs that module): drop it from sys.modules, collect, then
+# time the import with ticks_us and read mem_free before, right after (the
+# compiler's garbage still on the heap) and after another collect (what
+# the module keeps). Whether the module came from a .py, a .mpy or the
+# frozen firmware is read from its __file__. One '#import' line per module
+# and a total line go to the serial port; mpybuild.py --measure collects
+# them. Don't list the main script: importing it would start its loop.
+# 19-Oct-2026
+
+# Usage Example:
+import importbench
+importbench.run(("ssd1306big", "flashlog", "mqqueue"), "mpy")
+"""
+
+import gc
+import sys
+from time import ticks_us, ticks_diff
+
+def kind(m):  # "src", "mpy" or "frozen", from where m was loaded
+    f = getattr(m, "__file__", "")
+    if f.endswith(".mpy"):
+        return "mpy"
+    try:
+        import os
+        os.stat(f)
+        return "src"
+    except OSError:
+        return "frozen"   # no such file on flash: it is in the firmware
+
+def measure(name):  # (us, transient bytes, retained bytes, kind)
+    if name in sys.modules:
+        del sys.modules[name]
+    gc.collect()
+    f0 = gc.mem_free()
+    t0 = ticks_us()
+    m = __import__(name)
+    dt = ticks_diff(ticks_us(), t0)
+    f1 = gc.mem_free()
+    gc.collect()
+    f2 = gc.mem_free()
+    return dt, f0 - f1, f0 - f2, kind(m)
+
+def run(names, variant=""):
+    gc.collect()
+    free0 = gc.mem_free()
+    tSum = 0
+    for name in names:
+        try:
+            dt, used, kept, k = measure(name)
+        except Exception as e:  # e.g. network on a Pico without wifi
+            print("#import %s %s error %r" % (variant, name, e))
+            continue
+        tSum += dt
+        print("#import %s %s %s %d %d %d" % (variant, name, k, dt, used,
+                                             kept))
+    gc.collect()
+    print("#import %s total - %d %d %d" % (variant, tSum, free0,
+                                           gc.mem_free()))
@@ -0,0 +1,289 @@
+"""
+# ingest.py : host tool, stream the Pico CSV output into columnar storage
+# Reads a capture file, stdin or a serial port (needs pyserial) and learns
+# the schema from each script's CSV header line, e.g.
+#   "sec, T1, T2, T3, RH1, RH2, RH3"  or  "epoch,T1,T2,T3, RH1,RH2,RH3, Vbus"
+# Data rows are parsed in large batches with numpy and appended in chunks
+# to one raw float64 file per column:
+#   outdir/seg000/schema.json, outdir/seg000/T1.f64, ...
+# A new segment starts whenever a header with a different schema appears.
+# The row width is the most common field count in a batch of at least
+# MIN_ROWS lines, so one stray line after a header can't set it; such a
+# batch where most rows have another width starts a new schema. Only a batch whose every line has the right
+# number of commas takes the fast path, so a short line and a run-together
+# line can't pair up into shifted rows.
+# Lines that are not data ("# ERROR ...", "Encountered OSError in main loop",
+# the exception text after it, startup messages) are counted and skipped.
+# 19-Oct-2026
+
+# Usage:
+#   python ingest.py capture.csv outdir
+#   python ingest.py /dev/ttyACM0 outdir --baud 115200
+#   python ingest.py --bench 1000000
+
+import ingest
+for names, cols in ingest.load("outdir"):   # one entry per segment
+    print(names, cols["T1"].mean())
+"""
+
+import argparse
+from collections import Counter
+import json
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+DATA_START = set("0123456789-+.")   # first character of a data row
+MIN_ROWS = 8    # lines needed before a batch may set the row width
+NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+def isHeader(fields):  # a CSV header is a list of plain identifiers
+    return len(fields) > 1 and all(NAME_RE.match(f) for f in fields)
+
+
+class ColumnStore:  # one raw float64 file per column, per segment
+    def __init__(self, outdir, chunkRows=65536):
+        self.outdir = outdir
+        self.chunkRows = chunkRows
+        self.seg = -1
+        self.names = None
+        self.chunk = None
+        self.n = 0          # rows in the current chunk
+        self.rows = 0       # rows written in this segment
+        os.makedirs(outdir, exist_ok=True)
+        while os.path.isdir(self.segDir(self.seg + 1)):
+            self.seg += 1   # keep existing segments, append after them
+
+    def segDir(self, seg):
+        return os.path.join(self.outdir, "seg%03d" % seg)
+
+    def newSegment(self, names):
+        self.flush()
+        self.seg += 1
+        self.names = list(names)
+        self.chunk = np.empty((self.chunkRows, len(names)), dtype=np.float64)
+        self.n = 0
+        self.rows = 0
+        os.makedirs(self.segDir(self.seg))
+        self._writeSchema()
+
+    def _writeSchema(self):
+        schema = {"names": self.names, "dtype": "<f8", "rows": self.rows}
+        with open(os.path.join(self.segDir(self.seg), "schema.json"), "w") as fp:
+            json.dump(schema, fp)
+
+    def append(self, block):  # block is a 2-D array, rows x len(names)
+        i = 0
+        while i < len(block):
+            k = min(len(block) - i, self.chunkRows - self.n)
+            self.chunk[self.n:self.n + k] = block[i:i + k]
+            self.n += k
+            i += k
+            if self.n == self.chunkRows:
+                self.flush()
+
+    def flush(self):
+        if self.names is None or self.n == 0:
+            return
+        d = self.segDir(self.seg)
+        for j, name in enumerate(self.names):
+            with open(os.path.join(d, name + ".f64"), "ab") as fp:
+                self.chunk[:self.n, j].astype("<f8").tofile(fp)
+        self.rows += self.n
+        self.n = 0
+        self._writeSchema()
+
+
+class Ingest:
+    def __init__(self, store, batch=8192):
+        self.store = store
+        self.batch = batch      # data lines parsed per numpy call
+        self.pending = []       # data lines not yet parsed
+        self.tail = ""          # partial line left from the last block
+        self.width = 0          # fields per row in the current schema
+        self.header = None      # last header seen
+        self.rows = 0
+        self.noise = 0          # non-data lines skipped
+        self.bad = 0            # data-like lines that did not parse
+        self.headers = 0
+
+    def feed(self, text):  # add a block of text, may end mid-line
+        text = self.tail + text.replace("\r", "")
+        lines = text.split("\n")
+        self.tail = lines.pop()
+        pending = self.pending
+        for line in lines:
+            if line[:1] in DATA_START:
+                pending.append(line)
+                if len(pending) >= self.batch:
+                    self._parse()
+                    pending = self.pending
+            else:
+                self._other(line)
+                pending = self.pending
+
+    def _other(self, line):  # header, comment or message line
+        fields = [f.strip() for f in line.split(",")]
+        if isHeader(fields):
+            self._parse(True)
+            self.headers += 1
+            self.header = fields
+            self.width = 0      # schema is fixed by the next batch
+        elif line.strip():
+            self.noise += 1
+
+    def _schema(self, nFields):
+        names = self.header or ["c%d" % i for i in range(nFields)]
+        # a header may list more columns than are printed (Vbus commented out)
+        names = names[:nFields]
+        names += ["c%d" % i for i in range(len(names), nFields)]
+        if names != self.store.names:
+            self.store.newSegment(names)
+        self.width = nFields
+
+    def _parse(self, force=False):  # convert pending lines, fast path first
+        lines = self.pending
+        if not lines or (self.width == 0 and len(lines) < MIN_ROWS
+                         and not force):
+            return      # too few lines yet to tell the row width
+        self.pending = []
+        commas = [l.count(",") for l in lines]
+        w = self.width
+        good = commas.count(w - 1) if w else 0
+        if w == 0 or (2 * good <= len(lines) and len(lines) >= MIN_ROWS):
+            n, good = Counter(commas).most_common(1)[0]  # most rows differ
+            self._schema(n + 1)
+            w = self.width
+        if good == len(lines):
+            try:
+                vals = np.array(",".join(lines).split(","), dtype=np.float64)
+            except ValueError:
+                vals = None     # a field that is not a number
+            if vals is not None:
+                self.store.append(vals.reshape(-1, w))
+                self.rows += len(lines)
+                return
+        rows = []   # slow path: odd lines mixed in, check one by one
+        for line in lines:
+            fields = line.split(",")
+            if len(fields) != w:
+                self.bad += 1
+                continue
+            try:
+                rows.append([float(f) for f in fields])
+            except ValueError:
+                self.bad += 1
+        if rows:
+            self.store.append(np.array(rows))
+            self.rows += len(rows)
+
+    def close(self):
+        if self.tail:
+            self.feed("\n")
+        self._parse(True)
+        self.store.flush()
+
+    def summary(self, seconds):
+        rate = self.rows / seconds if seconds > 0 else 0.0
+        return ("%d rows, %d headers, %d noise lines, %d bad rows, "
+                "%.2f s, %.0f rows/s" % (self.rows, self.headers, self.noise,
+                                         self.bad, seconds, rate))
+
+
+def readFile(fp, ing, blockSize=1 << 22):
+    while True:
+        text = fp.read(blockSize)
+        if not text:
+            break
+        ing.feed(text)
+
+def readSerial(port, baud, ing, flushSec=10.0):
+    import serial   # pyserial, only needed for live capture
+    ser = serial.Serial(port, baud, timeout=0.5)
+    tFlush = time.time()
+    try:
+        while True:
+            data = ser.read(max(1, ser.in_waiting))
+            if data:
+                ing.feed(data.decode("ascii", "replace"))
+            if time.time() - tFlush > flushSec:  # keep disk copy current
+                ing._parse()
+                ing.store.flush()
+                tFlush = time.time()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ser.close()
+
+def load(outdir):  # [(names, {name: array})] one entry per segment
+    segs = []
+    for d in sorted(os.listdir(outdir)):
+        p = os.path.join(outdir, d)
+        if not (d.startswith("seg") and os.path.isdir(p)):
+            continue
+        with open(os.path.join(p, "schema.json")) as fp:
+            schema = json.load(fp)
+        cols = {}
+        for name in schema["names"]:
+            f = os.path.join(p, name + ".f64")
+            if os.path.exists(f):
+                cols[name] = np.fromfile(f, dtype=schema["dtype"])
+            else:   # segment header seen but no rows flushed
+                cols[name] = np.empty(0, dtype=schema["dtype"])
+        segs.append((schema["names"], cols))
+    return segs
+
+def synthetic(nRows):  # capture-like text with the usual noise mixed in
+    lines = ["Starting AHT10-AHT25 program...",
+             "epoch,T1,T2,T3, RH1,RH2,RH3, Vbus"]
+    t0 = 1676000000
+    for i in range(nRows):
+        lines.append("%d, %0.3f,%0.3f,%0.3f, %0.2f,%0.2f,%0.2f"
+                     % (t0 + 15 * i, 20 + (i % 97) * 0.01, 21.5, 19.875,
+                        45 + (i % 13) * 0.1, 44.25, 50.5))
+        if i % 5000 == 4999:
+            lines += ["Encountered OSError in main loop", "[Errno 5] EIO",
+                      "# ERROR 3 0"]
+    return "\n".join(lines) + "\n"
+
+def bench(nRows, outdir):
+    text = synthetic(nRows)
+    ing = Ingest(ColumnStore(outdir))
+    t0 = time.perf_counter()
+    for i in range(0, len(text), 1 << 22):
+        ing.feed(text[i:i + (1 << 22)])
+    ing.close()
+    dt = time.perf_counter() - t0
+    print("bench: %.1f MB, %s" % (len(text) / 1e6, ing.summary(dt)))
+
+def main(argv):
+    ap = argparse.ArgumentParser(description="CSV serial stream to columns")
+    ap.add_argument("source", nargs="?", help="capture file, - or serial port")
+    ap.add_argument("outdir", nargs="?", default="ingest_out")
+    ap.add_argument("--baud", type=int, default=115200)
+    ap.add_argument("--chunk", type=int, default=65536, help="rows per chunk")
+    ap.add_argument("--bench", type=int, metavar="ROWS",
+                    help="parse ROWS synthetic rows and report rows/s")
+    a = ap.parse_args(argv[1:])
+    if a.bench:
+        bench(a.bench, a.outdir)
+        return
+    if a.source is None:
+        ap.error("source is required")
+    ing = Ingest(ColumnStore(a.outdir, a.chunk))
+    t0 = time.perf_counter()
+    if a.source == "-":
+        readFile(sys.stdin, ing)
+    elif os.path.isfile(a.source):
+        with open(a.source, errors="replace") as fp:
+            readFile(fp, ing)
+    else:
+        readSerial(a.source, a.baud, ing)
+    ing.close()
+    print(ing.summary(time.perf_counter() - t0))
+
+if __name__ == "__main__":
+    main(sys.argv)
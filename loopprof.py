@@ -0,0 +1,88 @@
+"""
+# loopprof.py : per-section time and heap allocation profiler for main loops
+# Wrap named sections of the acquisition loop with start()/stop(). For each
+# pass through the loop the gc.mem_alloc() delta and ticks_us duration of
+# every section go into a fixed ring buffer (preallocated arrays, so the
+# profiler itself does not allocate). A negative heap delta means the
+# garbage collector ran inside that section; those are counted separately.
+# 19-Oct-2026
+
+# Usage Example:
+import loopprof
+prof = loopprof.LoopProf(("read", "average", "format", "display"), depth=64)
+while True:
+    prof.start(0)
+    ...                # sensor reads
+    prof.stop(0)
+    ...
+    prof.endLoop()
+    if (prof.loops % 100) == 0:
+        prof.summary(swVersion)
+"""
+
+import gc
+from array import array
+from time import ticks_us, ticks_diff
+
+class LoopProf:
+    def __init__(self, names, depth=64, enabled=True):
+        self.names = names          # section names, index = section id
+        self.nSec = len(names)
+        self.depth = depth          # loops kept in the ring buffer
+        self.enabled = enabled
+        n = depth * self.nSec
+        self.dt = array("l", [0] * n)      # section time, us
+        self.dm = array("l", [0] * n)      # heap bytes allocated
+        self.t0 = array("l", [0] * self.nSec)
+        self.m0 = array("l", [0] * self.nSec)
+        self.gcs = array("l", [0] * self.nSec)  # GC runs seen per section
+        self.row = 0                # ring row for the current loop
+        self.loops = 0              # completed loops
+
+    def start(self, sec):
+        if not self.enabled:
+            return
+        self.m0[sec] = gc.mem_alloc()
+        self.t0[sec] = ticks_us()
+
+    def stop(self, sec):
+        if not self.enabled:
+            return
+        t = ticks_diff(ticks_us(), self.t0[sec])
+        m = gc.mem_alloc() - self.m0[sec]
+        if m < 0:                   # collector ran, delta is meaningless
+            self.gcs[sec] += 1
+            m = 0
+        i = self.row * self.nSec + sec
+        self.dt[i] = t
+        self.dm[i] = m
+
+    def endLoop(self):  # call once per pass through the main loop
+        if not self.enabled:
+            return
+        self.loops += 1
+        self.row += 1
+        if self.row >= self.depth:
+            self.row = 0
+
+    def summary(self, tag=""):  # table over the loops in the ring buffer
+        rows = min(self.loops, self.depth)
+        print("# loopprof %s: last %d loops, mem_free %d" % (tag, rows,
+              gc.mem_free()))
+        print("# %-10s %9s %9s %9s %9s %4s" % ("section", "avg_us", "max_us",
+              "avg_B", "max_B", "gc"))
+        for s in range(self.nSec):
+            tSum = mSum = tMax = mMax = 0
+            for r in range(rows):
+                i = r * self.nSec + s
+                tSum += self.dt[i]
+                mSum += self.dm[i]
+                if self.dt[i] > tMax:
+                    tMax = self.dt[i]
+                if self.dm[i] > mMax:
+                    mMax = self.dm[i]
+            if rows:
+                tSum //= rows
+                mSum //= rows
+            print("# %-10s %9d %9d %9d %9d %4d" % (self.names[s], tSum, tMax,
+                  mSum, mMax, self.gcs[s]))
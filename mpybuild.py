@@ -0,0 +1,246 @@
+"""
+# mpybuild.py : host tool, precompile a station to .mpy and make a freeze manifest
+# Starting from one main script, follows its imports (ast, including
+# imports inside functions) through the repo and any --lib directories, and
+# writes, dependencies first:
+#   build/mpy/<module>.mpy   mpy-cross output, copy these to the Pico
+#   build/src/<module>.py    the sources, for freezing
+#   build/main.py            'import app': the main script is built as app
+#                            (script names like AHT10-AHT25-OLED are not
+#                            importable)
+#   build/manifest.py        freeze build/src into firmware: pass it as
+#                            FROZEN_MANIFEST to the rp2 port's make
+#                            (BOARD=RPI_PICO_W); it includes the board's
+#                            manifest, so ntptime and umqtt stay frozen
+# --native builds the hot-path modules in NATIVE (glyph drawing, CRC,
+# accumulator loops) with the native emitter for armv6m (Thumb, RP2040).
+# Frozen modules only get native code from @micropython.native in the
+# source; the manifest cannot set the emitter. Native code is several
+# times larger than bytecode, and from a .mpy it is loaded into RAM (a
+# frozen module runs from flash): check heap_kept with --measure.
+# mpy-cross must be the same MicroPython release as the firmware
+# (pip install mpy-cross==<version>).
+# Modules built into the firmware (machine, time, network ...) are skipped;
+# drivers that are not found (ahtx0, aht, sh1106, MQ) are listed so they
+# can be copied or added with --lib.
+# --measure src|mpy|frozen puts that variant on the Pico with mpremote and
+# runs importbench.py there: import time and heap per module. Results are
+# kept per variant in build/import.json and compared side by side.
+# 19-Oct-2026
+
+# Usage:
+#   python mpybuild.py AHT10-AHT25-OLED.py
+#   python mpybuild.py AHT10-AHT25-OLED.py --native --lib ../drivers
+#   python mpybuild.py AHT10-AHT25-OLED.py --measure src --port /dev/ttyACM0
+#   python mpybuild.py AHT10-AHT25-OLED.py --measure mpy --port /dev/ttyACM0
+#   (flash firmware built with build/manifest.py, then)
+#   python mpybuild.py AHT10-AHT25-OLED.py --measure frozen
+"""
+
+import argparse
+import ast
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+REPO = os.path.dirname(os.path.abspath(__file__))
+
+BUILTIN = {  # in the rp2 firmware (Pico W build), never compiled here
+    "array", "binascii", "collections", "errno", "framebuf", "gc",
+    "hashlib", "io", "json", "machine", "math", "micropython", "network",
+    "ntptime", "os", "random", "re", "rp2", "select", "socket", "struct",
+    "sys", "time", "uasyncio", "asyncio", "ubinascii", "uctypes", "uerrno",
+    "uhashlib", "uio", "ujson", "umqtt", "uos", "urandom", "ure",
+    "uselect", "usocket", "ustruct", "utime", "_thread", "cryptolib",
+    "requests", "urequests",
+}
+HOST = ("ingest", "mqttbench", "traceview", "tecsim", "mpybuild",
+        "numpy")  # host only (binrec, mqbatch decode on the host)
+NATIVE = {  # module: its hot path, for --native
+    "ssd1306big": "glyph drawing",
+    "i2ctune": "crc8",
+    "oversample": "burst and mean/variance loops",
+}
+ARCH = "armv6m"  # RP2040 Cortex-M0+
+KINDS = ("src", "mpy", "frozen")  # the variants --measure compares
+
+def imports(path):  # top level module names a source file imports
+    with open(path) as fp:
+        tree = ast.parse(fp.read(), path)
+    out = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            out += [a.name.split(".")[0] for a in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and \
+                not node.level:
+            out.append(node.module.split(".")[0])
+    return out
+
+def find(name, dirs):
+    for d in dirs:
+        p = os.path.join(d, name + ".py")
+        if os.path.isfile(p):
+            return p
+    return None
+
+def closure(main, dirs):  # ([(module, path)] dependencies first, missing)
+    order = []
+    seen = set()
+    missing = []
+
+    def visit(name, path):
+        seen.add(name)
+        for dep in imports(path):
+            if dep in seen or dep in BUILTIN or dep in HOST:
+                continue
+            p = find(dep, dirs)
+            if p is None:
+                seen.add(dep)
+                missing.append(dep)
+            else:
+                visit(dep, p)
+        order.append((name, path))
+
+    visit("app", main)
+    return order, missing
+
+def mpyCross(exe=None):  # command to run mpy-cross, and its version
+    exe = exe or shutil.which("mpy-cross")
+    if exe is None:
+        sys.exit("mpy-cross not found: pip install mpy-cross==<firmware "
+                 "version>, or --mpy-cross PATH")
+    v = subprocess.run([exe, "--version"], capture_output=True, text=True)
+    return exe, v.stdout.strip()
+
+def build(order, out, native, exe):
+    for sub in ("mpy", "src"):
+        os.makedirs(os.path.join(out, sub), exist_ok=True)
+    rows = []
+    for name, path in order:
+        src = os.path.join(out, "src", name + ".py")
+        shutil.copyfile(path, src)
+        mpy = os.path.join(out, "mpy", name + ".mpy")
+        cmd = [exe, "-o", mpy, "-s", name + ".py"]
+        emit = "bytecode"
+        if native and name in NATIVE:
+            cmd += ["-march=" + ARCH, "-X", "emit=native"]
+            emit = "native"
+        r = subprocess.run(cmd + [src], capture_output=True, text=True)
+        if r.returncode:
+            sys.exit("mpy-cross failed on %s:\n%s" % (path, r.stderr))
+        rows.append((name, os.path.getsize(path), os.path.getsize(mpy),
+                     emit))
+    with open(os.path.join(out, "main.py"), "w") as fp:
+        fp.write("import app  # the station, from app.mpy or frozen\n")
+    with open(os.path.join(out, "manifest.py"), "w") as fp:
+        fp.write("# generated by mpybuild.py: freeze the station modules\n")
+        # the board's own manifest: on RPI_PICO_W it pulls in
+        # bundle-networking (ntptime, umqtt ...), which BUILTIN relies on
+        fp.write('include("$(BOARD_DIR)/manifest.py")\n')
+        fp.write("src = %r\n" % os.path.abspath(os.path.join(out, "src")))
+        for name, path in order:
+            if name != "app":   # app stays a file: main.py imports it
+                fp.write('module("%s.py", base_path=src)\n' % name)
+    return rows
+
+def mpremote(port, *args):
+    cmd = ["mpremote"] + (["connect", port] if port else []) + list(args)
+    return subprocess.run(cmd, capture_output=True, text=True)
+
+def measure(variant, order, out, port):
+    # stage the variant on the Pico and run importbench there
+    if shutil.which("mpremote") is None:
+        sys.exit("--measure needs mpremote (pip install mpremote)")
+    libs = [(n, p) for n, p in order if n != "app"]
+    mpremote(port, "fs", "cp", os.path.join(REPO, "importbench.py"),
+             ":importbench.py")
+    for name, path in libs:
+        for ext in (".py", ".mpy"):
+            mpremote(port, "fs", "rm", ":" + name + ext)  # may not exist
+        if variant == "src":
+            mpremote(port, "fs", "cp", path, ":%s.py" % name)
+        elif variant == "mpy":
+            mpremote(port, "fs", "cp", os.path.join(out, "mpy",
+                                                    name + ".mpy"),
+                     ":%s.mpy" % name)
+    names = tuple(n for n, p in libs)
+    r = mpremote(port, "exec", "import importbench; importbench.run(%r, %r)"
+                 % (names, variant))
+    res = {"modules": {}, "total": None}
+    for line in r.stdout.splitlines():
+        f = line.split()
+        if len(f) == 7 and f[0] == "#import" and f[2] == "total":
+            res["total"] = {"us": int(f[4]), "free_before": int(f[5]),
+                            "free_after": int(f[6])}
+        elif len(f) == 7 and f[0] == "#import" and f[3] in KINDS:
+            res["modules"][f[2]] = {"kind": f[3], "us": int(f[4]),
+                                    "heap_used": int(f[5]),
+                                    "heap_kept": int(f[6])}
+            if f[3] != variant:
+                sys.stderr.write("# %s loaded as %s, not %s\n"
+                                 % (f[2], f[3], variant))
+        elif line.startswith("#import"):
+            sys.stderr.write(line + "\n")
+    if res["total"] is None:
+        sys.exit("importbench gave no result:\n%s%s" % (r.stdout, r.stderr))
+    return res
+
+def report(results, names):  # one column group per measured variant
+    vs = [v for v in KINDS if v in results]
+    print("# %-12s" % "module" + "".join(" %9s %8s %8s" % (v + "_us",
+          "used_B", "kept_B") for v in vs))
+    for name in names:
+        row = "  %-12s" % name
+        for v in vs:
+            m = results[v]["modules"].get(name)
+            row += (" %9d %8d %8d" % (m["us"], m["heap_used"],
+                                      m["heap_kept"]) if m else
+                    " %9s %8s %8s" % ("-", "-", "-"))
+        print(row)
+    for v in vs:
+        t = results[v]["total"]
+        print("# %-6s all imports %.1f ms, mem_free %d -> %d" % (v,
+              t["us"] / 1e3, t["free_before"], t["free_after"]))
+
+def main(argv):
+    ap = argparse.ArgumentParser(description="station .mpy / frozen build")
+    ap.add_argument("main", help="main script, e.g. AHT10-AHT25-OLED.py")
+    ap.add_argument("--out", default=os.path.join(REPO, "build"))
+    ap.add_argument("--lib", action="append", default=[],
+                    help="more directories to look for drivers in")
+    ap.add_argument("--native", action="store_true",
+                    help="native emitter for the hot-path modules")
+    ap.add_argument("--mpy-cross", help="mpy-cross binary to use")
+    ap.add_argument("--measure", choices=KINDS,
+                    help="measure this variant on the Pico")
+    ap.add_argument("--port", help="serial port for mpremote (default auto)")
+    a = ap.parse_args(argv[1:])
+    dirs = [REPO, os.path.join(REPO, "lib")] + a.lib
+    order, missing = closure(os.path.abspath(a.main), dirs)
+    exe, version = mpyCross(a.mpy_cross)
+    rows = build(order, a.out, a.native, exe)
+    print("# %s (%s)" % (version, "native hot paths" if a.native
+                         else "bytecode"))
+    print("# %-12s %8s %8s %s" % ("module", "py_B", "mpy_B", "emitter"))
+    for name, py, mpy, emit in rows:
+        print("  %-12s %8d %8d %s" % (name, py, mpy, emit))
+    print("# total %d B source, %d B mpy" % (sum(r[1] for r in rows),
+                                            sum(r[2] for r in rows)))
+    if missing:
+        print("# not found, copy to the Pico or add with --lib: %s"
+              % " ".join(missing))
+    if a.measure:
+        path = os.path.join(a.out, "import.json")
+        results = {}
+        if os.path.exists(path):
+            with open(path) as fp:
+                results = json.load(fp)
+        results[a.measure] = measure(a.measure, order, a.out, a.port)
+        with open(path, "w") as fp:
+            json.dump(results, fp, indent=1)
+        report(results, [n for n, p in order if n != "app"])
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,168 @@
+"""
+# mqbatch.py : pack several records into one MQTT payload
+# Instead of one CSV string (and one MQTT packet, one radio wakeup) per
+# window, collect up to 'maxCount' records or 'maxMs' of latency, then
+# publish them together, either as
+#   "bin":  header + per record: dt(u16) value[nCh](i16)   (2+2*nCh bytes)
+#           header = magic(0xB7) version nCh count t0(u32) tScale(u16)
+#                    then scale(i16) offset(i16) per channel, then the
+#                    channel names: length(u8) "T1,T2,RH1" (version 2)
+#   "json": {"t0":..,"ts":..,"ch":[names],"d":[[dt,v1,v2,..],..]}
+# Values are scaled to int16 as in binrec.py: round((x - offset) * scale).
+# decode() on the host turns either form back into numpy arrays, with the
+# same channel names; names= overrides them (version 1 binary payloads
+# carry none and decode as c0, c1 ...).
+# 19-Oct-2026
+
+# Usage Example:
+import mqbatch
+mb = mqbatch.Batcher(("T1", "T2", "RH1"), scales=(500, 500, 100),
+                     offsets=(20, 20, 0), mode="bin", maxCount=10)
+while True:
+    ...
+    p = mb.add(epoch, (degC1, degC2, RH1))
+    if p is None and mb.due():
+        p = mb.flush()
+    if p is not None:
+        mqq.put("T3b", p)
+"""
+
+import struct
+from time import ticks_ms, ticks_diff
+try:
+    import ujson as json
+except ImportError:
+    import json
+
+MAGIC = 0xB7
+VERSION = 2         # 2: channel names in the binary header
+MISSING = -32768    # same marker as binrec
+HDR_FMT = "<BBBHIH"  # magic, version, nCh, count, t0, tScale
+
+class Batcher:
+    def __init__(self, names, scales, offsets=None, mode="bin", maxCount=10,
+                 maxMs=60_000, tScale=1):
+        self.names = names
+        self.nCh = len(names)
+        self.scales = scales
+        if offsets is None:
+            offsets = (0,) * self.nCh
+        self.offsets = offsets
+        self.mode = mode            # "bin" or "json"
+        self.maxCount = maxCount    # records per payload
+        self.maxMs = maxMs          # max time the first record may wait
+        self.tScale = tScale        # time units per second
+        self.recFmt = "<H%dh" % self.nCh
+        self.recSize = struct.calcsize(self.recFmt)
+        self.nameBytes = ",".join(names).encode()
+        if len(self.nameBytes) > 255:
+            raise ValueError("channel names longer than 255 bytes")
+        self.hdrSize = (struct.calcsize(HDR_FMT) + 4 * self.nCh + 1 +
+                        len(self.nameBytes))
+        self.buf = bytearray(self.hdrSize + maxCount * self.recSize)
+        p = self.hdrSize - len(self.nameBytes) - 1  # names never change
+        self.buf[p] = len(self.nameBytes)
+        self.buf[p + 1:self.hdrSize] = self.nameBytes
+        self.ivals = [0] * self.nCh
+        self.rows = []              # json mode records
+        self.count = 0
+        self.t0 = 0                 # time of the first record
+        self.tLast = 0
+        self.tFirst = 0             # ticks_ms when the batch was started
+        self.payloads = 0
+        self.records = 0
+
+    def _scale(self, values):
+        iv = self.ivals
+        for i in range(self.nCh):
+            x = (values[i] - self.offsets[i]) * self.scales[i]
+            if (x != x) or (x <= MISSING) or (x > 32767):
+                iv[i] = MISSING
+            else:
+                iv[i] = int(round(x))
+        return iv
+
+    def add(self, t, values):  # returns a finished payload or None
+        t = int(t)
+        out = None
+        if self.count and not (0 <= t - self.tLast <= 65535):
+            out = self.flush()      # time step won't fit in a u16 delta
+        if self.count == 0:
+            self.t0 = t
+            self.tLast = t
+            self.tFirst = ticks_ms()
+        dt = t - self.tLast
+        self.tLast = t
+        iv = self._scale(values)
+        if self.mode == "json":
+            self.rows.append([dt] + iv)
+        else:
+            struct.pack_into(self.recFmt, self.buf,
+                             self.hdrSize + self.count * self.recSize, dt, *iv)
+        self.count += 1
+        self.records += 1
+        if out is None and self.count >= self.maxCount:
+            out = self.flush()
+        return out
+
+    def due(self):  # True if the oldest waiting record is past maxMs
+        return self.count > 0 and ticks_diff(ticks_ms(), self.tFirst) >= self.maxMs
+
+    def flush(self):  # payload with all waiting records, or None
+        if self.count == 0:
+            return None
+        if self.mode == "json":
+            p = json.dumps({"t0": self.t0, "ts": self.tScale,
+                            "ch": list(self.names), "sc": list(self.scales),
+                            "of": list(self.offsets), "d": self.rows})
+            self.rows = []
+        else:
+            struct.pack_into(HDR_FMT, self.buf, 0, MAGIC, VERSION, self.nCh,
+                             self.count, self.t0 & 0xFFFFFFFF, self.tScale)
+            p = struct.calcsize(HDR_FMT)
+            for i in range(self.nCh):
+                struct.pack_into("<hh", self.buf, p + 4 * i,
+                                 int(self.scales[i]), int(self.offsets[i]))
+            p = bytes(self.buf[:self.hdrSize + self.count * self.recSize])
+        self.count = 0
+        self.payloads += 1
+        return p
+
+
+# ---------------------------------------------------------------------
+# host side decoder
+
+def decode(payload, names=None):  # -> (names, t [s], values [count,nCh])
+    import numpy as np
+    if isinstance(payload, str):
+        payload = payload.encode()
+    if payload[0] == MAGIC:
+        magic, ver, nCh, count, t0, tScale = struct.unpack_from(HDR_FMT,
+                                                                payload, 0)
+        if ver not in (1, VERSION):
+            raise ValueError("unsupported mqbatch version %d" % ver)
+        p = struct.calcsize(HDR_FMT)
+        so = np.frombuffer(payload, dtype="<i2", count=2 * nCh,
+                           offset=p).reshape(nCh, 2)
+        scales, offsets = so[:, 0], so[:, 1]
+        p += 4 * nCh
+        sent = ["c%d" % i for i in range(nCh)]
+        if ver >= 2:
+            n = payload[p]
+            sent = payload[p + 1:p + 1 + n].decode().split(",")
+            p += 1 + n
+        dtype = np.dtype([("dt", "<u2"), ("v", "<i2", (nCh,))])
+        recs = np.frombuffer(payload, dtype=dtype, count=count, offset=p)
+        dt, iv = recs["dt"], recs["v"].reshape(-1, nCh)
+    else:
+        d = json.loads(payload)
+        t0, tScale, sent = d["t0"], d["ts"], d["ch"]
+        scales = np.asarray(d["sc"])
+        offsets = np.asarray(d["of"])
+        rows = np.asarray(d["d"], dtype=np.int64).reshape(-1, len(sent) + 1)
+        dt, iv = rows[:, 0], rows[:, 1:]
+    t = (t0 + np.cumsum(dt.astype(np.int64))) / float(tScale)
+    vals = iv.astype(np.float64)
+    vals[iv == MISSING] = np.nan
+    vals = vals / scales + offsets
+    return list(names) if names is not None else sent, t, vals
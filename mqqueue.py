@@ -0,0 +1,149 @@
+"""
+# mqqueue.py : store-and-forward queue for MQTT publishing
+# put() never touches the network: records go into a fixed-size RAM ring,
+# and when that is full they spill to a file on flash (optional) instead of
+# being dropped. drain() publishes the oldest records a few at a time, so a
+# backlog after a broker or wifi outage goes out at a controlled rate.
+# Spilled records are sent at least once; after a reset() the part of the
+# spill file already sent goes out again. Binary (bytes) payloads are
+# stored hex-encoded in the spill file.
+# 19-Oct-2026
+
+# Usage Example:
+import mqqueue
+mqq = mqqueue.PubQueue(maxLen=120, spill="mqspill.txt", batch=8)
+while True:
+    ...
+    mqq.put(topic_pub, outs)
+    if client is not None and mqq.drain(client) < 0:
+        client = None         # publish failed, reconnect later
+"""
+
+import os
+from binascii import hexlify, unhexlify
+from time import ticks_ms, ticks_diff
+
+class PubQueue:
+    def __init__(self, maxLen=120, spill=None, batch=8, budgetMs=200):
+        self.maxLen = maxLen        # records held in RAM
+        self.topics = [None] * maxLen
+        self.msgs = [None] * maxLen
+        self.head = 0               # index of the oldest record
+        self.count = 0              # records in RAM
+        self.spill = spill          # flash file for overflow, None = drop
+        self.spillCount = 0         # records in the spill file not yet read
+        self.spillPos = 0           # read offset into the spill file
+        self.batch = batch          # max records sent per drain() call
+        self.budgetMs = budgetMs    # max time spent per drain() call
+        self.sent = 0
+        self.dropped = 0            # lost because RAM full and no spill
+        self.failures = 0           # publish exceptions
+        if spill is not None:
+            self._countSpill()
+
+    def _countSpill(self):  # spill file left from before a reset()
+        try:
+            with open(self.spill) as fp:
+                for line in fp:
+                    self.spillCount += 1
+        except OSError:
+            pass
+
+    def __len__(self):
+        return self.count + self.spillCount
+
+    def put(self, topic, msg):
+        if self.spillCount or self.count == self.maxLen:
+            if self.spill is None:   # overwrite the oldest record
+                self._pop()
+                self.dropped += 1
+            else:       # keep order: once spilling, new records follow
+                try:
+                    with open(self.spill, "a") as fp:
+                        fp.write(self._line(topic, msg))
+                    self.spillCount += 1
+                except OSError:
+                    self.dropped += 1
+                return
+        i = (self.head + self.count) % self.maxLen
+        self.topics[i] = topic
+        self.msgs[i] = msg
+        self.count += 1
+
+    def _line(self, topic, msg):  # one spill file line
+        if isinstance(msg, str):
+            return topic + "\t" + msg + "\n"
+        return topic + "\v" + hexlify(msg).decode() + "\n"
+
+    def _pop(self):
+        i = self.head
+        self.topics[i] = None
+        self.msgs[i] = None
+        self.head = (i + 1) % self.maxLen
+        self.count -= 1
+
+    def _refill(self):  # move spilled records back into the RAM ring
+        n = 0
+        with open(self.spill) as fp:
+            fp.seek(self.spillPos)
+            while self.count < self.maxLen:
+                line = fp.readline()
+                if not line:
+                    break
+                self.spillPos += len(line)
+                line = line.rstrip("\n")
+                if "\t" in line:
+                    topic, msg = line.split("\t", 1)
+                else:
+                    topic, msg = line.split("\v", 1)
+                    msg = unhexlify(msg)
+                i = (self.head + self.count) % self.maxLen
+                self.topics[i] = topic
+                self.msgs[i] = msg
+                self.count += 1
+                n += 1
+        self.spillCount -= n
+        if n == 0 or self.spillCount <= 0:   # all read back, start over
+            self.spillCount = 0
+            self.spillPos = 0
+            os.remove(self.spill)
+
+    def persist(self):  # before reset(): put RAM records in the spill file
+        if self.spill is None or self.count == 0:
+            return
+        rest = ""
+        if self.spillCount:
+            with open(self.spill) as fp:
+                fp.seek(self.spillPos)
+                rest = fp.read()
+        with open(self.spill, "w") as fp:
+            while self.count:
+                fp.write(self._line(self.topics[self.head],
+                                    self.msgs[self.head]))
+                self._pop()
+                self.spillCount += 1
+            fp.write(rest)
+        self.spillPos = 0
+
+    def drain(self, client):  # publish a batch, return number sent or -1
+        t0 = ticks_ms()
+        n = 0
+        while n < self.batch:
+            if self.count == 0:
+                if not self.spillCount:
+                    break
+                self._refill()
+                if self.count == 0:
+                    break
+            try:
+                client.publish(self.topics[self.head], self.msgs[self.head])
+            except Exception as e:  # e.g. [Errno 104] ECONNRESET
+                self.failures += 1
+                print(e)
+                return -1           # record stays at the head of the queue
+            self._pop()
+            self.sent += 1
+            n += 1
+            if ticks_diff(ticks_ms(), t0) > self.budgetMs:
+                break
+        return n
@@ -0,0 +1,317 @@
+"""
+# mqttbench.py : host benchmark of the MQTT publish path against a fake broker
+# Runs the same publish path as AHT10-AHT25-OLED.py (mqqueue.PubQueue +
+# netmgr.NetMgr + an MQTT 3.1.1 QoS 0 client like umqtt.simple) against an
+# in-process broker on localhost that can silently drop PUBLISH packets.
+# The broker also hands the client its socket through a fake link that
+# blocks every write for the link latency (so it shows in publish() time
+# and the sample period, as on a link whose send waits for the round trip)
+# and resets the connection (ECONNRESET) on every Nth publish; records
+# still in flight at a reset are lost, as with real QoS 0.
+# At the end the client disconnects and the broker is given time to read
+# everything before the counts are taken.
+# Reports publishes/s, p50/p99/max publish() call latency, reconnect time,
+# records lost, and the time the network path adds to each sample period.
+# 19-Oct-2026
+
+# Usage:
+#   python mqttbench.py                           (clean broker)
+#   python mqttbench.py --latency-ms 5 --drop 0.01 --reset-every 500
+#   python mqttbench.py --n 2000 --period-ms 5 --json
+"""
+
+import argparse
+import errno
+import json
+import random
+import socket
+import struct
+import sys
+import threading
+import time
+
+def _ticks():   # MicroPython time functions for the device modules
+    if not hasattr(time, "ticks_ms"):
+        t0 = time.perf_counter()
+        time.ticks_ms = lambda: int((time.perf_counter() - t0) * 1000)
+        time.ticks_us = lambda: int((time.perf_counter() - t0) * 1e6)
+        time.ticks_diff = lambda a, b: a - b
+        time.ticks_add = lambda a, b: a + b
+        time.sleep_ms = lambda ms: time.sleep(ms / 1000)
+_ticks()
+
+import mqqueue
+import netmgr
+
+def _remaining(n):  # MQTT variable length encoding
+    out = bytearray()
+    while True:
+        b = n & 0x7F
+        n >>= 7
+        out.append(b | (0x80 if n else 0))
+        if not n:
+            return bytes(out)
+
+def _readPacket(sock):  # -> (type byte, payload) or None at EOF
+    h = sock.recv(1)
+    if not h:
+        return None
+    n = shift = 0
+    while True:
+        b = sock.recv(1)
+        if not b:
+            return None
+        n |= (b[0] & 0x7F) << shift
+        shift += 7
+        if not b[0] & 0x80:
+            break
+    data = b""
+    while len(data) < n:
+        chunk = sock.recv(n - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return h[0], data
+
+
+class Link:  # the client's socket, seen through the broker's fake link
+    def __init__(self, broker, sock):
+        self.broker = broker
+        self.sock = sock
+
+    def sendall(self, data):
+        b = self.broker
+        if b.latency:
+            time.sleep(b.latency)
+        if data[0] & 0xF0 == 0x30:  # PUBLISH
+            b.published += 1
+            if b.resetEvery and b.published % b.resetEvery == 0:
+                b.resets += 1       # close with RST: ECONNRESET both ends
+                self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER,
+                                     struct.pack("ii", 1, 0))
+                self.sock.close()
+                raise OSError(errno.ECONNRESET, "Connection reset by peer")
+        self.sock.sendall(data)
+
+    def __getattr__(self, name):   # recv, close, setsockopt ...
+        return getattr(self.sock, name)
+
+
+class FakeBroker:  # minimal MQTT 3.1.1 broker: CONNECT, PUBLISH QoS 0, PING
+    def __init__(self, latencyMs=0.0, drop=0.0, resetEvery=0, seed=1):
+        self.latency = latencyMs / 1000.0  # link delay per client write
+        self.drop = drop                   # fraction of PUBLISH discarded
+        self.resetEvery = resetEvery       # reset the link every N publishes
+        self.rand = random.Random(seed)
+        self.published = 0                 # PUBLISH writes by the client
+        self.received = 0
+        self.dropped = 0
+        self.resets = 0
+        self.connects = 0
+        self.active = 0                    # connections being served
+        self.lock = threading.Lock()
+        self.lsock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.lsock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.lsock.bind(("127.0.0.1", 0))
+        self.lsock.listen(4)
+        self.port = self.lsock.getsockname()[1]
+        self.running = True
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while self.running:
+            try:
+                conn, _ = self.lsock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(conn,),
+                             daemon=True).start()
+
+    def link(self, sock):  # client side: writes go through the fault link
+        return Link(self, sock)
+
+    def _serve(self, conn):
+        with self.lock:
+            self.active += 1
+        try:
+            while self.running:
+                pkt = _readPacket(conn)
+                if pkt is None:
+                    break
+                kind = pkt[0] & 0xF0
+                if kind == 0x10:      # CONNECT
+                    self.connects += 1
+                    conn.sendall(b"\x20\x02\x00\x00")
+                elif kind == 0x30:    # PUBLISH
+                    if self.rand.random() < self.drop:
+                        self.dropped += 1
+                    else:
+                        self.received += 1
+                elif kind == 0xC0:    # PINGREQ
+                    conn.sendall(b"\xd0\x00")
+                elif kind == 0xE0:    # DISCONNECT
+                    break
+        except OSError:
+            pass
+        conn.close()
+        with self.lock:
+            self.active -= 1
+
+    def settle(self, sent, timeout=10.0):  # wait until all is read or closed
+        t0 = time.perf_counter()
+        while time.perf_counter() - t0 < timeout:
+            if self.received + self.dropped >= sent or self.active == 0:
+                return True
+            time.sleep(0.01)
+        return False
+
+    def close(self):
+        self.running = False
+        self.lsock.close()
+
+
+class MiniMQTT:  # same wire behaviour as umqtt.simple.MQTTClient, QoS 0
+    def __init__(self, client_id, server, port, timeout=2.0, link=None):
+        self.client_id = client_id
+        self.addr = (server, port)
+        self.timeout = timeout
+        self.link = link        # function(socket) -> socket-like, or None
+        self.sock = None
+
+    def connect(self):
+        self.sock = socket.create_connection(self.addr, self.timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self.link:
+            self.sock = self.link(self.sock)
+        cid = self.client_id.encode()
+        var = b"\x00\x04MQTT\x04\x02\x00\x3c" + struct.pack("!H", len(cid)) + cid
+        self.sock.sendall(b"\x10" + _remaining(len(var)) + var)
+        resp = self.sock.recv(4)
+        if len(resp) != 4 or resp[0] != 0x20 or resp[3] != 0:
+            raise OSError("bad CONNACK")
+        return self
+
+    def publish(self, topic, msg):
+        if isinstance(msg, str):
+            msg = msg.encode()
+        t = topic.encode()
+        body = struct.pack("!H", len(t)) + t + msg
+        self.sock.sendall(b"\x30" + _remaining(len(body)) + body)
+
+    def disconnect(self):
+        try:
+            self.sock.sendall(b"\xe0\x00")
+        finally:
+            self.sock.close()
+
+
+class TimedClient:  # wraps a client, records the time of every publish()
+    def __init__(self, client, lat):
+        self.client = client
+        self.lat = lat
+
+    def publish(self, topic, msg):
+        t0 = time.perf_counter()
+        try:
+            self.client.publish(topic, msg)
+        finally:
+            self.lat.append(time.perf_counter() - t0)
+
+
+def pct(v, p):
+    if not v:
+        return 0.0
+    v = sorted(v)
+    return v[min(len(v) - 1, int(p / 100.0 * len(v)))]
+
+def run(n=2000, periodMs=0.0, latencyMs=0.0, drop=0.0, resetEvery=0,
+        batch=8, seed=1):
+    broker = FakeBroker(latencyMs, drop, resetEvery, seed)
+    lat = []            # publish() call durations
+    connects = []       # MQTT connect durations
+    def connect():
+        t0 = time.perf_counter()
+        c = MiniMQTT("bench", "127.0.0.1", broker.port,
+                     link=broker.link).connect()
+        connects.append(time.perf_counter() - t0)
+        return TimedClient(c, lat)
+    net = netmgr.NetMgr(lambda: True, lambda: None, connect, baseMs=5,
+                        maxMs=200)
+    mqq = mqqueue.PubQueue(maxLen=n + 1, batch=batch, budgetMs=1000)
+    added = []          # time the network path added to each sample
+    t0 = time.perf_counter()
+    tNext = t0
+    i = 0
+    while i < n or len(mqq):
+        if i < n:
+            tNet = time.perf_counter()
+            mqq.put("T3", "%d, %0.3f,%0.3f,%0.3f, %0.2f,%0.2f,%0.2f"
+                    % (1676000000 + i, 20.125, 21.5, 19.875, 45.0, 44.25, 50.5))
+            i += 1
+        else:
+            tNet = time.perf_counter()
+        if net.poll() and mqq.drain(net.client) < 0:
+            net.lost()
+        added.append(time.perf_counter() - tNet)
+        if periodMs:
+            tNext += periodMs / 1000.0
+            dt = tNext - time.perf_counter()
+            if dt > 0:
+                time.sleep(dt)
+        if time.perf_counter() - t0 > 60:
+            break       # broker too broken, give up
+    elapsed = time.perf_counter() - t0
+    sent = mqq.sent
+    if net.client is not None:
+        try:
+            net.client.client.disconnect()
+        except OSError:
+            pass
+    if not broker.settle(sent):
+        sys.stderr.write("broker still reading after 10 s\n")
+    broker.close()
+    res = {
+        "records": n, "sent": sent, "received": broker.received,
+        "brokerDropped": broker.dropped, "lost": sent - broker.received
+                                                - broker.dropped,
+        "resets": broker.resets, "reconnects": net.reconnects,
+        "publishFailures": mqq.failures,
+        "elapsed_s": elapsed, "publishes_per_s": sent / elapsed,
+        "publish_p50_us": pct(lat, 50) * 1e6,
+        "publish_p99_us": pct(lat, 99) * 1e6,
+        "publish_max_us": max(lat) * 1e6 if lat else 0.0,
+        "connect_p50_ms": pct(connects, 50) * 1e3,
+        "connect_max_ms": max(connects) * 1e3 if connects else 0.0,
+        "added_p50_us": pct(added, 50) * 1e6,
+        "added_p99_us": pct(added, 99) * 1e6,
+        "added_max_us": max(added) * 1e6 if added else 0.0,
+    }
+    return res
+
+def main(argv):
+    ap = argparse.ArgumentParser(description="MQTT publish path benchmark")
+    ap.add_argument("--n", type=int, default=5000, help="records to publish")
+    ap.add_argument("--period-ms", type=float, default=0.0,
+                    help="sample period, 0 = as fast as possible")
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--drop", type=float, default=0.0)
+    ap.add_argument("--reset-every", type=int, default=0)
+    ap.add_argument("--batch", type=int, default=8,
+                    help="records per drain() call")
+    ap.add_argument("--json", action="store_true", help="JSON output")
+    a = ap.parse_args(argv[1:])
+    res = run(a.n, a.period_ms, a.latency_ms, a.drop, a.reset_every, a.batch)
+    if a.json:
+        print(json.dumps(res, indent=1))
+        return
+    print("%(sent)d/%(records)d sent, %(received)d received, %(lost)d lost, "
+          "%(brokerDropped)d dropped by broker" % res)
+    print("%(publishes_per_s).0f publishes/s, publish() p50 %(publish_p50_us).0f"
+          " us, p99 %(publish_p99_us).0f us, max %(publish_max_us).0f us" % res)
+    print("%(resets)d resets, %(reconnects)d connects, connect p50 "
+          "%(connect_p50_ms).2f ms, max %(connect_max_ms).2f ms" % res)
+    print("added to sample period: p50 %(added_p50_us).0f us, p99 "
+          "%(added_p99_us).0f us, max %(added_max_us).0f us" % res)
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,108 @@
+"""
+# netmgr.py : wifi / MQTT connection manager with jittered exponential backoff
+# poll() is cheap and meant to be called from the idle part of the sampling
+# loop. It only tries to reconnect when the backoff delay has passed, so a
+# dead broker costs one connect attempt per interval (1 s, 2 s, 4 s ... up
+# to maxMs, each +/-25% random) instead of a blocking retry, LED blink or
+# reset() on every window. health() gives a short string for the display.
+# 19-Oct-2026
+
+# Usage Example:
+import netmgr
+def wifiStart():  # must not block: poll() waits for isconnected()
+    wlan.active(True)
+    wlan.connect(secrets['ssid'], secrets['password'])
+net = netmgr.NetMgr(wlan.isconnected, wifiStart,
+                    lambda: mq.mqtt_connect(secrets))
+while True:
+    ...
+    net.poll()
+    if net.client is not None:
+        try:
+            net.client.publish(topic_pub, outs)
+        except OSError:
+            net.lost()     # reconnect in the background
+"""
+
+from time import ticks_ms, ticks_diff, ticks_add
+import random
+
+UP = 0        # MQTT client connected
+NO_WIFI = 1   # waiting for the wifi link
+NO_MQTT = 2   # wifi up, broker not connected
+
+HEALTH = ("NET OK", "NO WIFI", "NO MQTT")
+
+class NetMgr:
+    def __init__(self, wifiUp, wifiStart, mqttConnect, baseMs=1000,
+                 maxMs=300_000, wifiWaitMs=15_000):
+        self.wifiUp = wifiUp            # function() -> True if link is up
+        self.wifiStart = wifiStart      # function() (re)starting the link
+        self.mqttConnect = mqttConnect  # function() -> MQTT client
+        self.baseMs = baseMs            # first retry delay
+        self.maxMs = maxMs              # longest retry delay
+        self.wifiWaitMs = wifiWaitMs    # time allowed for wifi to come up
+        self.client = None
+        self.state = NO_MQTT
+        self.delay = baseMs
+        self.tNext = ticks_ms()         # earliest next attempt
+        self.tWifi = None               # when wifiStart() was last called
+        self.tDown = ticks_ms()         # when the link was lost
+        self.attempts = 0               # connect attempts since last up
+        self.reconnects = 0             # successful (re)connections
+        self.recoverMs = 0              # down time before the last recovery
+        self.connectMs = 0              # duration of the last MQTT connect
+
+    def ok(self):
+        return self.state == UP
+
+    def health(self):  # short status text, fits the big-font OLED line
+        return HEALTH[self.state]
+
+    def _backoff(self):
+        jitter = (random.getrandbits(8) - 128) * self.delay // 512  # +/-25%
+        self.tNext = ticks_add(ticks_ms(), self.delay + jitter)
+        self.delay = min(self.delay * 2, self.maxMs)
+
+    def lost(self):  # publish failed: drop the client, retry later
+        if self.state == UP:
+            self.tDown = ticks_ms()
+            self.delay = self.baseMs
+        self.client = None
+        self.state = NO_MQTT
+        self._backoff()
+
+    def poll(self):  # returns True if the MQTT client is usable
+        if self.state == UP:
+            return True
+        now = ticks_ms()
+        if ticks_diff(now, self.tNext) < 0:
+            return False
+        self.attempts += 1
+        if not self.wifiUp():
+            self.state = NO_WIFI
+            if (self.tWifi is None or
+                    ticks_diff(now, self.tWifi) > self.wifiWaitMs):
+                self.tWifi = now
+                try:
+                    self.wifiStart()
+                except OSError as e:
+                    print("wifi:", e)
+            self._backoff()
+            return False
+        self.tWifi = None
+        try:
+            self.client = self.mqttConnect()
+        except OSError as e:
+            print("mqtt:", e)
+            self.state = NO_MQTT
+            self._backoff()
+            return False
+        t = ticks_ms()
+        self.connectMs = ticks_diff(t, now)
+        self.recoverMs = ticks_diff(t, self.tDown)
+        self.state = UP
+        self.delay = self.baseMs
+        self.attempts = 0
+        self.reconnects += 1
+        return True
@@ -0,0 +1,59 @@
+"""
+# pid.py : PID controller with anti-windup and output slew limiting
+# Plain Python, no hardware: used by tecpid.py on the Pico and by tecsim.py
+# on the host for tuning.
+#  - derivative acts on the measurement, so setpoint steps don't kick
+#  - integration stops while the output is saturated (or slew limited)
+#    in the direction the error is pushing: no windup
+#  - output changes by at most 'slew' per second
+# 19-Oct-2026
+
+# Usage Example:
+import pid
+p = pid.PID(kp=0.2, ki=0.01, kd=0.0, outMin=0.0, outMax=1.0, slew=0.1)
+duty = p.update(setpoint, temperature, dt=0.5)
+"""
+
+class PID:
+    def __init__(self, kp, ki=0.0, kd=0.0, outMin=0.0, outMax=1.0,
+                 slew=None, reverse=False):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.outMin = outMin
+        self.outMax = outMax
+        self.slew = slew          # max output change per second, None = off
+        self.sign = -1.0 if reverse else 1.0  # reverse: cooling, more output
+                                              # lowers the measurement
+        self.reset()
+
+    def reset(self, out=0.0):
+        self.integ = out          # integral term, in output units
+        self.out = out
+        self.last = None          # previous measurement
+        self.err = 0.0
+
+    def update(self, setpoint, meas, dt):
+        err = self.sign * (setpoint - meas)
+        self.err = err
+        d = 0.0
+        if self.last is not None and dt > 0:
+            d = -self.sign * (meas - self.last) / dt
+        self.last = meas
+        integ = self.integ + self.ki * err * dt
+        out = self.kp * err + integ + self.kd * d
+        lo, hi = self.outMin, self.outMax
+        if self.slew is not None:  # slew limit narrows the allowed range
+            lo = max(lo, self.out - self.slew * dt)
+            hi = min(hi, self.out + self.slew * dt)
+        if out > hi:
+            out = hi
+            if err > 0:
+                integ = self.integ     # don't wind up further
+        elif out < lo:
+            out = lo
+            if err < 0:
+                integ = self.integ
+        self.integ = min(max(integ, self.outMin), self.outMax)
+        self.out = out
+        return out
@@ -0,0 +1,126 @@
+"""
+# sensorguard.py : per-sensor I2C fault handling with bus recovery
+# Wraps one sensor on its own bus. A read that raises OSError is retried
+# at once, then again after busRecover() has clocked SCL until a stuck
+# slave lets go of SDA, sent a STOP, and the bus and sensor objects have
+# been rebuilt; a driver constructor raising RuntimeError (ahtx0 when
+# calibration is not set) is a failed try too. If every retry fails the
+# sensor is marked degraded and read() returns None without touching the
+# bus until the next retry time, which backs off from baseMs to maxMs.
+# Other sensors keep sampling.
+# 19-Oct-2026
+
+# Usage Example:
+import sensorguard, ahtx0
+from machine import Pin, I2C
+g1 = sensorguard.SensorGuard("T1",
+        lambda: I2C(1, sda=Pin(18), scl=Pin(19), freq=400_000),
+        ahtx0.AHT10, scl=19, sda=18)
+r = g1.read(lambda s: (s.temperature, s.relative_humidity))  # None if down
+# optional health=i2chealth.DevHealth("T1") times and counts every I2C
+# transaction of the sensor (its bus is wrapped, see DevHealth.bus())
+"""
+
+from machine import Pin
+from time import ticks_ms, ticks_diff, ticks_add, sleep_ms, sleep_us
+
+def busRecover(scl, sda):  # free a slave holding SDA low; True if SDA high
+    c = Pin(scl, Pin.OPEN_DRAIN, value=1)
+    d = Pin(sda, Pin.IN, Pin.PULL_UP)
+    for i in range(9):         # at most 9 clocks finish any byte in flight
+        if d.value():
+            break
+        c.value(0)
+        sleep_us(5)
+        c.value(1)
+        sleep_us(5)
+    d.init(Pin.OPEN_DRAIN, value=0)  # STOP: SDA rises while SCL is high
+    sleep_us(5)
+    c.value(1)
+    sleep_us(5)
+    d.value(1)
+    sleep_us(5)
+    return d.value() == 1
+
+class SensorGuard:
+    def __init__(self, name, makeBus, makeSensor, scl, sda, retries=2,
+                 baseMs=1000, maxMs=60_000, health=None):
+        self.name = name
+        self.makeBus = makeBus        # function() -> new I2C / SoftI2C
+        self.makeSensor = makeSensor  # function(bus) -> new driver object
+        self.scl = scl                # GPIO numbers, for bus recovery
+        self.sda = sda
+        self.retries = retries        # extra attempts per read
+        self.baseMs = baseMs          # first wait once degraded
+        self.maxMs = maxMs
+        self.waitMs = baseMs
+        self.bus = None
+        self.sensor = None
+        self.degraded = False
+        self.nextTry = 0              # ticks_ms of the next degraded retry
+        self.tFail = None             # ticks_ms of the first failed read
+        self.errors = 0               # failed attempts
+        self.recoveries = 0           # times it came back after failing
+        self.recoverMs = 0            # last time from failure to good read
+        self.stuck = 0                # recoveries that found SDA held low
+        self.health = health          # i2chealth.DevHealth, or None
+        try:
+            self._reinit(False)
+        except (OSError, RuntimeError) as e:  # see read()
+            self._degrade(e)
+
+    def _reinit(self, recover=True):
+        self.sensor = None
+        if recover and not busRecover(self.scl, self.sda):
+            self.stuck += 1
+        self.bus = self.makeBus()
+        if self.health is None:
+            self.sensor = self.makeSensor(self.bus)
+        else:
+            self.sensor = self.makeSensor(self.health.bus(self.bus))
+
+    def _degrade(self, e):
+        if not self.degraded:
+            print("# sensor %s degraded: %s" % (self.name, e))
+        self.degraded = True
+        if self.tFail is None:
+            self.tFail = ticks_ms()
+        self.nextTry = ticks_add(ticks_ms(), self.waitMs)
+        self.waitMs = min(self.waitMs * 2, self.maxMs)
+
+    def read(self, fn):  # fn(sensor) -> reading; None if the sensor is down
+        if self.degraded and ticks_diff(ticks_ms(), self.nextTry) < 0:
+            return None
+        err = None
+        for k in range(self.retries + 1):
+            try:
+                if self.sensor is None:
+                    self._reinit()
+                r = fn(self.sensor)
+            except (OSError, RuntimeError) as e:  # RuntimeError: re-init
+                err = e
+                self.errors += 1
+                if self.tFail is None:
+                    self.tFail = ticks_ms()
+                if k > 0:
+                    self.sensor = None  # recover the bus on the next try
+                sleep_ms(1 << k)
+                continue
+            if self.tFail is not None:
+                self.recoverMs = ticks_diff(ticks_ms(), self.tFail)
+                self.recoveries += 1
+                self.tFail = None
+                if self.degraded:
+                    print("# sensor %s back after %d ms"
+                          % (self.name, self.recoverMs))
+            self.degraded = False
+            self.waitMs = self.baseMs
+            return r
+        self._degrade(err)
+        return None
+
+    def status(self):  # one comment line for the periodic stats print
+        return ("# sensor %s %s, %d errors, %d recoveries, last %d ms, "
+                "%d stuck" % (self.name, "DEGRADED" if self.degraded else "ok",
+                              self.errors, self.recoveries, self.recoverMs,
+                              self.stuck))
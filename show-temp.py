@@ -6,14 +6,15 @@
 import ssd1306big
 import time
 from random import randint
-from machine import ADC
+import adcsvc
 
-Tsense = ADC(4) # RP2040 internal temperature sensor
+# RP2040 internal temperature sensor, sampled in the background
+adc = adcsvc.ADCService((adcsvc.TDIE,), rate=200)
+adc.start()
+time.sleep(0.05)  # let the filter fill
 
-def getTemp():  # read internal temp in degrees C    
-    reading = Tsense.read_u16() * (3.3 / 65535)
-    degC = 27 - (reading - 0.706)/0.001721
-    return degC
+def getTemp():  # read internal temp in degrees C
+    return adc.value("Tdie")
 
 write = ssd1306big
 
@@ -0,0 +1,295 @@
+"""
+# bench.py : sample-to-output benchmark of the station scripts on the simulator
+# Runs each configuration (single, dual and triple AHT10, AHT10+SHT31 four
+# channel, AHT10+AHT25 MQTT station) unmodified under sim/run.py with the
+# simulated devices' real conversion and I2C transfer times, and reports:
+#  - samples/s achieved per sensor (conversions triggered / simulated s)
+#  - window period and jitter, from the times data records are printed
+#  - sample-to-output latency: record time minus its newest (fresh) and
+#    oldest (span) sensor conversion
+#  - where the simulated time went: sensor, display, format (the script's
+#    own averaging and formatting), publish, network, log, sleep
+#  - peak host memory (tracemalloc, a second pass without CPU charging)
+# Waits (bus transfers, sleeps, conversions) are attributed exactly from
+# the call stack. Script CPU time is charged at --cpu-scale times the host
+# time and split between categories by a SIGPROF stack sampler, so those
+# numbers vary a little from run to run; --cpu-scale 0 is deterministic.
+# Results go to a JSON file; --baseline compares against an earlier one.
+# 19-Oct-2026
+
+# Usage:
+#   python sim/bench.py --out bench.json
+#   python sim/bench.py --only station --seconds 1200 --baseline bench.json
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import signal
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
+
+import run       # noqa: E402
+import simcore   # noqa: E402
+
+CONFIGS = (  # name, script, simulated seconds
+    ("single", "AHT10-OLED.py", 300),
+    ("dual", "AHT10-Dual.py", 300),
+    ("triple", "AHT10-Triple.py", 300),
+    ("aht10-sht31", "AHT10_SHT31_OLED.py", 300),
+    ("station", "AHT10-AHT25-OLED.py", 900),
+)
+
+CATEGORY = {  # module -> where its time goes; first match from the inside
+    "ahtx0": "sensor", "aht": "sensor", "sensorguard": "sensor",
+    "i2ctune": "sensor", "oversample": "sensor", "adcsvc": "sensor",
+    "sh1106": "display", "ssd1306big": "display", "framebuf": "display",
+    "MQ": "publish", "mqqueue": "publish", "mqbatch": "publish",
+    "netmgr": "network", "network": "network", "ntptime": "network",
+    "timesync": "network",
+    "flashlog": "log", "binrec": "log",
+}
+NET_FUNCS = ("initWLAN", "mqtt_connect")  # in MQ, but network bring-up
+SIM = ("simcore", "devices", "machine", "utime", "micropython", "run",
+       "bench")                            # simulator, time not charged
+KINDS = ("sensor", "display", "format", "publish", "network", "log",
+         "sleep", "other")
+
+DATA = re.compile(r"\s*-?\d")  # a printed data record starts with a number
+
+def _module(code):
+    return os.path.splitext(os.path.basename(code.co_filename))[0]
+
+class Attrib:  # attributes simulated time to categories by call stack
+    def __init__(self, script):
+        self.script = os.path.abspath(os.path.join(run.REPO, script))
+        self.wait = dict.fromkeys(KINDS, 0)   # us
+        self.samples = dict.fromkeys(KINDS, 0)
+        self.cache = {}
+
+    def classify(self, f, waiting):
+        while f is not None:
+            code = f.f_code
+            k = self.cache.get(code)
+            if k is None:
+                m = _module(code)
+                if m == "MQ" and code.co_name in NET_FUNCS:
+                    k = "network"
+                elif m in CATEGORY:
+                    k = CATEGORY[m]
+                elif code.co_filename == self.script:
+                    k = "main"
+                else:
+                    k = "sim" if m in SIM else ""
+                self.cache[code] = k
+            if k == "main":
+                return "sleep" if waiting else "format"
+            if k and k != "sim":
+                return k
+            f = f.f_back
+        return "other"
+
+    def account(self, us):  # Clock.account: called for every wait
+        if us > 0:
+            self.wait[self.classify(sys._getframe(1), True)] += us
+
+    def sample(self, signum, f):  # SIGPROF: where is the script's CPU going
+        if f is not None and _module(f.f_code) in SIM:
+            return                  # simulator work, not charged
+        self.samples[self.classify(f, False)] += 1
+
+class Records:  # stdout for the script: timestamps printed data records
+    def __init__(self, clock, echo=None):
+        self.clock = clock
+        self.echo = echo
+        self.times = []
+        self.part = ""
+
+    def write(self, s):
+        if self.echo is not None:
+            self.echo.write(s)
+        self.part += s
+        while "\n" in self.part:
+            line, self.part = self.part.split("\n", 1)
+            if DATA.match(line):
+                self.times.append(self.clock.us)
+        return len(s)
+
+    def flush(self):
+        pass
+
+def _stats(xs):  # mean, rms deviation, min, max
+    if not xs:
+        return None
+    m = sum(xs) / len(xs)
+    sd = math.sqrt(sum((x - m) ** 2 for x in xs) / len(xs))
+    return {"mean": m, "jitter_rms": sd, "min": min(xs), "max": max(xs)}
+
+def _latency(records, convs):
+    # for each record after the first: age of the newest conversion before
+    # it, and of the oldest conversion since the record before it
+    fresh = []
+    span = []
+    j = 0
+    for i in range(1, len(records)):
+        t0, t1 = records[i - 1], records[i]
+        while j < len(convs) and convs[j] <= t0:
+            j += 1
+        k = j
+        while k < len(convs) and convs[k] <= t1:
+            k += 1
+        if k > j:
+            fresh.append((t1 - convs[k - 1]) / 1e3)
+            span.append((t1 - convs[j]) / 1e3)
+    return _stats(fresh), _stats(span)
+
+def bench(name, script, seconds, cpuScale=40.0, seed=1, echo=None):
+    board = simcore.defaultBoard(seed)
+    attrib = Attrib(script)
+    convs = []      # conversion start times, all sensors
+    holder = {}
+
+    def hooks(b):
+        clk = b.clock
+        clk.account = attrib.account
+        holder["out"].clock = clk
+        for d in b.devices():
+            if hasattr(d, "measurements"):
+                def write(data, d=d, w=d.write):
+                    n = d.measurements
+                    w(data)
+                    if d.measurements != n:
+                        convs.append(clk.us)
+                d.write = write
+        if cpuScale > 0 and hasattr(signal, "setitimer"):
+            signal.signal(signal.SIGPROF, attrib.sample)
+            signal.setitimer(signal.ITIMER_PROF, 0.0005, 0.0005)
+
+    holder["out"] = Records(None, echo)
+    try:
+        r = run.runScript(script, seconds, board, cpuScale=cpuScale,
+                          out=holder["out"], hooks=hooks)
+    finally:
+        if hasattr(signal, "setitimer"):
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, signal.SIG_DFL)
+    convs.sort()
+    simUs = r["sim_s"] * 1e6
+    spent = dict(attrib.wait)
+    nSamp = sum(attrib.samples.values())
+    cpuUs = r["cpu_charged_s"] * 1e6
+    for k in KINDS:  # charged CPU, split the way the sampler saw it
+        if nSamp:
+            spent[k] += cpuUs * attrib.samples[k] / nSamp
+        elif k == "format":
+            spent[k] += cpuUs
+    rec = holder["out"].times
+    fresh, span = _latency(rec, convs)
+    with open(os.devnull, "w") as null:
+        mem = run.runScript(script, seconds, simcore.defaultBoard(seed),
+                            out=null, trace=True)
+    return {
+        "config": name,
+        "script": script,
+        "ended": r["ended"],
+        "error": r["error"],
+        "sim_s": r["sim_s"],
+        "wall_s": r["wall_s"],
+        "cpu_scale": cpuScale,
+        "records": len(rec),
+        "samples_per_s": {d.name: round(d.measurements / r["sim_s"], 4)
+                          for d in board.devices()
+                          if getattr(d, "measurements", 0)},
+        "window_ms": _stats([(b - a) / 1e3 for a, b in zip(rec, rec[1:])]),
+        "latency_ms": fresh,
+        "span_ms": span,
+        "time_s": {k: round(v / 1e6, 4) for k, v in spent.items()},
+        "time_frac": {k: round(v / simUs, 4) for k, v in spent.items()},
+        "published": r["published"],
+        "peak_bytes": mem["peak_bytes"],
+    }
+
+KEYS = (  # what --baseline compares: path into a result, bigger is
+    # better, and the smallest change that counts (noise floor)
+    (("records",), True, 1),
+    (("window_ms", "mean"), False, 5.0),
+    (("window_ms", "jitter_rms"), False, 5.0),
+    (("latency_ms", "mean"), False, 5.0),
+    (("time_frac", "display"), False, 0.005),
+    (("time_frac", "format"), False, 0.005),
+    (("peak_bytes",), False, 4096),
+)
+
+def _get(d, path):
+    for p in path:
+        if not isinstance(d, dict):
+            return None
+        d = d.get(p)
+    return d
+
+def compare(old, new):  # lines of "config metric old -> new (+x%)"
+    prev = {r["config"]: r for r in old["results"]}
+    lines = []
+    for r in new["results"]:
+        o = prev.get(r["config"])
+        if o is None:
+            continue
+        for path, up, floor in KEYS:
+            a, b = _get(o, path), _get(r, path)
+            if a is None or b is None or abs(b - a) < floor:
+                continue
+            ch = (b - a) / max(abs(a), floor) * 100
+            good = (ch > 0) == up
+            lines.append("# %-12s %-20s %10.4g -> %-10.4g %+6.1f%% %s"
+                         % (r["config"], ".".join(path), a, b, ch,
+                            "better" if good else "WORSE"))
+    return lines
+
+def main(argv):
+    ap = argparse.ArgumentParser(description="benchmark station scripts "
+                                 "on the simulator")
+    ap.add_argument("--out", default="bench.json", help="JSON results")
+    ap.add_argument("--only", action="append", default=[],
+                    help="run only this configuration (repeatable)")
+    ap.add_argument("--seconds", type=float,
+                    help="simulated seconds per run (default per config)")
+    ap.add_argument("--cpu-scale", type=float, default=40.0,
+                    help="RP2040 MicroPython time per host CPython time")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--baseline", help="earlier results to compare with")
+    ap.add_argument("--echo", action="store_true", help="show script output")
+    a = ap.parse_args(argv[1:])
+    results = []
+    for name, script, seconds in CONFIGS:
+        if a.only and name not in a.only:
+            continue
+        r = bench(name, script, a.seconds or seconds, a.cpu_scale, a.seed,
+                  sys.stdout if a.echo else None)
+        results.append(r)
+        w = r["window_ms"] or {}
+        lat = r["latency_ms"] or {}
+        sys.stderr.write(
+            "# %-12s %s: %d records, window %.0f ms +/- %.1f, latency %.0f "
+            "ms, display %.1f%% format %.1f%% sensor %.1f%%, peak %s B\n"
+            % (name, r["ended"], r["records"], w.get("mean", 0),
+               w.get("jitter_rms", 0), lat.get("mean", 0),
+               100 * r["time_frac"]["display"],
+               100 * r["time_frac"]["format"],
+               100 * r["time_frac"]["sensor"], r["peak_bytes"]))
+        if r["error"]:
+            sys.stderr.write("# %s error %s\n" % (name, r["error"]))
+    doc = {"cpu_scale": a.cpu_scale, "seed": a.seed, "results": results}
+    with open(a.out, "w") as fp:
+        json.dump(doc, fp, indent=1)
+    if a.baseline:
+        with open(a.baseline) as fp:
+            for line in compare(json.load(fp), doc):
+                sys.stderr.write(line + "\n")
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,311 @@
+"""
+# devices.py : simulated I2C devices for the host simulator
+# Each device answers raw I2C writes/reads the way the datasheet says, on
+# the simulated clock (simcore), so drivers and their timing run for real:
+#  - AHT10 / AHT2x (0x38): init / trigger / soft reset commands, busy bit
+#    for the ~75 ms conversion (80 ms AHT2x), 20-bit T and RH, CRC byte 7
+#    on AHT2x.
+#  - SHT3x (0x44): single-shot measurement, NACKs reads until the 15 ms
+#    conversion is done, CRC on each word, heater on/off warms the sensor.
+#  - TSD305 (0x00): EEPROM coefficient reads, ADC conversion (45 ms for
+#    0xAF, 20 ms for 0xAE), 24-bit object and ambient counts.
+#  - OLED (0x3c): SSD1306 or SH1106 command/data parser into display RAM;
+#    counts frames, render() gives the screen as text.
+# All sensors read one shared environment: slow sinusoidal drift plus a
+# per-device offset and noise. 'faults' holds injection rates used by
+# simcore.Bus: nack, crc, stuck (probability per transaction).
+# 19-Oct-2026
+
+# Usage Example:
+import simcore, devices
+b = simcore.Board()
+sht = b.bus(9, 8).add(devices.SHT3x("SHT31@9"))
+sht.faults["crc"] = 0.01   # 1% of reads get a bad CRC
+"""
+
+import math
+import struct
+
+import simcore
+
+def crc8(buf):  # Sensirion / Aosong CRC-8, poly 0x31, init 0xFF
+    crc = 0xff
+    for b in buf:
+        crc ^= b
+        for _ in range(8):
+            if crc & 0x80:
+                crc = ((crc << 1) ^ 0x31) & 0xff
+            else:
+                crc = (crc << 1) & 0xff
+    return crc
+
+class Env:  # the air all sensors sit in
+    tBase = 22.0
+    tSwing = 0.5          # degC, period tPeriod
+    tPeriod = 3600.0
+    rhBase = 45.0
+    rhSwing = 3.0
+
+    @classmethod
+    def at(cls, us):
+        ph = 2 * math.pi * us / 1e6 / cls.tPeriod
+        return (cls.tBase + cls.tSwing * math.sin(ph),
+                cls.rhBase - cls.rhSwing * math.sin(ph))
+
+class Device:
+    crcPos = ()           # byte offsets of CRCs in a full read, for faults
+
+    def __init__(self, name, addr, dT=0.0, noise=0.01):
+        self.name = name
+        self.addr = addr
+        self.dT = dT          # this sensor's offset from the air, degC
+        self.noise = noise    # degC rms
+        self.bus = None
+        self.faults = {}      # "nack" / "crc" / "stuck" -> probability
+        self.faultCount = {"nack": 0, "crc": 0, "stuck": 0}
+        self.txns = 0
+
+    def now(self):
+        return simcore.board.clock.us
+
+    def sample(self):  # (T, RH) this sensor sees now
+        T, RH = Env.at(self.now())
+        r = simcore.board.rand
+        return (T + self.dT + r.gauss(0, self.noise),
+                min(100.0, max(0.0, RH + r.gauss(0, self.noise * 5))))
+
+    def write(self, data):
+        pass
+
+    def read(self, n):
+        return b'\xff' * n
+
+    def stats(self):
+        d = {"txns": self.txns}
+        d.update(self.faultCount)
+        return d
+
+class AHT10(Device):
+    def __init__(self, name, addr=0x38, aht2x=False, **kw):
+        Device.__init__(self, name, addr, **kw)
+        self.aht2x = aht2x
+        self.convUs = 80_000 if aht2x else 75_000
+        self.calibrated = aht2x      # AHT2x ships calibrated
+        self.busyUntil = 0
+        self.data = bytes(5)
+        self.pending = None          # result of the running conversion
+        self.crcPos = (6,) if aht2x else ()
+        self.measurements = 0
+
+    def write(self, data):
+        c = data[0]
+        if c == 0xBA:                # soft reset
+            self.busyUntil = self.now() + 20_000
+            self.calibrated = self.aht2x
+        elif c in (0xE1, 0xBE):      # calibrate / initialize
+            self.calibrated = True
+            self.busyUntil = self.now() + 10_000
+        elif c == 0xAC:              # trigger measurement
+            self.busyUntil = self.now() + self.convUs
+            T, RH = self.sample()
+            h = int(RH / 100.0 * (1 << 20)) & 0xfffff
+            t = int((T + 50.0) / 200.0 * (1 << 20)) & 0xfffff
+            self.pending = bytes([h >> 12, (h >> 4) & 0xff,
+                                  ((h & 0xf) << 4) | (t >> 16),
+                                  (t >> 8) & 0xff, t & 0xff])
+            self.measurements += 1
+
+    def read(self, n):
+        busy = self.now() < self.busyUntil
+        if not busy and self.pending is not None:
+            self.data = self.pending
+            self.pending = None
+        status = ((0x80 if busy else 0) | (0x08 if self.calibrated else 0)
+                  | 0x10)
+        out = bytes([status]) + self.data
+        if self.aht2x:
+            out += bytes([crc8(out)])
+        return out[:n]
+
+class SHT3x(Device):
+    crcPos = (2, 5)
+
+    def __init__(self, name, addr=0x44, **kw):
+        Device.__init__(self, name, addr, **kw)
+        self.readyAt = None          # conversion in progress until then
+        self.data = None
+        self.heater = False
+        self.heat = 0.0              # degC the heater has added so far
+        self.tHeat = 0
+        self.measurements = 0
+
+    def _heat(self):  # first-order warm up / cool down, tau 10 s, +3 degC
+        now = self.now()
+        dt = (now - self.tHeat) / 1e6
+        self.tHeat = now
+        target = 3.0 if self.heater else 0.0
+        self.heat += (target - self.heat) * (1 - math.exp(-dt / 10.0))
+
+    def write(self, data):
+        cmd = (data[0] << 8) | data[1] if len(data) > 1 else data[0] << 8
+        self._heat()
+        if cmd in (0x2400, 0x2C06):            # single shot, high repeat
+            self.readyAt = self.now() + 15_000
+            T, RH = self.sample()
+            T += self.heat
+            RH = max(0.0, RH - 2.5 * self.heat)
+            t = min(65535, max(0, int((T + 45) / 175.0 * 65535)))
+            h = min(65535, max(0, int(RH / 100.0 * 65535)))
+            w1 = bytes([t >> 8, t & 0xff])
+            w2 = bytes([h >> 8, h & 0xff])
+            self.data = w1 + bytes([crc8(w1)]) + w2 + bytes([crc8(w2)])
+            self.measurements += 1
+        elif cmd == 0x30A2:                    # soft reset
+            self.heater = False
+            self.data = None
+            self.readyAt = None
+        elif cmd == 0x306D:
+            self.heater = True
+        elif cmd == 0x3066:
+            self.heater = False
+        elif cmd == 0xF32D:                    # status register
+            s = bytes([0x20 if self.heater else 0, 0x00])
+            self.data = s + bytes([crc8(s)])
+            self.readyAt = self.now()
+
+    def read(self, n):
+        if self.readyAt is None or self.data is None:
+            raise OSError(simcore.EIO)       # nothing to read: NACK
+        if self.now() < self.readyAt:
+            raise OSError(simcore.EIO)       # still converting: NACK
+        out = self.data
+        self.data = None
+        self.readyAt = None
+        return out[:n]
+
+class TSD305(Device):
+    def __init__(self, name, addr=0x00, **kw):
+        Device.__init__(self, name, addr, **kw)
+        self.ee = {0x1A: -20, 0x1B: 85, 0x1C: -20, 0x1D: 120, 0x2C: 0}
+        floats = {0x1E: 0.001, 0x20: 25.0, 0x22: 0.0, 0x24: 0.0,
+                  0x26: 0.0, 0x28: 1.0, 0x2A: 0.0, 0x2E: 0.0, 0x30: 0.0,
+                  0x32: 0.0, 0x34: 1.0, 0x36: 0.0}
+        for a, v in floats.items():
+            w = struct.unpack(">I", struct.pack(">f", v))[0]
+            self.ee[a] = w >> 16
+            self.ee[a + 1] = w & 0xffff
+        self.reg = None
+        self.busyUntil = 0
+        self.adc = bytes(6)
+        self.objT = 30.0             # what the IR sensor is looking at
+
+    def write(self, data):
+        c = data[0]
+        if c in (0xAF, 0xAE):        # start conversion, 16 / 8 averages
+            self.busyUntil = self.now() + (45_000 if c == 0xAF else 20_000)
+            amb = self.sample()[0]
+            a = int((amb + 20) / 105.0 * (1 << 24)) & 0xffffff
+            o = int((self.objT + 20) / 140.0 * (1 << 24)) & 0xffffff
+            self.adc = struct.pack(">I", o)[1:] + struct.pack(">I", a)[1:]
+            self.reg = None
+        else:
+            self.reg = c             # EEPROM word address
+
+    def read(self, n):
+        busy = self.now() < self.busyUntil
+        status = 0x40 | (0x20 if busy else 0)  # powered, busy
+        if self.reg is not None:
+            w = self.ee.get(self.reg, 0) & 0xffff
+            return bytes([status, w >> 8, w & 0xff])[:n]
+        return (bytes([status]) + self.adc)[:n]
+
+class OLED(Device):
+    ARGS = {0x20: 1, 0x21: 2, 0x22: 2, 0x81: 1, 0xA8: 1, 0xD3: 1, 0xD5: 1,
+            0xD9: 1, 0xDA: 1, 0xDB: 1, 0x8D: 1, 0xAD: 1}  # command: args
+
+    def __init__(self, name, addr=0x3c, sh1106=False, **kw):
+        Device.__init__(self, name, addr, **kw)
+        self.sh1106 = sh1106
+        self.cols = 132 if sh1106 else 128
+        self.ram = bytearray(8 * self.cols)
+        self.page = 0
+        self.col = 0
+        self.colWin = (0, 127)
+        self.pageWin = (0, 7)
+        self.on = False
+        self.frames = 0             # data writes of a full page or more
+        self.bytesIn = 0
+        self._cmd = []
+
+    def _command(self, c):
+        if self._cmd:
+            self._cmd.append(c)
+        elif c in self.ARGS:
+            self._cmd = [c]
+        else:
+            self._single(c)
+            return
+        if len(self._cmd) == self.ARGS[self._cmd[0]] + 1:
+            a = self._cmd
+            self._cmd = []
+            if a[0] == 0x21:
+                self.colWin = (a[1], a[2])
+                self.col = a[1]
+            elif a[0] == 0x22:
+                self.pageWin = (a[1], a[2])
+                self.page = a[1]
+
+    def _single(self, c):
+        if c in (0xAE, 0xAF):
+            self.on = c == 0xAF
+        elif 0xB0 <= c <= 0xB7:             # page address (SH1106 mode)
+            self.page = c & 7
+        elif c < 0x10:
+            self.col = (self.col & 0xf0) | c
+        elif c < 0x20:
+            self.col = (self.col & 0x0f) | ((c & 0x0f) << 4)
+
+    def _data(self, buf):
+        for b in buf:
+            if self.col < self.cols:
+                self.ram[self.page * self.cols + self.col] = b
+            self.col += 1
+            if not self.sh1106 and self.col > self.colWin[1]:
+                self.col = self.colWin[0]
+                self.page += 1
+                if self.page > self.pageWin[1]:
+                    self.page = self.pageWin[0]
+        if len(buf) >= 128:
+            self.frames += 1
+
+    def write(self, data):
+        self.bytesIn += len(data)
+        i = 0
+        while i < len(data):
+            ctl = data[i]
+            i += 1
+            if ctl & 0x40:                  # data, to the end
+                self._data(data[i:])
+                return
+            if ctl & 0x80:                  # one command byte, more follow
+                if i < len(data):
+                    self._command(data[i])
+                i += 1
+            else:                           # commands to the end
+                for c in data[i:]:
+                    self._command(c)
+                return
+
+    def render(self):  # the screen as 64 lines of '#' and ' '
+        x0 = 2 if self.sh1106 else 0
+        lines = []
+        for y in range(64):
+            row = self.ram[(y >> 3) * self.cols:((y >> 3) + 1) * self.cols]
+            lines.append("".join("#" if row[x0 + x] >> (y & 7) & 1 else " "
+                                 for x in range(128)))
+        return "\n".join(lines)
+
+    def stats(self):
+        d = Device.stats(self)
+        d["frames"] = self.frames
+        return d
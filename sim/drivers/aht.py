@@ -0,0 +1,64 @@
+"""
+# aht.py : stand-in for github.com/etno712/aht (AHT2x with optional CRC)
+# Used by the simulator only when the real driver is not on the path.
+# Each humidity or temperature read runs one measurement: trigger, wait
+# 80 ms, poll busy, read 6 bytes (7 with crc=True and check the CRC). A
+# bad CRC is retried once, then raises OSError so callers see a bus error.
+# 19-Oct-2026
+"""
+
+import time
+
+class AHT2x:
+    def __init__(self, i2c, address=0x38, crc=False):
+        self._i2c = i2c
+        self._address = address
+        self._crc = crc
+        self._buf = bytearray(7 if crc else 6)
+        time.sleep_ms(40)
+        if not self.is_calibrated:
+            self._i2c.writeto(self._address, b'\xbe\x08\x00')
+            time.sleep_ms(10)
+
+    @property
+    def is_calibrated(self):
+        return bool(self._status() & 0x08)
+
+    def _status(self):
+        return self._i2c.readfrom(self._address, 1)[0]
+
+    @staticmethod
+    def _crc8(buf, n):
+        crc = 0xff
+        for i in range(n):
+            crc ^= buf[i]
+            for _ in range(8):
+                if crc & 0x80:
+                    crc = ((crc << 1) ^ 0x31) & 0xff
+                else:
+                    crc = (crc << 1) & 0xff
+        return crc
+
+    def _measure(self):
+        for attempt in range(2):
+            self._i2c.writeto(self._address, b'\xac\x33\x00')
+            time.sleep_ms(80)
+            while self._status() & 0x80:
+                time.sleep_ms(5)
+            self._i2c.readfrom_into(self._address, self._buf)
+            if not self._crc or self._crc8(self._buf, 6) == self._buf[6]:
+                return
+        raise OSError(5)  # CRC error twice
+
+    @property
+    def humidity(self):
+        self._measure()
+        b = self._buf
+        return ((b[1] << 12) | (b[2] << 4) | (b[3] >> 4)) * 100 / 0x100000
+
+    @property
+    def temperature(self):
+        self._measure()
+        b = self._buf
+        return ((((b[3] & 0xf) << 16) | (b[4] << 8) | b[5]) * 200.0
+                / 0x100000 - 50)
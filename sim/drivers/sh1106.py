@@ -0,0 +1,86 @@
+"""
+# sh1106.py : stand-in for github.com/robert-hh/SH1106 (I2C only)
+# Used by the simulator only when the real driver is not on the path.
+# Same constructor and calls the scripts use; show() sends the same page
+# by page traffic (3 command bytes + 128 data bytes per page).
+# 19-Oct-2026
+"""
+
+import time
+import framebuf
+
+class SH1106(framebuf.FrameBuffer):
+    def __init__(self, width, height, external_vcc, rotate=0):
+        self.width = width
+        self.height = height
+        self.external_vcc = external_vcc
+        self.rotate = rotate
+        self.pages = height // 8
+        self.bufsize = self.pages * width
+        self.renderbuf = bytearray(self.bufsize)
+        self.pages_to_update = 0
+        super().__init__(self.renderbuf, width, height, framebuf.MONO_VLSB)
+        self.init_display()
+
+    def init_display(self):
+        self.reset()
+        self.fill(0)
+        self.show()
+        self.poweron()
+
+    def poweroff(self):
+        self.write_cmd(0xAE)
+
+    def poweron(self):
+        self.write_cmd(0xAF)
+
+    def sleep(self, value):
+        self.write_cmd(0xAE | (not value))
+
+    def contrast(self, contrast):
+        self.write_cmd(0x81)
+        self.write_cmd(contrast)
+
+    def invert(self, invert):
+        self.write_cmd(0xA6 | (invert & 1))
+
+    def text(self, text, x, y, color=1):
+        super().text(text, x, y, color)
+
+    def show(self, full_update=False):
+        for page in range(self.pages):
+            self.write_cmd(0xB0 | page)
+            self.write_cmd(0x02)            # column 2 = first visible
+            self.write_cmd(0x10)
+            self.write_data(self.renderbuf[self.width * page:
+                                           self.width * (page + 1)])
+
+    def reset(self, res=None):
+        if res is not None:
+            res(1)
+            time.sleep_ms(1)
+            res(0)
+            time.sleep_ms(20)
+            res(1)
+            time.sleep_ms(20)
+
+class SH1106_I2C(SH1106):
+    def __init__(self, width, height, i2c, res=None, addr=0x3c, rotate=0,
+                 external_vcc=False, delay=0):
+        self.i2c = i2c
+        self.addr = addr
+        self.res = res
+        self.temp = bytearray(2)
+        self.delay = delay
+        super().__init__(width, height, external_vcc, rotate)
+
+    def write_cmd(self, cmd):
+        self.temp[0] = 0x80
+        self.temp[1] = cmd
+        self.i2c.writeto(self.addr, self.temp)
+
+    def write_data(self, buf):
+        self.i2c.writeto(self.addr, b'\x40' + buf)
+
+    def reset(self, res=None):
+        super().reset(self.res if res is None else res)
@@ -0,0 +1,172 @@
+"""
+# run.py : run a Pico script unmodified on the host against simulated devices
+# Puts the machine/utime/micropython/framebuf/network shims first on the
+# path, the repo next, and stand-in drivers (ahtx0, aht, sh1106) last so a
+# real driver copied into the repo wins. Patches time and gc onto the
+# simulated clock (simcore), runs the script in a scratch 'flash'
+# directory, and stops it after --seconds of simulated time. A summary of
+# simulated vs wall time and per-device bus traffic goes to stderr.
+# 19-Oct-2026
+
+# Usage:
+#   python sim/run.py AHT10-OLED.py --seconds 120
+#   python sim/run.py AHT10_SHT31_OLED.py --seconds 600 \
+#       --fault SHT31@9:crc=0.01 --fault AHT10@13:stuck=0.001
+#   python sim/run.py PWM-SH1106.py --seconds 20 --press 22:2000:1500
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import runpy
+import shutil
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO = os.path.dirname(HERE)
+SHIMS = os.path.join(HERE, "shims")
+DRIVERS = os.path.join(HERE, "drivers")
+
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
+
+import simcore   # noqa: E402
+
+def _setPath():
+    for p in (SHIMS, REPO, DRIVERS):
+        while p in sys.path:
+            sys.path.remove(p)
+    sys.path.insert(0, REPO)
+    sys.path.insert(0, SHIMS)
+    sys.path.append(DRIVERS)
+
+def _purge():  # forget modules from an earlier run: fresh module state
+    for name, m in list(sys.modules.items()):
+        f = getattr(m, "__file__", None) or ""
+        if f.startswith(REPO) and name not in ("simcore", "devices", "run",
+                                                 "bench"):
+            del sys.modules[name]
+
+SECRETS = {"ssid": "simnet", "password": "simpass", "mqtt_server": "broker",
+           "client_id": "pico-sim"}
+
+def runScript(script, seconds=60.0, board=None, faults=(), presses=(),
+              cpuScale=0.0, flash=None, out=None, hooks=None, trace=False):
+    # run one script; returns a summary dict. hooks(board) is called after
+    # the clock is installed, to schedule events or change the board.
+    import devices  # noqa: F401  (defaultBoard needs it on the path)
+    board = board or simcore.defaultBoard()
+    _setPath()
+    _purge()
+    simcore.install(board, seconds=seconds, cpuScale=cpuScale)
+    for name, f in faults:
+        board.device(name).faults.update(f)
+    for gpio, atMs, holdMs in presses:
+        board.press(gpio, atMs, holdMs)
+    if hooks is not None:
+        hooks(board)
+    scratch = flash or tempfile.mkdtemp(prefix="simflash")
+    if not os.path.exists(os.path.join(scratch, "secrets.json")):
+        with open(os.path.join(scratch, "secrets.json"), "w") as fp:
+            json.dump(SECRETS, fp)
+    path = os.path.join(REPO, script) if not os.path.isabs(script) else script
+    cwd = os.getcwd()
+    ended = "running"
+    err = None
+    tWall = time.perf_counter()
+    if trace:
+        import tracemalloc
+        tracemalloc.start()
+    try:
+        os.chdir(scratch)
+        with contextlib.redirect_stdout(out or sys.stdout):
+            runpy.run_path(path, run_name="__main__")
+        ended = "exit"
+    except simcore.SimDone:
+        ended = "time"
+    except simcore.SimReset:
+        ended = "reset"
+    except SystemExit:
+        ended = "exit"
+    except Exception as e:   # report it, the summary still matters
+        ended = "error"
+        err = "%s: %s" % (type(e).__name__, e)
+    finally:
+        os.chdir(cwd)
+        simcore.uninstall()
+        peak = None
+        if trace:
+            import tracemalloc
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        if flash is None:
+            shutil.rmtree(scratch, ignore_errors=True)
+    clk = board.clock
+    return {
+        "script": script,
+        "ended": ended,
+        "error": err,
+        "sim_s": clk.us / 1e6,
+        "wall_s": time.perf_counter() - tWall,
+        "cpu_charged_s": clk.cpuUs / 1e6,
+        "peak_bytes": peak,
+        "published": board.published,
+        "resets": board.resets,
+        "buses": {"%d/%d" % k: {"txns": b.txns, "busy_s": b.busyUs / 1e6,
+                                "recovery_clocks": b.clocks,
+                                "edge_errors": b.edgeErrors}
+                  for k, b in sorted(board.buses.items())},
+        "devices": {d.name: d.stats() for d in board.devices()},
+    }
+
+def _press(s):  # "GPIO:AT_MS:HOLD_MS"
+    g, a, h = s.split(":")
+    return (int(g), int(a), int(h))
+
+def main(argv):
+    ap = argparse.ArgumentParser(description="run a Pico script on the host")
+    ap.add_argument("script")
+    ap.add_argument("--seconds", type=float, default=60.0,
+                    help="simulated run time")
+    ap.add_argument("--fault", action="append", default=[],
+                    help="DEVICE:nack=p,crc=p,stuck=p (repeatable)")
+    ap.add_argument("--press", action="append", type=_press, default=[],
+                    help="button GPIO:AT_MS:HOLD_MS (repeatable)")
+    ap.add_argument("--cpu-scale", type=float, default=0.0,
+                    help="charge host CPU time x this as Pico time")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--flash", help="keep files the script writes here")
+    ap.add_argument("--quiet", action="store_true", help="drop script output")
+    ap.add_argument("--show", action="store_true",
+                    help="print the OLED screens at the end")
+    ap.add_argument("--json", action="store_true", help="summary as JSON")
+    a = ap.parse_args(argv[1:])
+    if a.flash:
+        os.makedirs(a.flash, exist_ok=True)
+    board = simcore.defaultBoard(a.seed)
+    out = open(os.devnull, "w") if a.quiet else None
+    r = runScript(a.script, a.seconds, board, simcore.parseFaults(a.fault),
+                  a.press, a.cpu_scale, a.flash, out)
+    if a.show:
+        for d in board.devices():
+            if hasattr(d, "render") and d.frames:
+                sys.stderr.write("# %s, %d frames\n%s\n"
+                                 % (d.name, d.frames, d.render()))
+    if a.json:
+        sys.stderr.write(json.dumps(r, indent=1) + "\n")
+        return
+    sys.stderr.write("# sim %s: ended by %s after %.1f s simulated, %.1f s "
+                     "wall\n" % (r["script"], r["ended"], r["sim_s"],
+                                 r["wall_s"]))
+    if r["error"]:
+        sys.stderr.write("# sim error %s\n" % r["error"])
+    for name, st in r["devices"].items():
+        if st["txns"]:
+            sys.stderr.write("# sim %-12s %s\n" % (name, " ".join(
+                "%s=%d" % kv for kv in st.items())))
+
+if __name__ == "__main__":
+    main(sys.argv)
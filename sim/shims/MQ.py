@@ -0,0 +1,49 @@
+"""
+# MQ.py : host stand-in for the custom wifi + MQTT helper the station uses
+# initWLAN() starts the (simulated) WLAN and waits for it like the real
+# helper; mqtt_connect() returns a client whose publish() costs a few ms
+# of simulated time and fails with ECONNRESET while board.brokerUp is off.
+# 19-Oct-2026
+"""
+
+import simcore
+import network
+
+class Client:
+    def __init__(self):
+        self.connected = True
+
+    def publish(self, topic, msg, retain=False, qos=0):
+        b = simcore.board
+        if not (b.brokerUp and network.WLAN().isconnected()):
+            self.connected = False
+            raise OSError(104)
+        b.clock.advance(3000 + len(msg) * 2)
+        b.published += 1
+        b.pubBytes += len(msg)
+
+    def disconnect(self):
+        self.connected = False
+
+class MQTTobject:
+    def __init__(self):
+        self.wlan = network.WLAN(network.STA_IF)
+        self.client = None
+
+    def initWLAN(self, secrets, waitS=10):
+        self.wlan.active(True)
+        self.wlan.connect(secrets.get("ssid"), secrets.get("password"))
+        b = simcore.board
+        for i in range(waitS * 10):
+            if self.wlan.isconnected():
+                return True
+            b.clock.advance(100_000)
+        raise OSError(110)
+
+    def mqtt_connect(self, secrets):
+        b = simcore.board
+        b.clock.advance(50_000)
+        if not (b.brokerUp and self.wlan.isconnected()):
+            raise OSError(113)
+        self.client = Client()
+        return self.client
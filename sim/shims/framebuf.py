@@ -0,0 +1,128 @@
+"""
+# framebuf.py : host stand-in for MicroPython's framebuf (MONO_VLSB only)
+# Enough for the OLED drivers: pixel, fill, fill_rect, rect, hline, vline,
+# line, text, scroll, blit on a byte-per-8-rows buffer, so show() sends
+# the same bytes the real module would. text() uses a blocky stand-in
+# glyph (the real 8x8 font is in firmware) and keeps the strings drawn in
+# 'texts' for tests to look at. framebuf is C in the firmware, so the host
+# time spent in these Python loops is not charged to the script (cpuScale).
+# 19-Oct-2026
+"""
+
+import simcore
+
+def _firmware(fn):  # run fn without charging its host CPU time
+    def call(*args):
+        clk = simcore.board.clock
+        clk.charge()
+        try:
+            return fn(*args)
+        finally:
+            clk.rest()
+    return call
+
+MONO_VLSB = 0
+MONO_HLSB = 3
+MONO_HMSB = 4
+RGB565 = 1
+GS2_HMSB = 5
+GS4_HMSB = 2
+GS8 = 6
+
+class FrameBuffer:
+    def __init__(self, buf, width, height, format=MONO_VLSB, stride=None):
+        self.buf = buf
+        self.width = width
+        self.height = height
+        self.format = format
+        self.texts = []         # (x, y, string) drawn since the last fill()
+
+    def _pixel(self, x, y, c=None):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return 0 if c is None else None
+        i = (y >> 3) * self.width + x
+        bit = 1 << (y & 7)
+        if c is None:
+            return 1 if self.buf[i] & bit else 0
+        if c:
+            self.buf[i] |= bit
+        else:
+            self.buf[i] &= ~bit & 0xff
+
+    def _fill(self, c):
+        v = 0xff if c else 0
+        for i in range(len(self.buf)):
+            self.buf[i] = v
+        self.texts = []
+
+    def _fill_rect(self, x, y, w, h, c):
+        for yy in range(max(0, y), min(self.height, y + h)):
+            for xx in range(max(0, x), min(self.width, x + w)):
+                self._pixel(xx, yy, c)
+
+    def _rect(self, x, y, w, h, c, f=False):
+        if f:
+            return self._fill_rect(x, y, w, h, c)
+        self._hline(x, y, w, c)
+        self._hline(x, y + h - 1, w, c)
+        self._vline(x, y, h, c)
+        self._vline(x + w - 1, y, h, c)
+
+    def _hline(self, x, y, w, c):
+        for xx in range(x, x + w):
+            self._pixel(xx, y, c)
+
+    def _vline(self, x, y, h, c):
+        for yy in range(y, y + h):
+            self._pixel(x, yy, c)
+
+    def _line(self, x1, y1, x2, y2, c):  # Bresenham
+        dx = abs(x2 - x1)
+        dy = -abs(y2 - y1)
+        sx = 1 if x1 < x2 else -1
+        sy = 1 if y1 < y2 else -1
+        err = dx + dy
+        while True:
+            self._pixel(x1, y1, c)
+            if x1 == x2 and y1 == y2:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x1 += sx
+            if e2 <= dx:
+                err += dx
+                y1 += sy
+
+    def _text(self, s, x, y, c=1):
+        s = str(s)
+        self.texts.append((x, y, s))
+        for k, ch in enumerate(s):
+            if ch != " ":       # stand-in glyph: a 5x7 box
+                self._rect(x + 8 * k + 1, y, 5, 7, c)
+
+    def _scroll(self, dx, dy):
+        old = bytearray(self.buf)
+        get = FrameBuffer(old, self.width, self.height)._pixel
+        for y in range(self.height):
+            for x in range(self.width):
+                v = get(x - dx, y - dy)
+                self._pixel(x, y, v or 0)
+
+    def _blit(self, fb, x, y, key=-1, palette=None):
+        for yy in range(fb.height):
+            for xx in range(fb.width):
+                v = fb._pixel(xx, yy)
+                if v != key:
+                    self._pixel(x + xx, y + yy, v)
+
+    pixel = _firmware(_pixel)
+    fill = _firmware(_fill)
+    fill_rect = _firmware(_fill_rect)
+    rect = _firmware(_rect)
+    hline = _firmware(_hline)
+    vline = _firmware(_vline)
+    line = _firmware(_line)
+    text = _firmware(_text)
+    scroll = _firmware(_scroll)
+    blit = _firmware(_blit)
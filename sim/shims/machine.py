@@ -0,0 +1,261 @@
+"""
+# machine.py : host stand-in for MicroPython's machine module (RP2040)
+# Pin, I2C, SoftI2C, ADC, PWM, RTC, Timer, reset() and friends on top of
+# the simulated board and clock in simcore. I2C transfers go to the
+# simulated devices on the bus with the same (scl, sda) GPIOs and take
+# the time the clock frequency says. Timer callbacks run from the clock,
+# between script statements that touch time, like soft IRQs.
+# 19-Oct-2026
+
+# Usage Example:
+# (imported by scripts run under sim/run.py, not directly)
+from machine import Pin, I2C
+i2c = I2C(1, sda=Pin(18), scl=Pin(19), freq=400_000)
+"""
+
+import simcore
+
+I2C_DEFAULT = {0: (9, 8), 1: (7, 6)}  # id -> (scl, sda) when not given
+
+class Pin:
+    IN = 0
+    OUT = 1
+    OPEN_DRAIN = 2
+    ALT = 3
+    PULL_UP = 1
+    PULL_DOWN = 2
+    IRQ_FALLING = 1
+    IRQ_RISING = 2
+
+    def __init__(self, id, mode=-1, pull=-1, value=None):
+        self.id = id
+        self.mode = self.IN
+        self.pull = None
+        self.out = 0
+        self.init(mode, pull, value)
+
+    def init(self, mode=-1, pull=-1, value=None):
+        if mode != -1:
+            self.mode = mode
+        if pull != -1:
+            self.pull = pull
+        if value is not None:
+            self.value(value)
+
+    def value(self, v=None):
+        b = simcore.board
+        if v is None:
+            if self.mode == self.OUT:
+                return self.out
+            bus = b.busForPin(self.id, 1)
+            if bus is not None and bus.stuck:
+                return 0        # a slave holds SDA low
+            if self.mode == self.OPEN_DRAIN and self.out == 0:
+                return 0
+            return b.pins.get(self.id, 1 if self.pull != self.PULL_DOWN
+                              else 0)
+        v = 1 if v else 0
+        if self.mode == self.OPEN_DRAIN and v == 1 and self.out == 0:
+            bus = b.busForPin(self.id, 0)
+            if bus is not None:
+                bus.sclClock()  # a released SCL completes a clock pulse
+        self.out = v
+        b.clock.advance(1)
+        return None
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    def toggle(self):
+        self.value(1 - self.out)
+
+    def __call__(self, v=None):
+        return self.value(v)
+
+    def irq(self, handler=None, trigger=3, hard=False):
+        simcore.board.irqs[self.id] = (handler, trigger, self)
+
+def _pinId(p):
+    return p.id if isinstance(p, Pin) else p
+
+class I2C:
+    soft = False
+
+    def __init__(self, id=0, scl=None, sda=None, freq=400_000, timeout=None):
+        if scl is None or sda is None:
+            scl, sda = I2C_DEFAULT[id]
+        self.init(scl, sda, freq)
+
+    def init(self, scl, sda, freq=400_000):
+        self.scl = _pinId(scl)
+        self.sda = _pinId(sda)
+        self.freq = freq
+        self.bus = simcore.board.bus(self.scl, self.sda)
+
+    def _xfer(self, addr, data, n):
+        return self.bus.transfer(addr, data, n, self.freq, self.soft)
+
+    def scan(self):
+        found = []
+        for a in range(0x08, 0x78):
+            try:
+                self._xfer(a, b'', 0)
+                found.append(a)
+            except OSError:
+                pass
+        return found
+
+    def writeto(self, addr, buf, stop=True):
+        self._xfer(addr, bytes(buf), 0)
+        return len(buf) + 1
+
+    def writevto(self, addr, vector, stop=True):
+        data = b''.join(bytes(v) for v in vector)
+        self._xfer(addr, data, 0)
+        return len(data) + 1
+
+    def readfrom(self, addr, nbytes, stop=True):
+        return self._xfer(addr, b'', nbytes)
+
+    def readfrom_into(self, addr, buf, stop=True):
+        buf[:] = self._xfer(addr, b'', len(buf))
+
+    def writeto_mem(self, addr, memaddr, buf, addrsize=8):
+        self._xfer(addr, bytes([memaddr]) + bytes(buf), 0)
+
+    def readfrom_mem(self, addr, memaddr, nbytes, addrsize=8):
+        self._xfer(addr, bytes([memaddr]), 0)
+        return self._xfer(addr, b'', nbytes)
+
+    def readfrom_mem_into(self, addr, memaddr, buf, addrsize=8):
+        buf[:] = self.readfrom_mem(addr, memaddr, len(buf))
+
+class SoftI2C(I2C):
+    soft = True
+
+    def __init__(self, scl, sda, freq=400_000, timeout=50_000):
+        self.init(scl, sda, freq)
+
+class ADC:
+    CORE_TEMP = 4
+
+    def __init__(self, pin):
+        p = _pinId(pin)
+        self.ch = p - 26 if p >= 26 else p  # GPIO26..29 = channels 0..3
+
+    def read_u16(self):
+        b = simcore.board
+        b.clock.advance(2)          # 500 ksps
+        x = b.adc.get(self.ch, 0.0) / 3.3 * 65535
+        x += b.rand.gauss(0, b.adcNoise)
+        return min(65535, max(0, int(x))) & 0xfff0  # 12 bits, left aligned
+
+class PWM:
+    def __init__(self, pin, freq=None, duty_u16=None):
+        self.pin = _pinId(pin)
+        self._freq = freq or 1000
+        self._duty = duty_u16 or 0
+
+    def freq(self, f=None):
+        if f is None:
+            return self._freq
+        self._freq = int(f)
+
+    def duty_u16(self, d=None):
+        if d is None:
+            return self._duty
+        self._duty = int(d)
+
+    def duty_ns(self, ns=None):
+        period = 1e9 / self._freq
+        if ns is None:
+            return int(self._duty / 65535 * period)
+        self._duty = int(ns / period * 65535)
+
+    def deinit(self):
+        self._duty = 0
+
+class RTC:
+    _offset = 0     # seconds the RTC was set away from simulated time
+
+    def datetime(self, dt=None):
+        import time
+        if dt is None:
+            tm = time.gmtime(time.time() + RTC._offset)
+            return (tm[0], tm[1], tm[2], tm[6], tm[3], tm[4], tm[5], 0)
+        import calendar
+        t = calendar.timegm((dt[0], dt[1], dt[2], dt[4], dt[5], dt[6], 0, 0,
+                             0))
+        RTC._offset = t - time.time()
+
+class Timer:
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id=-1, mode=PERIODIC, period=-1, freq=-1,
+                 callback=None, tick_hz=1000):
+        self.gen = 0
+        if callback is not None:
+            self.init(mode=mode, period=period, freq=freq, callback=callback,
+                      tick_hz=tick_hz)
+
+    def init(self, mode=PERIODIC, period=-1, freq=-1, callback=None,
+             tick_hz=1000):
+        self.deinit()
+        if freq > 0:
+            self.periodUs = int(1e6 / freq)
+        else:
+            self.periodUs = int(period * 1e6 / tick_hz)
+        self.mode = mode
+        self.callback = callback
+        self._schedule(self.gen, simcore.board.clock.us)
+
+    def _schedule(self, gen, base):
+        clk = simcore.board.clock
+        due = base + max(1, self.periodUs)
+
+        def fire():
+            if gen != self.gen:
+                return              # deinit() or init() since
+            if self.mode == Timer.PERIODIC:
+                self._schedule(gen, due)  # no drift from late callbacks
+            self.callback(self)
+        clk.at(due, fire)
+
+    def deinit(self):
+        self.gen += 1
+
+def reset():
+    simcore.board.resets += 1
+    raise simcore.SimReset()
+
+soft_reset = reset
+
+def freq(hz=None):
+    return 125_000_000
+
+def unique_id():
+    return b'\xe6\x61\x41\x04\x03\x5c\x2b\x22'
+
+def idle():  # wait for the next interrupt: timer, or the 1 ms tick
+    clk = simcore.board.clock
+    clk.now()
+    due = clk.nextDue()
+    step = 1000 - clk.us % 1000
+    if due is not None and due - clk.us < step:
+        step = max(1, due - clk.us)
+    clk.advance(step)
+
+def lightsleep(ms=None):
+    simcore.board.clock.advance((ms or 0) * 1000)
+
+deepsleep = lightsleep
+
+def disable_irq():
+    return 0
+
+def enable_irq(state=0):
+    pass
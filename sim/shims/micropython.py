@@ -0,0 +1,35 @@
+"""
+# micropython.py : host stand-in for the micropython module
+# Code emitters are plain Python here; const() is the identity.
+# 19-Oct-2026
+"""
+
+import gc
+
+def const(x):
+    return x
+
+def native(fn):
+    return fn
+
+def viper(fn):
+    return fn
+
+def opt_level(level=None):
+    return 0
+
+def alloc_emergency_exception_buf(size):
+    pass
+
+def schedule(fn, arg):
+    fn(arg)
+
+def mem_info(verbose=False):
+    print("stack: 0 out of 7936\nGC: total: %d, used: %d, free: %d"
+          % (gc.mem_alloc() + gc.mem_free(), gc.mem_alloc(), gc.mem_free()))
+
+def heap_lock():
+    pass
+
+def heap_unlock():
+    return 0
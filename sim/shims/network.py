@@ -0,0 +1,50 @@
+"""
+# network.py : host stand-in for the Pico W network module
+# WLAN comes up wifiDelayMs after connect() if simcore.board.wifiUp is
+# set; clearing wifiUp later drops the link.
+# 19-Oct-2026
+"""
+
+import simcore
+
+STA_IF = 0
+AP_IF = 1
+STAT_IDLE = 0
+STAT_CONNECTING = 1
+STAT_GOT_IP = 3
+
+class WLAN:
+    _upAt = None        # shared by all WLAN objects, like the one radio
+
+    def __init__(self, iface=STA_IF):
+        self.iface = iface
+        self._active = False
+
+    def active(self, a=None):
+        if a is None:
+            return self._active
+        self._active = bool(a)
+
+    def connect(self, ssid=None, key=None):
+        b = simcore.board
+        WLAN._upAt = b.clock.now() + b.wifiDelayMs * 1000
+
+    def disconnect(self):
+        WLAN._upAt = None
+
+    def isconnected(self):
+        b = simcore.board
+        return (b.wifiUp and WLAN._upAt is not None
+                and b.clock.now() >= WLAN._upAt)
+
+    def status(self, param=None):
+        if self.isconnected():
+            return STAT_GOT_IP
+        return STAT_CONNECTING if WLAN._upAt is not None else STAT_IDLE
+
+    def ifconfig(self, cfg=None):
+        return ("192.168.1.50", "255.255.255.0", "192.168.1.1",
+                "192.168.1.1")
+
+    def config(self, *a, **k):
+        return None
@@ -0,0 +1,26 @@
+"""
+# ntptime.py : host stand-in for MicroPython's ntptime
+# time() answers the simulated UNIX time (plus board.ntpErrMs) after a
+# 30 ms round trip, or raises OSError when the network is down.
+# 19-Oct-2026
+"""
+
+import simcore
+
+host = "pool.ntp.org"
+timeout = 1
+
+def time():
+    import network
+    b = simcore.board
+    if not network.WLAN().isconnected():
+        b.clock.advance(timeout * 1_000_000)
+        raise OSError(110)
+    b.clock.advance(30_000)
+    return (b.epochUs() // 1000 + b.ntpErrMs) // 1000
+
+def settime():
+    import machine, time as _t
+    tm = _t.gmtime(time())
+    machine.RTC().datetime((tm[0], tm[1], tm[2], tm[6] + 1, tm[3], tm[4],
+                            tm[5], 0))
@@ -0,0 +1,6 @@
+"""
+# ujson.py : host stand-in for MicroPython's ujson
+# 19-Oct-2026
+"""
+
+from json import dump, dumps, load, loads   # noqa: F401
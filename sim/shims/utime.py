@@ -0,0 +1,9 @@
+"""
+# utime.py : host stand-in for MicroPython's utime, on the simulated clock
+# The same functions simcore.install() puts into the time module.
+# 19-Oct-2026
+"""
+
+from time import *                        # noqa: F401,F403 (patched)
+from time import (ticks_ms, ticks_us, ticks_cpu, ticks_diff, ticks_add,
+                  sleep, sleep_ms, sleep_us, time, localtime, gmtime)
@@ -0,0 +1,354 @@
+"""
+# simcore.py : virtual clock, I2C buses and board model for the host simulator
+# Everything the machine/utime shims need to share lives here:
+#  - Clock: simulated microseconds. sleep()s and bus transfers advance it;
+#    Timer callbacks and scheduled events (button presses) fire as it
+#    passes their due time. With cpuScale > 0 host CPU time spent in the
+#    script between simulator calls is charged too, times cpuScale, as a
+#    rough stand-in for how much slower MicroPython runs on the RP2040.
+#  - Bus: one I2C bus, found by its (scl, sda) GPIO numbers, with devices
+#    by address, transfer timing from the clock frequency, stuck-SDA state
+#    and per-device counters.
+#  - Board: all buses, ADC inputs, pins, network state.
+# install() patches the CPython time and gc modules with MicroPython-style
+# functions (ticks_ms, sleep_ms, mem_alloc ...) on top of this clock.
+# 19-Oct-2026
+
+# Usage Example:
+import simcore, devices
+board = simcore.defaultBoard()
+simcore.install(board, seconds=600)
+# ... run a script; a SimDone exception ends it at 600 s simulated time
+"""
+
+import gc
+import heapq
+import random
+import time as _time
+import tracemalloc
+
+EPOCH0 = 1_792_000_000   # simulated UNIX time at t=0 (Oct 2026)
+SOFT_MAX_HZ = 700_000    # fastest clock a bit-banged SoftI2C reaches
+HEAP = 192 * 1024        # pretend MicroPython heap size, for mem_free()
+
+EIO = 5
+ETIMEDOUT = 110
+
+class SimDone(BaseException):  # simulated time limit reached
+    pass
+
+class SimReset(BaseException):  # the script called machine.reset()
+    pass
+
+class Clock:
+    def __init__(self, seconds=None, cpuScale=0.0):
+        self.us = 0                 # simulated time
+        self.limitUs = None if seconds is None else int(seconds * 1e6)
+        self.cpuScale = cpuScale    # host CPU time -> simulated time factor
+        self.events = []            # heap of (dueUs, seq, fn)
+        self.seq = 0
+        self.inIrq = False          # no nested callbacks, like the RP2040
+        self.cpuUs = 0              # simulated us charged for host CPU
+        self.account = None         # fn(us): told of every wait, for bench
+        self.tHost = _time.perf_counter()
+
+    def charge(self):  # add script CPU time since the last simulator call
+        t = _time.perf_counter()
+        if self.cpuScale > 0:
+            d = int((t - self.tHost) * 1e6 * self.cpuScale)
+            self.us += d
+            self.cpuUs += d
+        self.tHost = t
+
+    def rest(self):  # simulator work is not charged as script CPU time
+        self.tHost = _time.perf_counter()
+
+    def now(self):
+        self.charge()
+        self._run(self.us)
+        self.rest()
+        return self.us
+
+    def at(self, dueUs, fn):  # call fn() when the clock reaches dueUs
+        self.seq += 1
+        heapq.heappush(self.events, (dueUs, self.seq, fn))
+
+    def nextDue(self):
+        return self.events[0][0] if self.events else None
+
+    def _run(self, target):  # fire everything due up to target
+        if self.inIrq:
+            return
+        while self.events and self.events[0][0] <= target:
+            due, _, fn = heapq.heappop(self.events)
+            self.inIrq = True
+            try:
+                fn()
+            finally:
+                self.inIrq = False
+            self._check()
+
+    def _check(self):
+        if self.limitUs is not None and self.us >= self.limitUs:
+            raise SimDone()
+
+    def advance(self, us):  # let us microseconds pass
+        self.charge()
+        target = self.us + max(0, int(us))
+        if self.account is not None:
+            self.account(target - self.us)
+        if not self.inIrq:
+            while self.events and self.events[0][0] <= target:
+                self.us = max(self.us, self.events[0][0])
+                self._run(self.us)
+        self.us = max(self.us, target)
+        self._check()
+        self.rest()
+
+class Bus:
+    def __init__(self, scl, sda):
+        self.scl = scl
+        self.sda = sda
+        self.devices = {}       # address -> device
+        self.stuck = 0          # SCL clocks still needed to free SDA
+        self.maxHz = None       # wiring limit: faster clocks corrupt reads
+        self.edgeErrors = 0
+        self.clocks = 0         # recovery clocks seen
+        self.txns = 0
+        self.busyUs = 0         # time spent transferring
+
+    def add(self, dev):
+        dev.bus = self
+        self.devices[dev.addr] = dev
+        return dev
+
+    def xferUs(self, nBytes, freq, soft):
+        f = min(freq, SOFT_MAX_HZ) if soft else freq
+        over = 30 if soft else 10  # call overhead, us
+        return over + int(9 * (nBytes + 1) * 1e6 / f)
+
+    def transfer(self, addr, data, nRead, freq, soft):
+        # one START..STOP transaction: write data (may be empty), then
+        # read nRead bytes; returns the bytes read or raises OSError
+        clk = board.clock
+        self.txns += 1
+        dt = self.xferUs(len(data) + nRead, freq, soft)
+        clk.advance(dt)
+        self.busyUs += dt
+        if self.stuck:
+            raise OSError(ETIMEDOUT)
+        dev = self.devices.get(addr)
+        if dev is None:
+            raise OSError(EIO)
+        dev.txns += 1
+        f = dev.faults
+        if f.get("stuck", 0) and board.rand.random() < f["stuck"]:
+            self.stuck = board.rand.randint(1, 9)
+            dev.faultCount["stuck"] += 1
+            raise OSError(ETIMEDOUT)
+        if f.get("nack", 0) and board.rand.random() < f["nack"]:
+            dev.faultCount["nack"] += 1
+            raise OSError(EIO)
+        if data:
+            dev.write(bytes(data))
+        if nRead:
+            out = bytearray(dev.read(nRead))
+            if len(out) < nRead:
+                out.extend(b'\xff' * (nRead - len(out)))
+            if self.maxHz and freq > self.maxHz and (board.rand.random()
+                                                     < freq / self.maxHz - 1):
+                out[0] ^= 0x80          # a bit lost to slow edges
+                self.edgeErrors += 1
+            if f.get("crc", 0) and dev.crcPos and (board.rand.random()
+                                                  < f["crc"]):
+                out[dev.crcPos[0] % nRead] ^= 0x01  # one bad bit
+                dev.faultCount["crc"] += 1
+            return bytes(out[:nRead])
+        return b''
+
+    def sclClock(self):  # recovery clock pulse on this bus's SCL
+        self.clocks += 1
+        if self.stuck:
+            self.stuck -= 1
+
+class Board:
+    def __init__(self, seed=1):
+        self.rand = random.Random(seed)
+        self.clock = Clock()
+        self.buses = {}         # (scl, sda) -> Bus
+        # volts at each ADC channel: 2 = pot on GPIO28, 3 = Vsys/3, 4 = die
+        self.adc = {0: 0.0, 1: 0.0, 2: 1.65, 3: 1.63, 4: 0.706}
+        self.adcNoise = 12      # counts rms
+        self.pins = {}          # GPIO -> level for inputs (pull-up = 1)
+        self.irqs = {}          # GPIO -> (handler, trigger, pin)
+        self.wifiUp = True      # access point reachable
+        self.wifiDelayMs = 3000 # connect time
+        self.brokerUp = True
+        self.ntpErrMs = 0       # NTP answer offset from true sim time
+        self.published = 0
+        self.pubBytes = 0
+        self.resets = 0
+
+    def bus(self, scl, sda):
+        b = self.buses.get((scl, sda))
+        if b is None:
+            b = self.buses[(scl, sda)] = Bus(scl, sda)
+        return b
+
+    def device(self, name):  # find a device by its name, e.g. "AHT10@19"
+        for b in self.buses.values():
+            for d in b.devices.values():
+                if d.name == name:
+                    return d
+        raise KeyError(name)
+
+    def devices(self):
+        for key in sorted(self.buses):
+            b = self.buses[key]
+            for a in sorted(b.devices):
+                yield b.devices[a]
+
+    def busForPin(self, gpio, which):  # which: 0 = scl, 1 = sda
+        for key, b in self.buses.items():
+            if key[which] == gpio:
+                return b
+        return None
+
+    def epochUs(self):
+        return EPOCH0 * 1_000_000 + self.clock.us
+
+    def press(self, gpio, atMs, holdMs, bounces=3):
+        # button to ground on gpio: bouncy edges at atMs, release after holdMs
+        def level(v):
+            def fn():
+                old = self.pins.get(gpio, 1)
+                self.pins[gpio] = v
+                irq = self.irqs.get(gpio)
+                if irq and old != v:
+                    handler, trigger, pin = irq
+                    if trigger & (1 if v == 0 else 2):  # falling / rising
+                        handler(pin)
+            return fn
+        t = atMs * 1000
+        for k in range(bounces):
+            self.clock.at(t + k * 300, level(0))
+            self.clock.at(t + k * 300 + 150, level(1))
+        self.clock.at(t + bounces * 300, level(0))
+        t += holdMs * 1000
+        for k in range(bounces):
+            self.clock.at(t + k * 300, level(1))
+            self.clock.at(t + k * 300 + 150, level(0))
+        self.clock.at(t + bounces * 300, level(1))
+
+board = None
+
+def defaultBoard(seed=1):
+    # the wiring the scripts in this repo expect, all on one board
+    import devices
+    b = Board(seed)
+    b.bus(19, 18).add(devices.AHT10("AHT10@19"))            # most scripts
+    b.bus(17, 16).add(devices.AHT10("AHT10@17", dT=0.12))    # I2C0 sensor
+    b.bus(17, 16).add(devices.OLED("SSD1306@17", sh1106=False))  # big font
+    b.bus(15, 14).add(devices.OLED("SH1106@15", sh1106=True))
+    b.bus(15, 14).add(devices.AHT10("AHT10@15", dT=-0.08))   # station T3
+    b.bus(13, 12).add(devices.AHT10("AHT10@13", dT=0.05))
+    b.bus(21, 20).add(devices.AHT10("AHT25@21", aht2x=True, dT=0.2))
+    b.bus(9, 8).add(devices.SHT3x("SHT31@9", dT=-0.15))
+    b.bus(19, 18).maxHz = 900_000   # long leads: SoftI2C tuning sees these
+    b.bus(13, 12).maxHz = 650_000
+    b.bus(9, 8).maxHz = 1_300_000
+    b.bus(5, 4).add(devices.TSD305("TSD305@5"))
+    return b
+
+def parseFaults(specs):  # ["AHT10@19:nack=0.01,crc=0.001", ...]
+    out = []
+    for s in specs or ():
+        name, _, kv = s.partition(":")
+        f = {}
+        for item in kv.split(","):
+            if item:
+                k, _, v = item.partition("=")
+                f[k.strip()] = float(v)
+        out.append((name, f))
+    return out
+
+# --- MicroPython time / gc functions on the simulated clock ---
+
+def ticks_us():
+    return board.clock.now() & 0x3fffffff
+
+def ticks_ms():
+    return (board.clock.now() // 1000) & 0x3fffffff
+
+def ticks_cpu():
+    return ticks_us()
+
+def ticks_diff(a, b):
+    d = (a - b) & 0x3fffffff
+    return d - 0x40000000 if d & 0x20000000 else d
+
+def ticks_add(a, d):
+    return (a + d) & 0x3fffffff
+
+def sleep(s):
+    board.clock.advance(s * 1e6)
+
+def sleep_ms(ms):
+    board.clock.advance(ms * 1000)
+
+def sleep_us(us):
+    board.clock.advance(us)
+
+def simTime():  # integer seconds, like MicroPython's time.time()
+    board.clock.now()
+    return board.epochUs() // 1_000_000
+
+def simTimeNs():
+    board.clock.now()
+    return board.epochUs() * 1000
+
+_gmtime = _time.gmtime
+_localtime = _time.localtime
+
+def gmtime(secs=None):
+    return _gmtime(simTime() if secs is None else secs)
+
+def localtime(secs=None):
+    return _gmtime(simTime() if secs is None else secs)  # board runs UTC
+
+def mem_alloc():
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0]
+    return 0
+
+def mem_free():
+    return max(0, HEAP - mem_alloc())
+
+PATCHED = ("ticks_us", "ticks_ms", "ticks_cpu", "ticks_diff", "ticks_add",
+           "sleep", "sleep_ms", "sleep_us", "gmtime", "localtime", "time",
+           "time_ns")
+_saved = {}
+
+def install(b, seconds=None, cpuScale=0.0):
+    # make b the current board and patch time / gc for the script;
+    # schedule button presses etc. on b.clock after this
+    global board
+    board = b
+    b.clock = Clock(seconds, cpuScale)
+    for name in PATCHED:
+        if name not in _saved:
+            _saved[name] = getattr(_time, name, None)
+        fn = {"time": simTime, "time_ns": simTimeNs}.get(name)
+        setattr(_time, name, fn or globals()[name])
+    gc.mem_alloc = mem_alloc
+    gc.mem_free = mem_free
+    if not hasattr(gc, "threshold"):
+        gc.threshold = lambda *a: None
+
+def uninstall():  # give the host its real time module back
+    for name, fn in _saved.items():
+        if fn is None:
+            delattr(_time, name)
+        else:
+            setattr(_time, name, fn)
+    _saved.clear()
@@ -0,0 +1,137 @@
+"""
+# spantrace.py : span tracer for hot paths, ring buffer of (id, start, duration)
+# Each finished span stores its id, ticks_us start and duration in us into
+# preallocated arrays, overwriting the oldest when full, so tracing does
+# not allocate. with tr.span(id) uses one reusable context object per id;
+# tr.wrap(fn, id) or @tr.trace(id) times a function. A disabled tracer
+# hands back a shared no-op context and wraps nothing (fn is returned as
+# is), so disabled spans cost one method call and decorators cost nothing.
+# A span id nested inside itself keeps only the inner start time.
+# dump() prints the ring oldest first, every line starting with '#' so CSV
+# readers skip it:
+#   #trace <tag> <spans recorded> <spans kept> <names, comma separated>
+#   #t <id> <start - previous start, us> <duration, us>   (first: absolute)
+#   #trace end
+# Start deltas come from ticks_diff, so the host sums them without caring
+# about the ticks_us wrap. poll() returns True when the trigger character
+# ('t') arrives on the USB serial; from the REPL after Ctrl-C, tr.dump().
+# traceview.py on the host turns a capture into a timeline or flame view.
+# One tracer per core: the ring is not locked.
+# 19-Oct-2026
+
+# Usage Example:
+import spantrace
+SP_READ, SP_SHOW = 0, 1
+tr = spantrace.Tracer(("read", "show"), depth=256, enabled=True)
+readAHT10 = tr.wrap(readAHT10, SP_READ)
+while True:
+    r = readAHT10(sensor1)
+    with tr.span(SP_SHOW):
+        display.show()
+    if spantrace.poll():
+        tr.dump()
+"""
+
+import sys
+from array import array
+from time import ticks_us, ticks_diff
+
+class _Span:  # reusable context manager for one span id
+    def __init__(self, tr, sid):
+        self.tr = tr
+        self.sid = sid
+        self.t0 = 0
+
+    def __enter__(self):
+        self.t0 = ticks_us()
+        return self
+
+    def __exit__(self, a, b, c):
+        self.tr.add(self.sid, self.t0, ticks_diff(ticks_us(), self.t0))
+        return False
+
+class _Null:  # what span() gives when tracing is off
+    def __enter__(self):
+        return self
+
+    def __exit__(self, a, b, c):
+        return False
+
+_NULL = _Null()
+
+class Tracer:
+    def __init__(self, names, depth=256, enabled=True, tag="core0"):
+        self.names = names          # span names, index = span id
+        self.depth = depth          # spans kept
+        self.enabled = enabled
+        self.tag = tag              # told apart in the dump, e.g. per core
+        self.sid = bytearray(depth)          # span id
+        self.t0 = array("l", [0] * depth)    # start, ticks_us
+        self.dt = array("l", [0] * depth)    # duration, us
+        self.head = 0               # next slot to write
+        self.count = 0              # spans recorded since start / clear()
+        self.spans = tuple(_Span(self, i) for i in range(len(names)))
+
+    def span(self, sid):  # with tr.span(SP_X): ...
+        return self.spans[sid] if self.enabled else _NULL
+
+    def add(self, sid, t0, dt):  # record one finished span
+        i = self.head
+        self.sid[i] = sid
+        self.t0[i] = t0
+        self.dt[i] = dt
+        i += 1
+        if i >= self.depth:
+            i = 0
+        self.head = i
+        self.count += 1
+
+    def wrap(self, fn, sid):  # fn timed as span sid; fn itself when off
+        if not self.enabled:
+            return fn
+
+        def traced(*args):
+            t0 = ticks_us()
+            try:
+                return fn(*args)
+            finally:
+                self.add(sid, t0, ticks_diff(ticks_us(), t0))
+        return traced
+
+    def trace(self, sid):  # decorator form of wrap()
+        def deco(fn):
+            return self.wrap(fn, sid)
+        return deco
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def dump(self):  # print the ring, oldest span first
+        n = min(self.count, self.depth)
+        i = (self.head - n) % self.depth
+        print("#trace %s %d %d %s" % (self.tag, self.count, n,
+                                      ",".join(self.names)))
+        prev = None
+        for _ in range(n):
+            t = self.t0[i]
+            print("#t %d %d %d" % (self.sid[i],
+                                   t if prev is None else ticks_diff(t, prev),
+                                   self.dt[i]))
+            prev = t
+            i += 1
+            if i >= self.depth:
+                i = 0
+        print("#trace end")
+
+_poller = None
+
+def poll(trigger="t"):  # True when the trigger character came in on serial
+    global _poller
+    if _poller is None:
+        import select
+        _poller = select.poll()
+        _poller.register(sys.stdin, select.POLLIN)
+    if not _poller.poll(0):
+        return False
+    return sys.stdin.read(1) == trigger
@@ -0,0 +1,104 @@
+"""
+# tecpid.py : fixed-rate closed-loop TEC temperature control on a Timer
+# A machine.Timer ticks at 'rate' Hz and only marks a control step due;
+# the main loop calls poll() often (it returns at once when nothing is
+# due), and the step runs there: read the feedback sensor, run the PID
+# (pid.py), write PWM(Pin(12)) duty. The sensor read is a blocking I2C
+# transaction, often on the display's bus, so it must not run in the soft
+# Timer callback, where it could cut into a display transfer and hold up
+# every other callback. Ticks that pass before poll() catches up are
+# counted in 'missed'. Each step's period, run time, error and output go
+# into preallocated ring arrays; log() prints them.
+# 19-Oct-2026
+
+# Usage Example:
+import tecpid, pid
+from machine import Pin, PWM
+TEC = PWM(Pin(12))
+ctl = tecpid.TecController(pid.PID(0.2, 0.01, reverse=True, slew=0.1),
+                           TEC, lambda: sensor.temperature, setpoint=15.0,
+                           rate=2)
+ctl.start()
+while True:
+    ...                     # display etc., in short pieces
+    ctl.poll()              # control step, when the timer says it is due
+    ctl.log()
+"""
+
+from array import array
+from machine import Timer
+from time import ticks_us, ticks_diff
+
+class TecController:
+    def __init__(self, pid, pwm, feedback, setpoint, rate=2, depth=32):
+        self.pid = pid              # pid.PID, output 0..1 = duty fraction
+        self.pwm = pwm              # machine.PWM driving the TEC
+        self.feedback = feedback    # function() -> temperature, degC
+        self.setpoint = setpoint
+        self.rate = rate            # control steps per second
+        self.dt = 1.0 / rate
+        self.depth = depth
+        self.period = array("l", [0] * depth)  # us between steps
+        self.runUs = array("l", [0] * depth)   # us spent in a step
+        self.errs = array("f", [0.0] * depth)  # setpoint - measured
+        self.outs = array("f", [0.0] * depth)  # duty fraction
+        self.idx = 0
+        self.steps = 0
+        self.bad = 0                # steps with a failed sensor read
+        self.due = 0                # timer ticks not yet served
+        self.missed = 0             # ticks merged into a later step
+        self.meas = None            # last good measurement
+        self.tLast = None
+        self.timer = None
+
+    def _tick(self, t):  # Timer callback: no I2C here, only mark it due
+        self.due += 1
+
+    def poll(self):  # run the control step if due; True if it ran
+        if not self.due:
+            return False
+        self.missed += self.due - 1
+        self.due = 0
+        self._step()
+        return True
+
+    def _step(self):
+        t0 = ticks_us()
+        i = self.idx
+        self.period[i] = 0 if self.tLast is None else ticks_diff(t0, self.tLast)
+        self.tLast = t0
+        try:
+            m = self.feedback()
+        except OSError:
+            m = None
+        if m is None or m < -100:   # bus error or -999 CRC marker
+            self.bad += 1           # hold the output
+        else:
+            self.meas = m
+            out = self.pid.update(self.setpoint, m, self.dt)
+            self.pwm.duty_u16(int(out * 65535))
+        self.errs[i] = self.pid.err
+        self.outs[i] = self.pid.out
+        self.runUs[i] = ticks_diff(ticks_us(), t0)
+        self.idx = (i + 1) % self.depth
+        self.steps += 1
+
+    def start(self):
+        if self.timer is None:
+            self.timer = Timer(freq=self.rate, mode=Timer.PERIODIC,
+                               callback=self._tick)
+
+    def stop(self, duty=0):  # stop control, leave the TEC at 'duty'
+        if self.timer is not None:
+            self.timer.deinit()
+            self.timer = None
+        self.pwm.duty_u16(duty)
+
+    def log(self):  # print the ring buffer, oldest first
+        n = min(self.steps, self.depth)
+        print("# tec sp=%.2f steps=%d bad=%d missed=%d" % (self.setpoint,
+              self.steps, self.bad, self.missed))
+        for k in range(n):
+            i = (self.idx - n + k) % self.depth
+            print("# tec %d us, %d us, err %.3f, out %.3f"
+                  % (self.period[i], self.runUs[i], self.errs[i], self.outs[i]))
@@ -0,0 +1,136 @@
+"""
+# tecsim.py : host simulation of the closed-loop TEC controller, for tuning
+# Runs pid.PID exactly as tecpid.py does on the Pico, against a simple
+# thermal model of a TEC-cooled block:
+#   C dT/dt = (Tamb - T)/R - (Pmax*duty - Pjoule*duty^2)
+# read through a lagging, noisy, quantized sensor at the control rate.
+# The setpoint steps at t=0 and the ambient temperature steps half way
+# through. Prints rise time, overshoot, settling time, steady-state error
+# and how hard the output worked.
+# 19-Oct-2026
+
+# Usage:
+#   python tecsim.py --kp 0.3 --ki 0.01 --slew 0.05
+#   python tecsim.py --csv > run.csv
+"""
+
+import argparse
+import random
+import sys
+
+import pid
+
+class Plant:
+    def __init__(self, tamb=25.0, R=2.0, C=50.0, pmax=15.0, pjoule=3.0,
+                 tauSensor=5.0, noise=0.01, lsb=0.01, seed=1):
+        self.T = tamb           # block temperature, C
+        self.tamb = tamb        # ambient, C
+        self.R = R              # block to ambient, K/W
+        self.C = C              # heat capacity, J/K
+        self.pmax = pmax        # cooling at full duty, W
+        self.pjoule = pjoule    # resistive heating at full duty, W
+        self.tauSensor = tauSensor  # sensor lag, s
+        self.noise = noise      # sensor noise, C rms
+        self.lsb = lsb          # sensor resolution, C
+        self.Ts = tamb          # sensor element temperature
+        self.rand = random.Random(seed)
+
+    def step(self, duty, dt, sub=20):  # advance dt seconds at this duty
+        h = dt / sub
+        for _ in range(sub):
+            q = (self.tamb - self.T) / self.R - (self.pmax * duty
+                                                 - self.pjoule * duty * duty)
+            self.T += q / self.C * h
+            self.Ts += (self.T - self.Ts) / self.tauSensor * h
+
+    def read(self):
+        x = self.Ts + self.rand.gauss(0.0, self.noise)
+        return round(x / self.lsb) * self.lsb
+
+def simulate(kp, ki, kd, slew, rate, seconds, sp0, sp1, dAmb, csv=None):
+    plant = Plant(tamb=sp0)
+    ctl = pid.PID(kp, ki, kd, 0.0, 1.0, slew=slew, reverse=True)
+    dt = 1.0 / rate
+    n = int(seconds * rate)
+    t = []
+    T = []
+    out = []
+    if csv:
+        csv.write("t, sp, T, meas, duty\n")
+    for k in range(n):
+        tk = k * dt
+        if k == n // 2:
+            plant.tamb += dAmb          # disturbance
+        m = plant.read()
+        duty = ctl.update(sp1, m, dt)
+        plant.step(duty, dt)
+        t.append(tk)
+        T.append(plant.T)
+        out.append(duty)
+        if csv:
+            csv.write("%.2f, %.2f, %.4f, %.3f, %.4f\n" % (tk, sp1, plant.T, m,
+                                                         duty))
+    return t, T, out
+
+def metrics(t, T, out, sp0, sp1, band=0.1):
+    half = len(t) // 2
+    span = sp1 - sp0
+    def frac(x):
+        return (x - sp0) / span
+    rise10 = rise90 = None
+    for i in range(half):
+        if rise10 is None and frac(T[i]) >= 0.1:
+            rise10 = t[i]
+        if rise90 is None and frac(T[i]) >= 0.9:
+            rise90 = t[i]
+            break
+    peak = max(frac(x) for x in T[:half])
+    settle = None
+    for i in range(half - 1, -1, -1):
+        if abs(T[i] - sp1) > band:
+            settle = t[i + 1] if i + 1 < half else None
+            break
+    tail = T[int(half * 0.8):half]
+    sse = (sum((x - sp1) ** 2 for x in tail) / len(tail)) ** 0.5
+    dist = max(abs(x - sp1) for x in T[half:])
+    sat = sum(1 for d in out if d >= 0.999 or d <= 0.001) / float(len(out))
+    maxStep = max(abs(out[i] - out[i - 1]) for i in range(1, len(out)))
+    return {
+        "rise_s": (rise90 - rise10) if (rise10 is not None and
+                                        rise90 is not None) else None,
+        "overshoot_pct": max(0.0, (peak - 1.0) * 100),
+        "settle_s": settle,
+        "sse_rms": sse,
+        "disturbance_peak": dist,
+        "saturated_frac": sat,
+        "max_duty_step": maxStep,
+    }
+
+def main(argv):
+    ap = argparse.ArgumentParser(description="TEC PID simulation")
+    ap.add_argument("--kp", type=float, default=0.3)
+    ap.add_argument("--ki", type=float, default=0.01)
+    ap.add_argument("--kd", type=float, default=0.0)
+    ap.add_argument("--slew", type=float, default=0.05,
+                    help="max duty change per second")
+    ap.add_argument("--rate", type=float, default=2.0, help="control Hz")
+    ap.add_argument("--time", type=float, default=3600.0, help="seconds")
+    ap.add_argument("--start", type=float, default=25.0, help="start temp")
+    ap.add_argument("--setpoint", type=float, default=15.0)
+    ap.add_argument("--ambient-step", type=float, default=3.0)
+    ap.add_argument("--csv", action="store_true", help="trace on stdout")
+    a = ap.parse_args(argv[1:])
+    slew = a.slew if a.slew > 0 else None
+    t, T, out = simulate(a.kp, a.ki, a.kd, slew, a.rate, a.time, a.start,
+                         a.setpoint, a.ambient_step,
+                         sys.stdout if a.csv else None)
+    if a.csv:
+        return
+    m = metrics(t, T, out, a.start, a.setpoint)
+    for k in ("rise_s", "overshoot_pct", "settle_s", "sse_rms",
+              "disturbance_peak", "saturated_frac", "max_duty_step"):
+        v = m[k]
+        print("%-17s %s" % (k, "-" if v is None else "%.3f" % v))
+
+if __name__ == "__main__":
+    main(sys.argv)
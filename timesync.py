@@ -0,0 +1,119 @@
+"""
+# timesync.py : periodic NTP resync with clock drift estimate and slewing
+# Timestamps come from ticks_ms (extended past its wraparound) through a
+# linear model fitted to NTP results. Each resync measures the error of the
+# model; small errors are slewed out at no more than 'maxSlewPpm' instead
+# of stepping the clock, so records never jump backward or repeat. The drift
+# in ppm is estimated from the first and latest sync (NTP is only good to
+# ~1 s, so the estimate sharpens as the baseline grows).
+# Before the first sync, now() gives provisional times based on the RTC at
+# start-up; fixup() converts those once the first sync is done.
+# All arithmetic is integer milliseconds: a single precision float can't
+# hold a Unix epoch to better than two minutes.
+# 19-Oct-2026
+
+# Usage Example:
+import timesync, ntptime
+ts = timesync.TimeSync(ntptime.time, intervalMs=3600_000)
+while True:
+    ts.poll()                   # from the idle part of the loop
+    epoch = ts.now()            # seconds, provisional until ts.synced
+    ...
+"""
+
+from time import ticks_ms, ticks_diff
+import time
+
+class TimeSync:
+    def __init__(self, getTime, intervalMs=3600_000, retryMs=30_000,
+                 maxSlewPpm=500, stepMs=2000, netUp=None, setRtc=None):
+        self.getTime = getTime          # function() -> epoch seconds (NTP)
+        self.intervalMs = intervalMs    # time between resyncs
+        self.retryMs = retryMs          # retry delay after a failed sync
+        self.maxSlewPpm = maxSlewPpm    # max rate of slewing corrections
+        self.stepMs = stepMs            # errors above this are stepped
+        self.netUp = netUp              # function() -> True if network up
+        self.setRtc = setRtc            # function(epoch) after first sync
+        self.tLast = ticks_ms()
+        self.mono = 0                   # ms since start, does not wrap
+        self.m0 = 0                     # model: epoch ms at mono m0 is e0
+        self.e0 = int(time.time()) * 1000   # provisional, from the RTC
+        self.ppb = 0                    # drift correction, parts per 1e9
+        self.slew = 0                   # correction being slewed in, ms
+        self.slewDur = 1                # over this many ms from m0
+        self.synced = False
+        self.syncs = 0
+        self.fails = 0
+        self.steps = 0                  # corrections too big to slew
+        self.lastErr = 0                # model error at the last sync, ms
+        self.fixMs = 0                  # add to provisional times
+        self.firstM = 0                 # first sync: mono and NTP epoch ms
+        self.firstE = 0
+        self.tNext = 0                  # mono ms of the next sync attempt
+
+    def _mono(self):  # monotonic ms, poll() at least every few days
+        t = ticks_ms()
+        self.mono += ticks_diff(t, self.tLast)
+        self.tLast = t
+        return self.mono
+
+    def _model(self, m):  # epoch ms at monotonic time m
+        dm = m - self.m0
+        e = self.e0 + dm + dm * self.ppb // 1_000_000_000
+        if dm >= self.slewDur:
+            return e + self.slew
+        return e + self.slew * dm // self.slewDur
+
+    @property
+    def ppm(self):
+        return self.ppb / 1000.0
+
+    def nowMs(self):
+        return self._model(self._mono())
+
+    def now(self):  # epoch seconds
+        return self.nowMs() // 1000
+
+    def fixup(self, epoch):  # correct a provisional time from before sync
+        return epoch + self.fixMs // 1000
+
+    def poll(self):  # resync if due; returns True if a sync happened
+        m = self._mono()
+        if m < self.tNext:
+            return False
+        if (self.netUp is not None) and not self.netUp():
+            return False
+        try:
+            t = self.getTime()
+        except OSError as e:  # NTP timeout etc., try again later
+            self.fails += 1
+            self.tNext = m + self.retryMs
+            return False
+        m = self._mono()
+        self.sync(m, int(t) * 1000 + 500)  # NTP seconds, midpoint guess
+        self.tNext = m + self.intervalMs
+        return True
+
+    def sync(self, m, e):  # update the model with 'e' = true epoch ms at m
+        p = self._model(m)
+        err = e - p
+        self.lastErr = err
+        self.syncs += 1
+        if not self.synced:
+            self.fixMs = err
+            self.firstM, self.firstE = m, e
+            self.m0, self.e0, self.slew = m, e, 0
+            self.synced = True
+            if self.setRtc is not None:
+                self.setRtc(e // 1000)
+            return
+        base = m - self.firstM
+        if base > 600_000:  # drift from the whole baseline since first sync
+            self.ppb = ((e - self.firstE) - base) * 1_000_000_000 // base
+        self.m0, self.e0 = m, p     # continue from where the model is now
+        if abs(err) > self.stepMs:
+            self.e0, self.slew = e, 0
+            self.steps += 1
+        else:
+            self.slew = err
+            self.slewDur = max(1, abs(err) * 1_000_000 // self.maxSlewPpm)
@@ -0,0 +1,131 @@
+"""
+# traceview.py : host tool, turn spantrace dumps into a timeline or flame view
+# Reads a serial capture (file or stdin) with one or more spantrace dumps
+# ("#trace core0 ..." / "#t ..." / "#trace end"); everything else in the
+# capture is skipped. Spans are nested by their start and end times, then
+#  - default: a table per span name (count, mean, p95, max, total, self)
+#  - --chrome FILE: Chrome trace event JSON, one track per tag (core);
+#    open in chrome://tracing or ui.perfetto.dev for the timeline
+#  - --folded FILE: folded stacks "core0;show 1234" with self time in us,
+#    for flamegraph.pl or speedscope.app
+# With several dumps in a capture, the last one of each tag is used unless
+# --all is given (later dumps usually repeat spans of earlier ones).
+# 19-Oct-2026
+
+# Usage:
+#   python traceview.py capture.txt
+#   python traceview.py capture.txt --chrome trace.json --folded trace.txt
+"""
+
+import argparse
+import json
+import sys
+
+def parse(lines):  # [(tag, names, [(id, start_us, dur_us)])] one per dump
+    dumps = []
+    cur = None
+    for line in lines:
+        line = line.strip()
+        if line.startswith("#trace "):
+            f = line.split(None, 4)
+            if f[1] == "end":
+                if cur is not None:
+                    dumps.append(cur)
+                cur = None
+            elif len(f) == 5:
+                cur = (f[1], f[4].split(","), [])
+                t = 0
+        elif line.startswith("#t ") and cur is not None:
+            f = line.split()
+            try:
+                sid, d, dur = int(f[1]), int(f[2]), int(f[3])
+            except (IndexError, ValueError):
+                continue    # line mangled on the serial link
+            t = d if not cur[2] else t + d
+            cur[2].append((sid, t, dur))
+    return dumps
+
+def nest(spans):  # [(id, start, dur, depth, self_us, path)] by start time
+    order = sorted(spans, key=lambda s: (s[1], -s[2]))
+    out = []
+    stack = []      # indexes into out of the open spans
+    for sid, t, dur in order:
+        while stack and out[stack[-1]][1] + out[stack[-1]][2] <= t:
+            stack.pop()
+        path = (out[stack[-1]][5] if stack else ()) + (sid,)
+        if stack:
+            out[stack[-1]][4] -= dur
+        out.append([sid, t, dur, len(stack), dur, path])
+        stack.append(len(out) - 1)
+    return out
+
+def pct(xs, p):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(p / 100.0 * len(xs)))]
+
+def table(tag, names, spans, fp):
+    t0 = min(s[1] for s in spans)
+    t1 = max(s[1] + s[2] for s in spans)
+    fp.write("# %s: %d spans over %.3f s\n" % (tag, len(spans),
+                                                (t1 - t0) / 1e6))
+    fp.write("# %-12s %6s %9s %9s %9s %11s %11s\n" % ("span", "count",
+             "mean_us", "p95_us", "max_us", "total_us", "self_us"))
+    for sid in sorted(set(s[0] for s in spans)):
+        d = [s[2] for s in spans if s[0] == sid]
+        own = sum(s[4] for s in spans if s[0] == sid)
+        name = names[sid] if sid < len(names) else str(sid)
+        fp.write("  %-12s %6d %9.0f %9d %9d %11d %11d\n"
+                 % (name, len(d), sum(d) / len(d), pct(d, 95), max(d),
+                    sum(d), own))
+
+def chrome(dumps):  # Chrome trace event format, complete ("X") events
+    ev = []
+    for tag, names, spans in dumps:
+        for sid, t, dur, depth, own, path in spans:
+            ev.append({"name": names[sid] if sid < len(names) else str(sid),
+                       "ph": "X", "ts": t, "dur": dur, "pid": 1,
+                       "tid": tag})
+    return {"traceEvents": ev, "displayTimeUnit": "ms"}
+
+def folded(dumps):  # flame graph input: stack -> self time, us
+    acc = {}
+    for tag, names, spans in dumps:
+        for sid, t, dur, depth, own, path in spans:
+            key = ";".join([tag] + [names[i] if i < len(names) else str(i)
+                                    for i in path])
+            acc[key] = acc.get(key, 0) + max(0, own)
+    return ["%s %d" % kv for kv in sorted(acc.items())]
+
+def main(argv):
+    ap = argparse.ArgumentParser(description="spantrace dump viewer")
+    ap.add_argument("capture", nargs="?", default="-",
+                    help="serial capture file, or - for stdin")
+    ap.add_argument("--chrome", help="write Chrome trace event JSON here")
+    ap.add_argument("--folded", help="write folded stacks here")
+    ap.add_argument("--all", action="store_true",
+                    help="use every dump, not only the last one per tag")
+    a = ap.parse_args(argv[1:])
+    fp = sys.stdin if a.capture == "-" else open(a.capture, errors="replace")
+    dumps = parse(fp)
+    if not a.all:
+        last = {}
+        for d in dumps:
+            last[d[0]] = d
+        dumps = list(last.values())
+    dumps = [(tag, names, nest(spans)) for tag, names, spans in dumps
+             if spans]
+    if not dumps:
+        sys.stderr.write("no spantrace dump found\n")
+        return 1
+    for tag, names, spans in dumps:
+        table(tag, names, spans, sys.stdout)
+    if a.chrome:
+        with open(a.chrome, "w") as out:
+            json.dump(chrome(dumps), out)
+    if a.folded:
+        with open(a.folded, "w") as out:
+            out.write("\n".join(folded(dumps)) + "\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
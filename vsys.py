@@ -10,6 +10,7 @@ import vsys
 from time import sleep, time
 
 vs = vsys.Vsys(3.24,0.02) # to read Pico Vsys voltage
+# vs = vsys.Vsys(3.24,0.02,nAvg=256) # oversampled: mean of 256 readings
 while True:
     volts = vs.read()
     print(volts)
@@ -17,9 +18,10 @@ while True:
 """
 
 from machine import Pin, ADC
+import oversample
 
 class Vsys:
-    def __init__(self, vref=3.234, voff=0.027):
+    def __init__(self, vref=3.234, voff=0.027, nAvg=1):
         self.vOffset = voff    # individually measured offset
         self.Vref = vref       # individually measured value of ADC Vref
         Pin(29, Pin.IN)        # no pullup/down for pin 29 reading Vsys
@@ -27,6 +29,16 @@ class Vsys:
         self.ADCmax = 65535    # max reported by ADC().read_u16
         self.Rratio = 3.0      # Pico 3:1 onboard Vsys divider
         self.vScale = self.Rratio * self.Vref / self.ADCmax
+        self.os = None
+        if nAvg > 1:           # burst of nAvg back-to-back readings
+            self.os = oversample.Oversampler(self.vsysCh, nAvg)
 
     def read(self):  # read vSys in volts
+        if self.os is not None:
+            return (self.os.read() * self.vScale + self.vOffset)
         return (self.vsysCh.read_u16() * self.vScale + self.vOffset)
+
+    def noise(self):  # std.dev of the last oversampled read, in volts
+        if self.os is None:
+            return 0.0
+        return self.os.noise * self.vScale